@@ -4,46 +4,83 @@ import subprocess
 import sys
 from pathlib import Path
 
+# Patterns used to locate and validate the version string in setup.py.
+# main() validates with is_semver(); _SEMVER_RE is kept for regex-based callers.
+_VERSION_RE = re.compile(r'version="([^"]+)"')
+_VERSION_SUB_RE = re.compile(r'version="[^"]+"')
+_SEMVER_RE = re.compile(r'^\d+\.\d+\.\d+$')
+
+def is_semver(version):
+    """Check for a plain X.Y.Z version without going through the regex engine"""
+    parts = version.split(".")
+    return len(parts) == 3 and all(part.isdecimal() for part in parts)
+
 def read_current_version():
-    """Read the current version from setup.py"""
+    """Read the current version and contents of setup.py"""
     setup_path = Path("setup.py")
     if not setup_path.exists():
         print("Error: setup.py file not found")
         sys.exit(1)
     
-    content = setup_path.read_text()
-    version_match = re.search(r'version="([^"]+)"', content)
+    content = setup_path.read_text(encoding="utf-8")
+    version_match = _VERSION_RE.search(content)
     if not version_match:
         print("Error: Could not find version in setup.py")
         sys.exit(1)
     
-    return version_match.group(1)
+    return version_match.group(1), content
 
-def update_version(new_version):
-    """Update the version in setup.py"""
+def update_version(new_version, content):
+    """Update the version in setup.py, reusing the contents already read"""
     setup_path = Path("setup.py")
-    content = setup_path.read_text()
-    updated_content = re.sub(
-        r'version="[^"]+"', 
+    updated_content = _VERSION_SUB_RE.sub(
         f'version="{new_version}"', 
-        content
+        content,
+        count=1
     )
     
-    setup_path.write_text(updated_content)
+    # Plain write on purpose: no fsync or atomic replace. This is an interactive
+    # release script run on a dev machine, and setup.py is under version control.
+    setup_path.write_text(updated_content, encoding="utf-8")
     print(f"Updated version to {new_version} in setup.py")
 
+def build_package():
+    """Build the sdist and wheel, in-process when the build package is available"""
+    try:
+        from build.__main__ import main as build_main
+    except ImportError:
+        subprocess.run([sys.executable, "setup.py", "sdist", "bdist_wheel"], check=True)
+        return
+    
+    build_main(["--sdist", "--wheel", "--no-isolation", "."])
+
+def upload_package():
+    """Upload the built distributions, in-process when twine is importable"""
+    dists = sorted(str(p) for p in Path("dist").glob("*"))
+    if not dists:
+        raise RuntimeError("No distributions found in dist/")
+    
+    try:
+        from twine.commands.upload import upload as twine_upload
+        from twine.settings import Settings
+    except ImportError:
+        subprocess.run(["twine", "upload", *dists], check=True)
+        return
+    
+    twine_upload(Settings(), dists)
+
 def build_and_deploy():
     """Build and deploy the package"""
     print("\nBuilding the package...")
-    subprocess.run(["python", "setup.py", "sdist", "bdist_wheel"], check=True)
+    build_package()
     
     print("\nUploading to PyPI...")
-    subprocess.run(["twine", "upload", "dist/*"], check=True)
+    upload_package()
     
     print("\n✅ Package successfully built and deployed!")
 
 def main():
-    current_version = read_current_version()
+    current_version, setup_content = read_current_version()
     print(f"Current version: {current_version}")
     
     # Ask for new version
@@ -52,7 +89,7 @@ def main():
         new_version = current_version
     
     # Validate semantic version format
-    if not re.match(r'^\d+\.\d+\.\d+$', new_version):
+    if not is_semver(new_version):
         print("Warning: Version doesn't match semantic versioning (X.Y.Z)")
         proceed = input("Continue anyway? (y/n): ").lower()
         if proceed != 'y':
@@ -70,7 +107,7 @@ def main():
     
     # Update version in setup.py
     if new_version != current_version:
-        update_version(new_version)
+        update_version(new_version, setup_content)
     
     # Build and deploy
     build_and_deploy()
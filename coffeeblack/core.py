@@ -24,6 +24,13 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class _SeeFailure(dict):
+    """
+    A see() result built locally after the request failed, rather than returned
+    by the API. Behaves like the regular result dict.
+    """
+
+
 class CoffeeBlackSDK:
     """
     CoffeeBlack SDK - Python client for interacting with the CoffeeBlack visual reasoning API.
@@ -140,14 +147,45 @@ class CoffeeBlackSDK:
         self.max_retries = max_retries
         self.retry_backoff = retry_backoff
         
+        # Shared HTTP session, reused across API requests
+        self._session = None  # Will be initialized in get_session()
+        
         # Initialize HTML extractor
         self.html_extractor = HTMLExtractor(
             base_url=base_url,
             api_key=api_key,
             debug_enabled=debug_enabled,
-            debug_dir=debug_dir
+            debug_dir=debug_dir,
+            session_provider=self.get_session
         )
     
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Get or create the HTTP session shared by all API requests.
+        
+        Reusing one session keeps connections to the API alive between calls
+        instead of paying a new TCP/TLS handshake per request.
+        
+        Returns:
+            The shared aiohttp ClientSession
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=16, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session and the task manager session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        await self.tasks.close()
+    
+    async def __aenter__(self) -> 'CoffeeBlackSDK':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
     async def get_open_windows(self) -> List[WindowInfo]:
         """
         Get a list of all open windows on the system.
@@ -427,446 +465,446 @@ class CoffeeBlackSDK:
                 debug.log_debug(self.debug_dir, "0", request_debug, "request")
             
             # Send request to API
-            async with aiohttp.ClientSession() as session:
-                with open(screenshot_path, 'rb') as f:
-                    # Create form data
-                    data = aiohttp.FormData()
-                    data.add_field('query', query)
-                    data.add_field('file', f, filename=os.path.basename(screenshot_path))
-                    
-                    # Add confidence parameters
-                    data.add_field('element_conf', str(elements_conf))
-                    data.add_field('row_conf', str(rows_conf))
-                    
-                    # Add container confidence if provided
+            session = await self.get_session()
+            with open(screenshot_path, 'rb') as f:
+                # Create form data
+                data = aiohttp.FormData()
+                data.add_field('query', query)
+                data.add_field('file', f, filename=os.path.basename(screenshot_path))
+                
+                # Add confidence parameters
+                data.add_field('element_conf', str(elements_conf))
+                data.add_field('row_conf', str(rows_conf))
+                
+                # Add container confidence if provided
+                if container_conf is not None:
+                    data.add_field('container_conf', str(container_conf))
+                
+                # Add IOU threshold if provided
+                if iou_threshold is not None:
+                    data.add_field('iou_threshold', str(iou_threshold))
+                
+                # Add detection sensitivity if provided
+                if detection_sensitivity is not None:
+                    data.add_field('detection_sensitivity', str(detection_sensitivity))
+                
+                # Add elements JSON if provided
+                if elements is not None:
+                    data.add_field('elements', elements)
+                
+                # Add skip_image_for_static if provided
+                if skip_image_for_static is not None:
+                    data.add_field('skip_image_for_static', str(skip_image_for_static).lower())
+                
+                # Add reference element if provided
+                if using_reference_element:
+                    data.add_field('reference_element', 
+                                 reference_element_data,
+                                 filename='reference_element.png',
+                                 content_type='image/png')
+                
+                # Add logging to show what's being sent to API
+                if self.verbose:
+                    print("\n=== API Request Parameters ===")
+                    print(f"Query: {query}")
+                    print(f"Screenshot: {os.path.basename(screenshot_path)}")
+                    print(f"element_conf: {elements_conf}")
+                    print(f"row_conf: {rows_conf}")
                     if container_conf is not None:
-                        data.add_field('container_conf', str(container_conf))
-                    
-                    # Add IOU threshold if provided
+                        print(f"container_conf: {container_conf}")
                     if iou_threshold is not None:
-                        data.add_field('iou_threshold', str(iou_threshold))
-                    
-                    # Add detection sensitivity if provided
+                        print(f"iou_threshold: {iou_threshold}")
                     if detection_sensitivity is not None:
-                        data.add_field('detection_sensitivity', str(detection_sensitivity))
-                    
-                    # Add elements JSON if provided
+                        print(f"detection_sensitivity: {detection_sensitivity}")
                     if elements is not None:
-                        data.add_field('elements', elements)
-                    
-                    # Add skip_image_for_static if provided
+                        print(f"elements: {elements}")
                     if skip_image_for_static is not None:
-                        data.add_field('skip_image_for_static', str(skip_image_for_static).lower())
-                    
-                    # Add reference element if provided
-                    if using_reference_element:
-                        data.add_field('reference_element', 
-                                     reference_element_data,
-                                     filename='reference_element.png',
-                                     content_type='image/png')
-                    
-                    # Add logging to show what's being sent to API
-                    if self.verbose:
-                        print("\n=== API Request Parameters ===")
-                        print(f"Query: {query}")
-                        print(f"Screenshot: {os.path.basename(screenshot_path)}")
-                        print(f"element_conf: {elements_conf}")
-                        print(f"row_conf: {rows_conf}")
-                        if container_conf is not None:
-                            print(f"container_conf: {container_conf}")
-                        if iou_threshold is not None:
-                            print(f"iou_threshold: {iou_threshold}")
-                        if detection_sensitivity is not None:
-                            print(f"detection_sensitivity: {detection_sensitivity}")
-                        if elements is not None:
-                            print(f"elements: {elements}")
-                        if skip_image_for_static is not None:
-                            print(f"skip_image_for_static: {skip_image_for_static}")
-                        print(f"model: {selected_model}")
-                        if temperature is not None:
-                            print(f"temperature: {temperature}")
-                        if device_type is not None:
-                            print(f"device_type: {device_type}")
-                        if using_reference_element:
-                            print(f"reference_element: reference_element.png")
-                        print("=============================\n")
-                    
-                    # Add the model parameter
-                    data.add_field('model', selected_model)
-                    
-                    # Add max_tokens parameter if provided (UI-TARS only)
-                    if selected_model in ["ui-tars", "bytedance-research/UI-TARS-7B-DPO"]:
-                        tokens = max_tokens if max_tokens is not None else self.max_tokens
-                        data.add_field('max_tokens', str(tokens))
-                    
-                    # Add temperature if provided (UI-TARS/CUA only)
-                    if temperature is not None and selected_model in ["ui-tars", "bytedance-research/UI-TARS-7B-DPO", "cua", "oai-cua"]:
-                        data.add_field('temperature', str(temperature))
-                    
-                    # Add device_type if provided
+                        print(f"skip_image_for_static: {skip_image_for_static}")
+                    print(f"model: {selected_model}")
+                    if temperature is not None:
+                        print(f"temperature: {temperature}")
                     if device_type is not None:
-                        data.add_field('device_type', device_type)
-                    
-                    # Add additional options if using experimental features
-                    if self.use_hierarchical_indexing:
-                        data.add_field('use_hierarchical_indexing', 'true')
-                    if self.use_query_rewriting:
-                        data.add_field('use_query_rewriting', 'true')
-                    
-                    # Create headers with Authorization if API key is provided
-                    headers = {}
-                    if self.api_key:
-                        headers['Authorization'] = f'Bearer {self.api_key}'
-                    
-                    # Use the retry utility method
-                    success, response_text, error_message = await self._make_api_request_with_retry(
-                        session=session,
-                        url=url,
-                        data=data,
-                        headers=headers,
-                        debug_prefix="execute",
-                        timestamp=timestamp
+                        print(f"device_type: {device_type}")
+                    if using_reference_element:
+                        print(f"reference_element: reference_element.png")
+                    print("=============================\n")
+                
+                # Add the model parameter
+                data.add_field('model', selected_model)
+                
+                # Add max_tokens parameter if provided (UI-TARS only)
+                if selected_model in ["ui-tars", "bytedance-research/UI-TARS-7B-DPO"]:
+                    tokens = max_tokens if max_tokens is not None else self.max_tokens
+                    data.add_field('max_tokens', str(tokens))
+                
+                # Add temperature if provided (UI-TARS/CUA only)
+                if temperature is not None and selected_model in ["ui-tars", "bytedance-research/UI-TARS-7B-DPO", "cua", "oai-cua"]:
+                    data.add_field('temperature', str(temperature))
+                
+                # Add device_type if provided
+                if device_type is not None:
+                    data.add_field('device_type', device_type)
+                
+                # Add additional options if using experimental features
+                if self.use_hierarchical_indexing:
+                    data.add_field('use_hierarchical_indexing', 'true')
+                if self.use_query_rewriting:
+                    data.add_field('use_query_rewriting', 'true')
+                
+                # Create headers with Authorization if API key is provided
+                headers = {}
+                if self.api_key:
+                    headers['Authorization'] = f'Bearer {self.api_key}'
+                
+                # Use the retry utility method
+                success, response_text, error_message = await self._make_api_request_with_retry(
+                    session=session,
+                    url=url,
+                    data=data,
+                    headers=headers,
+                    debug_prefix="execute",
+                    timestamp=timestamp
+                )
+                
+                if not success:
+                    raise RuntimeError(f"Failed to execute action: {error_message}")
+                
+                # Parse response
+                try:
+                    result = json.loads(response_text)
+                except json.JSONDecodeError:
+                    raise RuntimeError(f"Failed to parse response as JSON. Response saved to {self.debug_dir}/response_raw_{timestamp}.txt")
+                
+                # Remove fields not in our CoffeeBlackResponse type
+                if 'annotated_screenshot' in result:
+                    del result['annotated_screenshot']
+                if 'query' in result:
+                    del result['query']
+                
+                # Log parsed response
+                if self.debug_enabled:
+                    with open(f'{self.debug_dir}/response_{timestamp}.json', 'w') as f:
+                        json.dump(result, f, indent=2)
+                
+                # Create debug visualization
+                debug_viz_path = ""
+                if self.debug_enabled and 'boxes' in result and screenshot_path:
+                    debug_viz_path = debug.create_debug_visualization(
+                        self.debug_dir,
+                        screenshot_path,
+                        result['boxes'],
+                        result.get('chosen_element_index', -1),
+                        timestamp
                     )
-                    
-                    if not success:
-                        raise RuntimeError(f"Failed to execute action: {error_message}")
-                    
-                    # Parse response
-                    try:
-                        result = json.loads(response_text)
-                    except json.JSONDecodeError:
-                        raise RuntimeError(f"Failed to parse response as JSON. Response saved to {self.debug_dir}/response_raw_{timestamp}.txt")
-                    
-                    # Remove fields not in our CoffeeBlackResponse type
-                    if 'annotated_screenshot' in result:
-                        del result['annotated_screenshot']
-                    if 'query' in result:
-                        del result['query']
-                    
-                    # Log parsed response
-                    if self.debug_enabled:
-                        with open(f'{self.debug_dir}/response_{timestamp}.json', 'w') as f:
-                            json.dump(result, f, indent=2)
-                    
-                    # Create debug visualization
-                    debug_viz_path = ""
-                    if self.debug_enabled and 'boxes' in result and screenshot_path:
-                        debug_viz_path = debug.create_debug_visualization(
-                            self.debug_dir,
-                            screenshot_path,
-                            result['boxes'],
-                            result.get('chosen_element_index', -1),
-                            timestamp
+                    if debug_viz_path:
+                        print(f"Debug visualization saved to: {debug_viz_path}")
+                
+                # Handle different API response formats (ui-tars vs ui-detect)
+                chosen_action = None
+                if 'chosen_action' in result:
+                    # Standard format
+                    chosen_action = Action(**result.get("chosen_action", {})) if result.get("chosen_action") else None
+                elif 'action' in result:
+                    # UI-TARS format - convert to our Action format
+                    action_data = result.get('action', {})
+                    if action_data:
+                        # Map 'type' to 'action' for UI-TARS responses
+                        chosen_action = Action(
+                            action=action_data.get('type'),  # Map 'type' to 'action'
+                            key_command=action_data.get('key_command'),
+                            input_text=action_data.get('input_text'),
+                            scroll_direction=action_data.get('scroll_direction'),
+                            confidence=1.0  # Default confidence if not provided
                         )
-                        if debug_viz_path:
-                            print(f"Debug visualization saved to: {debug_viz_path}")
-                    
-                    # Handle different API response formats (ui-tars vs ui-detect)
-                    chosen_action = None
-                    if 'chosen_action' in result:
-                        # Standard format
-                        chosen_action = Action(**result.get("chosen_action", {})) if result.get("chosen_action") else None
-                    elif 'action' in result:
-                        # UI-TARS format - convert to our Action format
-                        action_data = result.get('action', {})
-                        if action_data:
-                            # Map 'type' to 'action' for UI-TARS responses
-                            chosen_action = Action(
-                                action=action_data.get('type'),  # Map 'type' to 'action'
-                                key_command=action_data.get('key_command'),
-                                input_text=action_data.get('input_text'),
-                                scroll_direction=action_data.get('scroll_direction'),
-                                confidence=1.0  # Default confidence if not provided
-                            )
-                    
-                    # Process results and find best element
-                    response = CoffeeBlackResponse(
-                        response=response_text,
-                        boxes=result.get("boxes", []),
-                        raw_detections=result.get("raw_detections", {}),
-                        hierarchy=result.get("hierarchy", {}),
-                        num_boxes=len(result.get("boxes", [])),
-                        chosen_action=chosen_action,
-                        chosen_element_index=result.get("chosen_element_index"),
-                        explanation=result.get("explanation", ""),
-                        timings=result.get("timings")
-                    )
-                    
-                    # Execute the action only if execute=True
-                    if execute and response.chosen_action and response.chosen_element_index is not None and response.chosen_element_index >= 0:
-                        try:
-                            chosen_box = response.boxes[response.chosen_element_index]
-                            action = response.chosen_action
+                
+                # Process results and find best element
+                response = CoffeeBlackResponse(
+                    response=response_text,
+                    boxes=result.get("boxes", []),
+                    raw_detections=result.get("raw_detections", {}),
+                    hierarchy=result.get("hierarchy", {}),
+                    num_boxes=len(result.get("boxes", [])),
+                    chosen_action=chosen_action,
+                    chosen_element_index=result.get("chosen_element_index"),
+                    explanation=result.get("explanation", ""),
+                    timings=result.get("timings")
+                )
+                
+                # Execute the action only if execute=True
+                if execute and response.chosen_action and response.chosen_element_index is not None and response.chosen_element_index >= 0:
+                    try:
+                        chosen_box = response.boxes[response.chosen_element_index]
+                        action = response.chosen_action
+                        
+                        # Calculate absolute coordinates based on window position
+                        bounds = self.active_window.bounds
+                        window_x = bounds['x']
+                        window_y = bounds['y']
+                        
+                        # Get center of the element using bbox
+                        bbox = chosen_box["bbox"]
+                        
+                        # Log basic debug info before calculations
+                        print(f"\nDebug coordinate calculation:")
+                        print(f"Window position: ({window_x}, {window_y})")
+                        print(f"Window dimensions: {bounds['width']}x{bounds['height']}")
+                        
+                        # Check if we have pre-calculated absolute coordinates from the API
+                        if "absolute_coordinates" in chosen_box:
+                            print(f"Using pre-calculated absolute coordinates: {chosen_box['absolute_coordinates']}")
+                            abs_x = chosen_box["absolute_coordinates"][0]
+                            abs_y = chosen_box["absolute_coordinates"][1]
                             
-                            # Calculate absolute coordinates based on window position
-                            bounds = self.active_window.bounds
-                            window_x = bounds['x']
-                            window_y = bounds['y']
+                            # Still need to apply window offset
+                            element_x = int(window_x + abs_x)
+                            element_y = int(window_y + abs_y)
+                            print(f"After window offset: ({element_x}, {element_y})")
                             
-                            # Get center of the element using bbox
-                            bbox = chosen_box["bbox"]
+                            # Set these for debug logging below
+                            element_width = int(bbox['x2'] - bbox['x1'])
+                            element_height = int(bbox['y2'] - bbox['y1'])
+                        
+                        # Check if we have normalized coordinates from UI-TARS
+                        elif "normalized_coordinates" in chosen_box:
+                            print(f"Using normalized coordinates: {chosen_box['normalized_coordinates']}")
+                            norm_x = chosen_box["normalized_coordinates"][0]
+                            norm_y = chosen_box["normalized_coordinates"][1]
                             
-                            # Log basic debug info before calculations
-                            print(f"\nDebug coordinate calculation:")
-                            print(f"Window position: ({window_x}, {window_y})")
-                            print(f"Window dimensions: {bounds['width']}x{bounds['height']}")
+                            # UI-TARS uses a 0-1000 scale, so we need to convert to pixels
+                            # based on the screenshot/window dimensions
+                            abs_x = int(norm_x * bounds['width'] / 1000)
+                            abs_y = int(norm_y * bounds['height'] / 1000)
                             
-                            # Check if we have pre-calculated absolute coordinates from the API
-                            if "absolute_coordinates" in chosen_box:
-                                print(f"Using pre-calculated absolute coordinates: {chosen_box['absolute_coordinates']}")
-                                abs_x = chosen_box["absolute_coordinates"][0]
-                                abs_y = chosen_box["absolute_coordinates"][1]
-                                
-                                # Still need to apply window offset
-                                element_x = int(window_x + abs_x)
-                                element_y = int(window_y + abs_y)
-                                print(f"After window offset: ({element_x}, {element_y})")
-                                
-                                # Set these for debug logging below
-                                element_width = int(bbox['x2'] - bbox['x1'])
-                                element_height = int(bbox['y2'] - bbox['y1'])
+                            # Apply window offset
+                            element_x = int(window_x + abs_x)
+                            element_y = int(window_y + abs_y)
+                            print(f"Calculated from normalized (0-1000): ({element_x}, {element_y})")
                             
-                            # Check if we have normalized coordinates from UI-TARS
-                            elif "normalized_coordinates" in chosen_box:
-                                print(f"Using normalized coordinates: {chosen_box['normalized_coordinates']}")
-                                norm_x = chosen_box["normalized_coordinates"][0]
-                                norm_y = chosen_box["normalized_coordinates"][1]
-                                
-                                # UI-TARS uses a 0-1000 scale, so we need to convert to pixels
-                                # based on the screenshot/window dimensions
-                                abs_x = int(norm_x * bounds['width'] / 1000)
-                                abs_y = int(norm_y * bounds['height'] / 1000)
-                                
-                                # Apply window offset
-                                element_x = int(window_x + abs_x)
-                                element_y = int(window_y + abs_y)
-                                print(f"Calculated from normalized (0-1000): ({element_x}, {element_y})")
+                            # Set these for debug logging below
+                            element_width = int(bbox['x2'] - bbox['x1'])
+                            element_height = int(bbox['y2'] - bbox['y1'])
+                        
+                        else:
+                            # Original bbox-based calculation
+                            print(f"Original bbox: x1={bbox['x1']}, y1={bbox['y1']}, x2={bbox['x2']}, y2={bbox['y2']}")
+                        
+                        # Detect the DPI scaling for the specific monitor this window is on
+                        display_dpi = screenshot.detect_retina_dpi(target_bounds=bounds)
+                        print(f"Detected DPI for window's display: {display_dpi}")
+                        
+                        # Update the stored retina_dpi value
+                        if abs(self.retina_dpi - display_dpi) > 0.1:
+                            print(f"Updating DPI from {self.retina_dpi} to {display_dpi}")
+                            self.retina_dpi = display_dpi
+                        
+                        # Get information about displays if we're on macOS
+                        system = platform.system()
+                        displays = []
+                        if system == 'Darwin':
+                            try:
+                                displays = screenshot.get_display_info_macos()
+                                print(f"Found {len(displays)} displays:")
+                                for i, display in enumerate(displays):
+                                    print(f"  Display {i+1}: {display['bounds']['width']}x{display['bounds']['height']} " +
+                                        f"at ({display['bounds']['x']}, {display['bounds']['y']}) " +
+                                        f"scale: {display['scale_factor']}" +
+                                        f"{' (main)' if display['is_main'] else ''}")
+                            except Exception as e:
+                                print(f"Error getting display info: {e}")
+                                displays = []
+                        
+                        # Calculate element dimensions and center point with improved multi-monitor awareness
+                        if system == 'Darwin':  # Always use scaling logic on macOS
+                            try:
+                                # Determine scaling factor to use
+                                scaling_factor = self.retina_dpi
+                                primary_display = None
                                 
-                                # Set these for debug logging below
-                                element_width = int(bbox['x2'] - bbox['x1'])
-                                element_height = int(bbox['y2'] - bbox['y1'])
-                            
-                            else:
-                                # Original bbox-based calculation
-                                print(f"Original bbox: x1={bbox['x1']}, y1={bbox['y1']}, x2={bbox['x2']}, y2={bbox['y2']}")
-                            
-                            # Detect the DPI scaling for the specific monitor this window is on
-                            display_dpi = screenshot.detect_retina_dpi(target_bounds=bounds)
-                            print(f"Detected DPI for window's display: {display_dpi}")
-                            
-                            # Update the stored retina_dpi value
-                            if abs(self.retina_dpi - display_dpi) > 0.1:
-                                print(f"Updating DPI from {self.retina_dpi} to {display_dpi}")
-                                self.retina_dpi = display_dpi
-                            
-                            # Get information about displays if we're on macOS
-                            system = platform.system()
-                            displays = []
-                            if system == 'Darwin':
-                                try:
-                                    displays = screenshot.get_display_info_macos()
-                                    print(f"Found {len(displays)} displays:")
-                                    for i, display in enumerate(displays):
-                                        print(f"  Display {i+1}: {display['bounds']['width']}x{display['bounds']['height']} " +
-                                            f"at ({display['bounds']['x']}, {display['bounds']['y']}) " +
-                                            f"scale: {display['scale_factor']}" +
-                                            f"{' (main)' if display['is_main'] else ''}")
-                                except Exception as e:
-                                    print(f"Error getting display info: {e}")
-                                    displays = []
-                            
-                            # Calculate element dimensions and center point with improved multi-monitor awareness
-                            if system == 'Darwin':  # Always use scaling logic on macOS
-                                try:
-                                    # Determine scaling factor to use
-                                    scaling_factor = self.retina_dpi
-                                    primary_display = None
+                                # Identify primary display for the window
+                                if len(displays) > 0:
+                                    # Check if window bounds overlap with any display
+                                    window_rect = {
+                                        'left': bounds['x'],
+                                        'top': bounds['y'],
+                                        'right': bounds['x'] + bounds['width'],
+                                        'bottom': bounds['y'] + bounds['height']
+                                    }
                                     
-                                    # Identify primary display for the window
-                                    if len(displays) > 0:
-                                        # Check if window bounds overlap with any display
-                                        window_rect = {
-                                            'left': bounds['x'],
-                                            'top': bounds['y'],
-                                            'right': bounds['x'] + bounds['width'],
-                                            'bottom': bounds['y'] + bounds['height']
+                                    max_overlap_area = 0
+                                    for display in displays:
+                                        display_rect = {
+                                            'left': display['bounds']['x'],
+                                            'top': display['bounds']['y'],
+                                            'right': display['bounds']['x'] + display['bounds']['width'],
+                                            'bottom': display['bounds']['y'] + display['bounds']['height']
                                         }
                                         
-                                        max_overlap_area = 0
-                                        for display in displays:
-                                            display_rect = {
-                                                'left': display['bounds']['x'],
-                                                'top': display['bounds']['y'],
-                                                'right': display['bounds']['x'] + display['bounds']['width'],
-                                                'bottom': display['bounds']['y'] + display['bounds']['height']
-                                            }
-                                            
-                                            # Calculate overlap
-                                            overlap_left = max(window_rect['left'], display_rect['left'])
-                                            overlap_top = max(window_rect['top'], display_rect['top'])
-                                            overlap_right = min(window_rect['right'], display_rect['right'])
-                                            overlap_bottom = min(window_rect['bottom'], display_rect['bottom'])
-                                            
-                                            if overlap_left < overlap_right and overlap_top < overlap_bottom:
-                                                overlap_area = (overlap_right - overlap_left) * (overlap_bottom - overlap_top)
-                                                if overlap_area > max_overlap_area:
-                                                    max_overlap_area = overlap_area
-                                                    primary_display = display
-                                                    
-                                        if primary_display:
-                                            print(f"Window primarily on display at ({primary_display['bounds']['x']}, {primary_display['bounds']['y']})")
-                                            print(f"Display scale factor: {primary_display['scale_factor']}")
-                                            # Use the display's scaling factor
-                                            scaling_factor = primary_display['scale_factor']
-                                        else:
-                                            print("Couldn't match window to a specific display, using default scaling")
-                                    
-                                    # For standalone MacBook Retina displays, we need different logic
-                                    is_standalone_macbook = (len(displays) == 1 and 
-                                                            displays[0]['scale_factor'] > 1.0 and
-                                                            displays[0]['is_main'])
+                                        # Calculate overlap
+                                        overlap_left = max(window_rect['left'], display_rect['left'])
+                                        overlap_top = max(window_rect['top'], display_rect['top'])
+                                        overlap_right = min(window_rect['right'], display_rect['right'])
+                                        overlap_bottom = min(window_rect['bottom'], display_rect['bottom'])
+                                        
+                                        if overlap_left < overlap_right and overlap_top < overlap_bottom:
+                                            overlap_area = (overlap_right - overlap_left) * (overlap_bottom - overlap_top)
+                                            if overlap_area > max_overlap_area:
+                                                max_overlap_area = overlap_area
+                                                primary_display = display
+                                                
+                                    if primary_display:
+                                        print(f"Window primarily on display at ({primary_display['bounds']['x']}, {primary_display['bounds']['y']})")
+                                        print(f"Display scale factor: {primary_display['scale_factor']}")
+                                        # Use the display's scaling factor
+                                        scaling_factor = primary_display['scale_factor']
+                                    else:
+                                        print("Couldn't match window to a specific display, using default scaling")
+                                
+                                # For standalone MacBook Retina displays, we need different logic
+                                is_standalone_macbook = (len(displays) == 1 and 
+                                                        displays[0]['scale_factor'] > 1.0 and
+                                                        displays[0]['is_main'])
+                                
+                                # External monitor detection - check for common non-Retina resolutions
+                                is_standard_monitor = False
+                                for display in displays:
+                                    # Check for common monitor resolutions (1080p, 1440p, etc)
+                                    if (display['bounds']['width'] in [1920, 2560, 3840] and
+                                        display['bounds']['height'] in [1080, 1440, 2160]):
+                                        print(f"Detected standard external monitor: {display['bounds']['width']}x{display['bounds']['height']}")
+                                        is_standard_monitor = True
+                                        # Override the scaling factor for standard monitors
+                                        scaling_factor = 1.0
+                                        break
+                                
+                                if is_standard_monitor:
+                                    print("Using standard monitor scaling (1.0)")
+                                    element_width = int(bbox['x2'] - bbox['x1'])
+                                    element_height = int(bbox['y2'] - bbox['y1'])
+                                    element_x = int(window_x + bbox['x1'] + (element_width / 2))
+                                    element_y = int(window_y + bbox['y1'] + (element_height / 2))
+                                elif is_standalone_macbook:
+                                    print("Detected standalone MacBook with Retina display")
                                     
-                                    # External monitor detection - check for common non-Retina resolutions
-                                    is_standard_monitor = False
-                                    for display in displays:
-                                        # Check for common monitor resolutions (1080p, 1440p, etc)
-                                        if (display['bounds']['width'] in [1920, 2560, 3840] and
-                                            display['bounds']['height'] in [1080, 1440, 2160]):
-                                            print(f"Detected standard external monitor: {display['bounds']['width']}x{display['bounds']['height']}")
-                                            is_standard_monitor = True
-                                            # Override the scaling factor for standard monitors
-                                            scaling_factor = 1.0
-                                            break
+                                    # For standalone MacBook, we need to handle UI coordinates differently
+                                    # First check if this window might be a system-level UI element
+                                    is_system_ui = (bounds['width'] < 100 and bounds['height'] < 100) or bounds['y'] < 50
                                     
-                                    if is_standard_monitor:
-                                        print("Using standard monitor scaling (1.0)")
+                                    # System UI elements like menu bar don't need scaling adjustment
+                                    if is_system_ui:
+                                        print("Detected system UI element, using direct coordinates")
                                         element_width = int(bbox['x2'] - bbox['x1'])
                                         element_height = int(bbox['y2'] - bbox['y1'])
                                         element_x = int(window_x + bbox['x1'] + (element_width / 2))
                                         element_y = int(window_y + bbox['y1'] + (element_height / 2))
-                                    elif is_standalone_macbook:
-                                        print("Detected standalone MacBook with Retina display")
-                                        
-                                        # For standalone MacBook, we need to handle UI coordinates differently
-                                        # First check if this window might be a system-level UI element
-                                        is_system_ui = (bounds['width'] < 100 and bounds['height'] < 100) or bounds['y'] < 50
-                                        
-                                        # System UI elements like menu bar don't need scaling adjustment
-                                        if is_system_ui:
-                                            print("Detected system UI element, using direct coordinates")
-                                            element_width = int(bbox['x2'] - bbox['x1'])
-                                            element_height = int(bbox['y2'] - bbox['y1'])
-                                            element_x = int(window_x + bbox['x1'] + (element_width / 2))
-                                            element_y = int(window_y + bbox['y1'] + (element_height / 2))
-                                        else:
-                                            # Regular app window on Retina display
-                                            element_width = int((bbox['x2'] - bbox['x1']) / scaling_factor)
-                                            element_height = int((bbox['y2'] - bbox['y1']) / scaling_factor)
-                                            element_x = int(window_x + (bbox['x1'] / scaling_factor) + (element_width / 2))
-                                            element_y = int(window_y + (bbox['y1'] / scaling_factor) + (element_height / 2))
                                     else:
-                                        # Multi-monitor or non-Retina setup
+                                        # Regular app window on Retina display
                                         element_width = int((bbox['x2'] - bbox['x1']) / scaling_factor)
                                         element_height = int((bbox['y2'] - bbox['y1']) / scaling_factor)
                                         element_x = int(window_x + (bbox['x1'] / scaling_factor) + (element_width / 2))
                                         element_y = int(window_y + (bbox['y1'] / scaling_factor) + (element_height / 2))
-                                    
-                                    print(f"Adjusted for display scaling: width={element_width}, height={element_height}")
-                                    print(f"Scaling factor used: {scaling_factor}")
-                                except Exception as e:
-                                    print(f"Error calculating coordinates with multi-monitor awareness: {e}")
-                                    # Fall back to basic calculation
-                                    element_width = int(bbox['x2'] - bbox['x1'])
-                                    element_height = int(bbox['y2'] - bbox['y1'])
-                                    element_x = int(window_x + bbox['x1'] + (element_width / 2))
-                                    element_y = int(window_y + bbox['y1'] + (element_height / 2))
-                            else:
-                                # Non-macOS - basic calculation
+                                else:
+                                    # Multi-monitor or non-Retina setup
+                                    element_width = int((bbox['x2'] - bbox['x1']) / scaling_factor)
+                                    element_height = int((bbox['y2'] - bbox['y1']) / scaling_factor)
+                                    element_x = int(window_x + (bbox['x1'] / scaling_factor) + (element_width / 2))
+                                    element_y = int(window_y + (bbox['y1'] / scaling_factor) + (element_height / 2))
+                                
+                                print(f"Adjusted for display scaling: width={element_width}, height={element_height}")
+                                print(f"Scaling factor used: {scaling_factor}")
+                            except Exception as e:
+                                print(f"Error calculating coordinates with multi-monitor awareness: {e}")
+                                # Fall back to basic calculation
                                 element_width = int(bbox['x2'] - bbox['x1'])
                                 element_height = int(bbox['y2'] - bbox['y1'])
                                 element_x = int(window_x + bbox['x1'] + (element_width / 2))
                                 element_y = int(window_y + bbox['y1'] + (element_height / 2))
+                        else:
+                            # Non-macOS - basic calculation
+                            element_width = int(bbox['x2'] - bbox['x1'])
+                            element_height = int(bbox['y2'] - bbox['y1'])
+                            element_x = int(window_x + bbox['x1'] + (element_width / 2))
+                            element_y = int(window_y + bbox['y1'] + (element_height / 2))
+                        
+                        # Log calculated coordinates
+                        print(f"Calculated target: ({element_x}, {element_y})")
+                        print(f"PyAutoGUI screen size: {pyautogui.size()}")
+                        
+                        # Round final coordinates to integers
+                        element_x = int(element_x)
+                        element_y = int(element_y)
+                        
+                        # Log action details
+                        if self.debug_enabled:
+                            action_debug = {
+                                'action_type': action.action,
+                                'coordinates': {
+                                    'window_x': window_x,
+                                    'window_y': window_y,
+                                    'element_x': element_x,
+                                    'element_y': element_y,
+                                    'element_width': element_width,
+                                    'element_height': element_height,
+                                    'bbox': {
+                                        'x1': bbox['x1'],
+                                        'y1': bbox['y1'],
+                                        'x2': bbox['x2'],
+                                        'y2': bbox['y2']
+                                    }
+                                },
+                                'retina_dpi': self.retina_dpi,
+                                'timestamp': timestamp
+                            }
+                            with open(f'{self.debug_dir}/action_{timestamp}.json', 'w') as f:
+                                json.dump(action_debug, f, indent=2)
+                        
+                        # Execute the appropriate action
+                        if action.action == "click":
+                            # Move to position and click
+                            print(f"Executing click at ({element_x}, {element_y})")
+                            pyautogui.moveTo(element_x, element_y, duration=0.2)
+                            pyautogui.click()
                             
-                            # Log calculated coordinates
-                            print(f"Calculated target: ({element_x}, {element_y})")
-                            print(f"PyAutoGUI screen size: {pyautogui.size()}")
+                        elif action.action == "type" and action.input_text:
+                            # Move to position, click to focus, and type
+                            print(f"Clicking at ({element_x}, {element_y}) and typing: {action.input_text}")
+                            pyautogui.moveTo(element_x, element_y, duration=0.2)
+                            pyautogui.click()
+                            time.sleep(1.0)  # Wait for focus
+                            pyautogui.write(action.input_text)
                             
-                            # Round final coordinates to integers
-                            element_x = int(element_x)
-                            element_y = int(element_y)
+                        elif action.action == "scroll" and action.scroll_direction:
+                            # Move to position and scroll
+                            print(f"Scrolling {action.scroll_direction} at ({element_x}, {element_y})")
+                            pyautogui.moveTo(element_x, element_y, duration=0.2)
+                            scroll_amount = 100 if action.scroll_direction == "down" else -100
+                            pyautogui.scroll(scroll_amount)
                             
-                            # Log action details
-                            if self.debug_enabled:
-                                action_debug = {
-                                    'action_type': action.action,
-                                    'coordinates': {
-                                        'window_x': window_x,
-                                        'window_y': window_y,
-                                        'element_x': element_x,
-                                        'element_y': element_y,
-                                        'element_width': element_width,
-                                        'element_height': element_height,
-                                        'bbox': {
-                                            'x1': bbox['x1'],
-                                            'y1': bbox['y1'],
-                                            'x2': bbox['x2'],
-                                            'y2': bbox['y2']
-                                        }
-                                    },
-                                    'retina_dpi': self.retina_dpi,
-                                    'timestamp': timestamp
-                                }
-                                with open(f'{self.debug_dir}/action_{timestamp}.json', 'w') as f:
-                                    json.dump(action_debug, f, indent=2)
+                        elif action.action == "key" and action.key_command:
+                            # Execute a keyboard command
+                            print(f"Pressing key: {action.key_command}")
+                            pyautogui.press(action.key_command)
                             
-                            # Execute the appropriate action
-                            if action.action == "click":
-                                # Move to position and click
-                                print(f"Executing click at ({element_x}, {element_y})")
-                                pyautogui.moveTo(element_x, element_y, duration=0.2)
-                                pyautogui.click()
-                                
-                            elif action.action == "type" and action.input_text:
-                                # Move to position, click to focus, and type
-                                print(f"Clicking at ({element_x}, {element_y}) and typing: {action.input_text}")
-                                pyautogui.moveTo(element_x, element_y, duration=0.2)
-                                pyautogui.click()
-                                time.sleep(1.0)  # Wait for focus
-                                pyautogui.write(action.input_text)
-                                
-                            elif action.action == "scroll" and action.scroll_direction:
-                                # Move to position and scroll
-                                print(f"Scrolling {action.scroll_direction} at ({element_x}, {element_y})")
-                                pyautogui.moveTo(element_x, element_y, duration=0.2)
-                                scroll_amount = 100 if action.scroll_direction == "down" else -100
-                                pyautogui.scroll(scroll_amount)
-                                
-                            elif action.action == "key" and action.key_command:
-                                # Execute a keyboard command
-                                print(f"Pressing key: {action.key_command}")
-                                pyautogui.press(action.key_command)
-                                
-                            elif action.action == "no_action":
-                                # No action required
-                                print("No action required")
-                                
-                            else:
-                                print(f"Unsupported action: {action.action}")
-                                
-                        except Exception as e:
-                            # Log the error but don't necessarily raise it if we only failed execution
-                            # The reasoning part might still be valuable
-                            error_message = f"Failed to execute action: {e}"
-                            logger.error(error_message)
-                            # Optionally, add the execution error to the response object
-                            if not hasattr(response, 'execution_error'):
-                                response.execution_error = error_message
-                            # Depending on desired behavior, you might re-raise or just return the response
-                            # Re-raising for now to keep original behavior on execution failure
-                            raise RuntimeError(error_message)
-                    
-                    return response
-                    
+                        elif action.action == "no_action":
+                            # No action required
+                            print("No action required")
+                            
+                        else:
+                            print(f"Unsupported action: {action.action}")
+                            
+                    except Exception as e:
+                        # Log the error but don't necessarily raise it if we only failed execution
+                        # The reasoning part might still be valuable
+                        error_message = f"Failed to execute action: {e}"
+                        logger.error(error_message)
+                        # Optionally, add the execution error to the response object
+                        if not hasattr(response, 'execution_error'):
+                            response.execution_error = error_message
+                        # Depending on desired behavior, you might re-raise or just return the response
+                        # Re-raising for now to keep original behavior on execution failure
+                        raise RuntimeError(error_message)
+                
+                return response
+                
         except Exception as e:
             raise RuntimeError(f"Failed to execute action: {e}")
         finally:
@@ -985,141 +1023,141 @@ class CoffeeBlackSDK:
                 debug.log_debug(self.debug_dir, "0", request_debug, "reason_request")
             
             # Send request to API
-            async with aiohttp.ClientSession() as session:
-                with open(screenshot_path, 'rb') as f:
-                    # Create form data
-                    data = aiohttp.FormData()
-                    data.add_field('query', query)
-                    data.add_field('file', f, filename=os.path.basename(screenshot_path))
-                    
-                    # Add confidence parameters
-                    data.add_field('element_conf', str(elements_conf))
-                    data.add_field('row_conf', str(rows_conf))
-                    
-                    # Add container confidence if provided
-                    if container_conf is not None:
-                        data.add_field('container_conf', str(container_conf))
-                    
-                    # Add reference element if provided
-                    if using_reference_element:
-                        with open(reference_element_path, 'rb') as ref_f:
-                            data.add_field('reference_element', 
-                                           ref_f, 
-                                           filename=os.path.basename(reference_element_path),
-                                           content_type='image/png')
-                    
-                    # Disable action execution
-                    data.add_field('execute_action', 'false')
-                    
-                    # Add the model parameter
-                    data.add_field('model', selected_model)
-                    
-                    # Add max_tokens parameter if provided (UI-TARS only)
-                    if selected_model == "ui-tars":
-                        tokens = max_tokens if max_tokens is not None else self.max_tokens
-                        data.add_field('max_tokens', str(tokens))
-                    
-                    # Add additional options if using experimental features
-                    if self.use_hierarchical_indexing:
-                        data.add_field('use_hierarchical_indexing', 'true')
-                    if self.use_query_rewriting:
-                        data.add_field('use_query_rewriting', 'true')
-                    
-                    # Create headers with Authorization if API key is provided
-                    headers = {}
-                    if self.api_key:
-                        headers['Authorization'] = f'Bearer {self.api_key}'
+            session = await self.get_session()
+            with open(screenshot_path, 'rb') as f:
+                # Create form data
+                data = aiohttp.FormData()
+                data.add_field('query', query)
+                data.add_field('file', f, filename=os.path.basename(screenshot_path))
+                
+                # Add confidence parameters
+                data.add_field('element_conf', str(elements_conf))
+                data.add_field('row_conf', str(rows_conf))
+                
+                # Add container confidence if provided
+                if container_conf is not None:
+                    data.add_field('container_conf', str(container_conf))
+                
+                # Add reference element if provided
+                if using_reference_element:
+                    with open(reference_element_path, 'rb') as ref_f:
+                        data.add_field('reference_element', 
+                                       ref_f, 
+                                       filename=os.path.basename(reference_element_path),
+                                       content_type='image/png')
+                
+                # Disable action execution
+                data.add_field('execute_action', 'false')
+                
+                # Add the model parameter
+                data.add_field('model', selected_model)
+                
+                # Add max_tokens parameter if provided (UI-TARS only)
+                if selected_model == "ui-tars":
+                    tokens = max_tokens if max_tokens is not None else self.max_tokens
+                    data.add_field('max_tokens', str(tokens))
+                
+                # Add additional options if using experimental features
+                if self.use_hierarchical_indexing:
+                    data.add_field('use_hierarchical_indexing', 'true')
+                if self.use_query_rewriting:
+                    data.add_field('use_query_rewriting', 'true')
+                
+                # Create headers with Authorization if API key is provided
+                headers = {}
+                if self.api_key:
+                    headers['Authorization'] = f'Bearer {self.api_key}'
+                
+                # Use the retry utility method
+                success, response_text, error_message = await self._make_api_request_with_retry(
+                    session=session,
+                    url=url,
+                    data=data,
+                    headers=headers,
+                    debug_prefix="reason",
+                    timestamp=timestamp
+                )
+                
+                if not success:
+                    if self.verbose:
+                        print(f"Warning: {error_message}")
                     
-                    # Use the retry utility method
-                    success, response_text, error_message = await self._make_api_request_with_retry(
-                        session=session,
-                        url=url,
-                        data=data,
-                        headers=headers,
-                        debug_prefix="reason",
-                        timestamp=timestamp
+                    # Return a default error response instead of raising an exception
+                    return CoffeeBlackResponse(
+                        response=error_message,
+                        boxes=[],
+                        raw_detections={},
+                        hierarchy={},
+                        num_boxes=0,
+                        chosen_action=None,
+                        chosen_element_index=None,
+                        explanation="API request failed",
+                        timings=None
                     )
-                    
-                    if not success:
-                        if self.verbose:
-                            print(f"Warning: {error_message}")
-                        
-                        # Return a default error response instead of raising an exception
-                        return CoffeeBlackResponse(
-                            response=error_message,
-                            boxes=[],
-                            raw_detections={},
-                            hierarchy={},
-                            num_boxes=0,
-                            chosen_action=None,
-                            chosen_element_index=None,
-                            explanation="API request failed",
-                            timings=None
-                        )
-                    
-                    # Parse response
-                    try:
-                        result = json.loads(response_text)
-                    except json.JSONDecodeError:
-                        if self.verbose:
-                            print(f"Warning: Failed to parse response as JSON. Response saved to {self.debug_dir}/reason_response_raw_{timestamp}.txt")
-                        # Instead of crashing, return a default error response
-                        return CoffeeBlackResponse(
-                            response=f"Failed to parse response as JSON. Response saved to {self.debug_dir}/reason_response_raw_{timestamp}.txt",
-                            boxes=[],
-                            raw_detections={},
-                            hierarchy={},
-                            num_boxes=0,
-                            chosen_action=None,
-                            chosen_element_index=None,
-                            explanation="Failed to parse response",
-                            timings=None
-                        )
-                    
-                    # Remove fields not in our CoffeeBlackResponse type
-                    if 'annotated_screenshot' in result:
-                        del result['annotated_screenshot']
-                    if 'query' in result:
-                        del result['query']
-                    
-                    # Log parsed response
-                    if self.debug_enabled:
-                        with open(f'{self.debug_dir}/reason_response_{timestamp}.json', 'w') as f:
-                            json.dump(result, f, indent=2)
-                    
-                    # Handle different API response formats (ui-tars vs ui-detect)
-                    chosen_action = None
-                    if 'chosen_action' in result:
-                        # Standard format
-                        chosen_action = Action(**result.get("chosen_action", {})) if result.get("chosen_action") else None
-                    elif 'action' in result:
-                        # UI-TARS format - convert to our Action format
-                        action_data = result.get('action', {})
-                        if action_data:
-                            # Map 'type' to 'action' for UI-TARS responses
-                            chosen_action = Action(
-                                action=action_data.get('type'),  # Map 'type' to 'action'
-                                key_command=action_data.get('key_command'),
-                                input_text=action_data.get('input_text'),
-                                scroll_direction=action_data.get('scroll_direction'),
-                                confidence=1.0  # Default confidence if not provided
-                            )
-                    
-                    # Process results
-                    response = CoffeeBlackResponse(
-                        response=response_text,
-                        boxes=result.get("boxes", []),
-                        raw_detections=result.get("raw_detections", {}),
-                        hierarchy=result.get("hierarchy", {}),
-                        num_boxes=len(result.get("boxes", [])),
-                        chosen_action=chosen_action,
-                        chosen_element_index=result.get("chosen_element_index"),
-                        explanation=result.get("explanation", ""),
-                        timings=result.get("timings")
+                
+                # Parse response
+                try:
+                    result = json.loads(response_text)
+                except json.JSONDecodeError:
+                    if self.verbose:
+                        print(f"Warning: Failed to parse response as JSON. Response saved to {self.debug_dir}/reason_response_raw_{timestamp}.txt")
+                    # Instead of crashing, return a default error response
+                    return CoffeeBlackResponse(
+                        response=f"Failed to parse response as JSON. Response saved to {self.debug_dir}/reason_response_raw_{timestamp}.txt",
+                        boxes=[],
+                        raw_detections={},
+                        hierarchy={},
+                        num_boxes=0,
+                        chosen_action=None,
+                        chosen_element_index=None,
+                        explanation="Failed to parse response",
+                        timings=None
                     )
-                    
-                    return response
-                    
+                
+                # Remove fields not in our CoffeeBlackResponse type
+                if 'annotated_screenshot' in result:
+                    del result['annotated_screenshot']
+                if 'query' in result:
+                    del result['query']
+                
+                # Log parsed response
+                if self.debug_enabled:
+                    with open(f'{self.debug_dir}/reason_response_{timestamp}.json', 'w') as f:
+                        json.dump(result, f, indent=2)
+                
+                # Handle different API response formats (ui-tars vs ui-detect)
+                chosen_action = None
+                if 'chosen_action' in result:
+                    # Standard format
+                    chosen_action = Action(**result.get("chosen_action", {})) if result.get("chosen_action") else None
+                elif 'action' in result:
+                    # UI-TARS format - convert to our Action format
+                    action_data = result.get('action', {})
+                    if action_data:
+                        # Map 'type' to 'action' for UI-TARS responses
+                        chosen_action = Action(
+                            action=action_data.get('type'),  # Map 'type' to 'action'
+                            key_command=action_data.get('key_command'),
+                            input_text=action_data.get('input_text'),
+                            scroll_direction=action_data.get('scroll_direction'),
+                            confidence=1.0  # Default confidence if not provided
+                        )
+                
+                # Process results
+                response = CoffeeBlackResponse(
+                    response=response_text,
+                    boxes=result.get("boxes", []),
+                    raw_detections=result.get("raw_detections", {}),
+                    hierarchy=result.get("hierarchy", {}),
+                    num_boxes=len(result.get("boxes", [])),
+                    chosen_action=chosen_action,
+                    chosen_element_index=result.get("chosen_element_index"),
+                    explanation=result.get("explanation", ""),
+                    timings=result.get("timings")
+                )
+                
+                return response
+                
         except Exception as e:
             raise RuntimeError(f"Failed to execute reasoning query: {e}")
         finally:
@@ -1174,14 +1212,34 @@ class CoffeeBlackSDK:
         if wait:
             start_time = time.time()
             last_result = None
+            last_sent = None
+            
+            # Take a fresh screenshot on every attempt unless the caller provided one
+            capture = screenshot_data is None
             
             while time.time() - start_time < timeout:
-                # Call see API with the current screenshot
-                result = await self._see_implementation(
-                    description=description,
-                    screenshot_data=screenshot_data,
-                    reference_images=reference_images
-                )
+                if capture:
+                    try:
+                        screenshot_data = await self.get_screenshot()
+                    except Exception as e:
+                        if self.verbose:
+                            print(f"Warning: Failed to capture screenshot during wait: {e}")
+                        # Continue with the previous screenshot data rather than failing completely
+                        # This allows the operation to potentially succeed on a retry with the previous image
+                
+                # An unchanged screenshot would get the same answer, so only
+                # send the see request when the window has changed
+                if last_sent is not None and screenshot_data == last_sent:
+                    result = last_result
+                else:
+                    # Call see API with the current screenshot
+                    result = await self._see_implementation(
+                        description=description,
+                        screenshot_data=screenshot_data,
+                        reference_images=reference_images
+                    )
+                    # Only a real API answer is reused; failed requests are retried
+                    last_sent = None if isinstance(result, _SeeFailure) else screenshot_data
                 
                 # Store the last result for returning in case of timeout
                 last_result = result
@@ -1194,16 +1252,6 @@ class CoffeeBlackSDK:
                 
                 # Wait before trying again
                 await asyncio.sleep(interval)
-                
-                # Get a fresh screenshot for the next attempt (only if no screenshot_data was provided)
-                if screenshot_data is None:
-                    try:
-                        screenshot_data = await self.get_screenshot()
-                    except Exception as e:
-                        if self.verbose:
-                            print(f"Warning: Failed to capture screenshot during wait: {e}")
-                        # Continue with the previous screenshot data rather than failing completely
-                        # This allows the operation to potentially succeed on a retry with the previous image
             
             # If we reach here, we timed out
             if self.verbose:
@@ -1259,11 +1307,11 @@ class CoffeeBlackSDK:
                     if self.verbose:
                         print(f"Warning: Failed to automatically capture screenshot: {e}")
                     # Return a helpful error response instead of crashing
-                    return {
+                    return _SeeFailure({
                         "matches": False,
                         "confidence": "unknown",
                         "reasoning": f"Failed to automatically capture screenshot: {e}"
-                    }
+                    })
             
             # Save the screenshot data to a temporary file
             timestamp = int(time.time())
@@ -1302,82 +1350,78 @@ class CoffeeBlackSDK:
                 debug.log_debug(self.debug_dir, "0", request_debug, "see_request")
             
             # Send request to API
-            async with aiohttp.ClientSession() as session:
-                # Create form data
-                data = aiohttp.FormData()
-                data.add_field('description', description)
-                
-                # Read screenshot into memory before adding to form data
-                with open(screenshot_path, 'rb') as f:
-                    screenshot_content = f.read()
-                
-                # Add screenshot using the binary content
-                data.add_field('screenshot', 
-                              screenshot_content, 
-                              filename=screenshot_filename,
+            session = await self.get_session()
+            # Create form data
+            data = aiohttp.FormData()
+            data.add_field('description', description)
+            
+            # Add screenshot using the in-memory binary content. The temp file
+            # name is only second-resolution, so re-reading it could pick up a
+            # concurrent call's screenshot.
+            data.add_field('screenshot', 
+                          screenshot_data, 
+                          filename=screenshot_filename,
+                          content_type='image/png')
+            
+            # Add reference images if available
+            for i, ref_content in enumerate(reference_contents):
+                data.add_field(f'reference{i+1}', 
+                              ref_content, 
+                              filename=reference_filenames[i],
                               content_type='image/png')
-                
-                # Add reference images if available
-                for i, ref_path in enumerate(reference_paths):
-                    with open(ref_path, 'rb') as f:
-                        ref_content = f.read()
-                    data.add_field(f'reference{i+1}', 
-                                  ref_content, 
-                                  filename=reference_filenames[i],
-                                  content_type='image/png')
-                
-                # Create headers with Authorization using API key
-                headers = {}
-                if self.api_key:
-                    headers['Authorization'] = f'Bearer {self.api_key}'
-                
-                # Use the retry utility method
-                success, response_text, error_message = await self._make_api_request_with_retry(
-                    session=session,
-                    url=url,
-                    data=data,
-                    headers=headers,
-                    debug_prefix="see",
-                    timestamp=timestamp
-                )
-                
-                if not success:
-                    if self.verbose:
-                        print(f"Warning: {error_message}")
-                    
-                    # Return a default error response instead of raising an exception
-                    return {
-                        "matches": False,
-                        "confidence": "unknown",
-                        "reasoning": error_message
-                    }
-                
-                # Parse response
-                try:
-                    result = json.loads(response_text)
-                except json.JSONDecodeError:
-                    if self.verbose:
-                        print(f"Warning: Failed to parse response as JSON. Response saved to {self.debug_dir}/see_response_raw_{timestamp}.txt")
-                    # Instead of crashing, return a default error response
-                    return {
-                        "matches": False,
-                        "confidence": "unknown",
-                        "reasoning": f"Failed to parse response as JSON. Response saved to {self.debug_dir}/see_response_raw_{timestamp}.txt"
-                    }
-                
-                # Log parsed response
-                if self.debug_enabled:
-                    with open(f'{self.debug_dir}/see_response_{timestamp}.json', 'w') as f:
-                        json.dump(result, f, indent=2)
-                
+            
+            # Create headers with Authorization using API key
+            headers = {}
+            if self.api_key:
+                headers['Authorization'] = f'Bearer {self.api_key}'
+            
+            # Use the retry utility method
+            success, response_text, error_message = await self._make_api_request_with_retry(
+                session=session,
+                url=url,
+                data=data,
+                headers=headers,
+                debug_prefix="see",
+                timestamp=timestamp
+            )
+            
+            if not success:
                 if self.verbose:
-                    # Print key information
-                    print(f"See API Result: Matches={result.get('matches', False)}, " +
-                          f"Confidence={result.get('confidence', 'unknown')}")
-                    if 'reasoning' in result:
-                        print(f"Reasoning: {result['reasoning']}")
+                    print(f"Warning: {error_message}")
                 
-                return result
+                # Return a default error response instead of raising an exception
+                return _SeeFailure({
+                    "matches": False,
+                    "confidence": "unknown",
+                    "reasoning": error_message
+                })
+            
+            # Parse response
+            try:
+                result = json.loads(response_text)
+            except json.JSONDecodeError:
+                if self.verbose:
+                    print(f"Warning: Failed to parse response as JSON. Response saved to {self.debug_dir}/see_response_raw_{timestamp}.txt")
+                # Instead of crashing, return a default error response
+                return _SeeFailure({
+                    "matches": False,
+                    "confidence": "unknown",
+                    "reasoning": f"Failed to parse response as JSON. Response saved to {self.debug_dir}/see_response_raw_{timestamp}.txt"
+                })
+            
+            # Log parsed response
+            if self.debug_enabled:
+                with open(f'{self.debug_dir}/see_response_{timestamp}.json', 'w') as f:
+                    json.dump(result, f, indent=2)
+            
+            if self.verbose:
+                # Print key information
+                print(f"See API Result: Matches={result.get('matches', False)}, " +
+                      f"Confidence={result.get('confidence', 'unknown')}")
+                if 'reasoning' in result:
+                    print(f"Reasoning: {result['reasoning']}")
+            
+            return result
         
         except Exception as e:
             timestamp = int(time.time())
@@ -1392,11 +1436,11 @@ class CoffeeBlackSDK:
                     f.write(error_message)
                     
             # Return a default error response
-            return {
+            return _SeeFailure({
                 "matches": False,
                 "confidence": "unknown",
                 "reasoning": error_message
-            }
+            })
         finally:
             # Clean up temporary files
             if using_temp_file and screenshot_path and os.path.exists(screenshot_path):
@@ -1556,175 +1600,175 @@ class CoffeeBlackSDK:
             timestamp = int(time.time())
             
             # Send request to API
-            async with aiohttp.ClientSession() as session:
-                data = aiohttp.FormData()
-                data.add_field('max_attempts', str(max_attempts))
-                data.add_field('file', screenshot_data, filename='captcha.png', content_type='image/png')
-                
-                headers = {}
-                if self.api_key:
-                    headers['Authorization'] = f'Bearer {self.api_key}'
-                
-                success, response_text, error_message = await self._make_api_request_with_retry(
-                    session=session,
-                    url=url,
-                    data=data,
-                    headers=headers,
-                    debug_prefix="captcha",
-                    timestamp=timestamp
-                )
-                
-                if not success:
-                    return {
-                        "status": "error",
-                        "error": error_message
-                    }
+            session = await self.get_session()
+            data = aiohttp.FormData()
+            data.add_field('max_attempts', str(max_attempts))
+            data.add_field('file', screenshot_data, filename='captcha.png', content_type='image/png')
+            
+            headers = {}
+            if self.api_key:
+                headers['Authorization'] = f'Bearer {self.api_key}'
+            
+            success, response_text, error_message = await self._make_api_request_with_retry(
+                session=session,
+                url=url,
+                data=data,
+                headers=headers,
+                debug_prefix="captcha",
+                timestamp=timestamp
+            )
+            
+            if not success:
+                return {
+                    "status": "error",
+                    "error": error_message
+                }
+            
+            try:
+                result = json.loads(response_text)
+                result["captchaDetectionMethod"] = "automatic"
                 
-                try:
-                    result = json.loads(response_text)
-                    result["captchaDetectionMethod"] = "automatic"
+                # If we got coordinates and apply_solution is True, we need to click them
+                if apply_solution and result.get("status") == "success":
+                    solution_data = result.get("solution", {})
+                    coordinates = solution_data.get("coordinates", [])
                     
-                    # If we got coordinates and apply_solution is True, we need to click them
-                    if apply_solution and result.get("status") == "success":
-                        solution_data = result.get("solution", {})
-                        coordinates = solution_data.get("coordinates", [])
+                    if coordinates:
+                        if self.verbose:
+                            print(f"Found {len(coordinates)} coordinates to click")
+                            print("Starting coordinate processing...")
                         
-                        if coordinates:
+                        try:
+                            # Get window bounds and DPI scaling for coordinate translation
+                            window_bounds = None
+                            dpi_scaling = 1.0
+                            if self.active_window:
+                                if self.verbose:
+                                    print("Getting window bounds and DPI scaling...")
+                                window_bounds = self.active_window.bounds
+                                # Get DPI scaling for the window's display
+                                dpi_scaling = screenshot.detect_retina_dpi(target_bounds=window_bounds)
+                                if self.verbose:
+                                    print(f"Window DPI scaling: {dpi_scaling}")
+                            else:
+                                if self.verbose:
+                                    print("Warning: No active window found")
+                            
+                            # Validate and process coordinates
+                            processed_coordinates = []
                             if self.verbose:
-                                print(f"Found {len(coordinates)} coordinates to click")
-                                print("Starting coordinate processing...")
+                                print("Starting coordinate validation and processing...")
                             
-                            try:
-                                # Get window bounds and DPI scaling for coordinate translation
-                                window_bounds = None
-                                dpi_scaling = 1.0
-                                if self.active_window:
-                                    if self.verbose:
-                                        print("Getting window bounds and DPI scaling...")
-                                    window_bounds = self.active_window.bounds
-                                    # Get DPI scaling for the window's display
-                                    dpi_scaling = screenshot.detect_retina_dpi(target_bounds=window_bounds)
-                                    if self.verbose:
-                                        print(f"Window DPI scaling: {dpi_scaling}")
-                                else:
-                                    if self.verbose:
-                                        print("Warning: No active window found")
-                                
-                                # Validate and process coordinates
-                                processed_coordinates = []
+                            for i, coord in enumerate(coordinates):
                                 if self.verbose:
-                                    print("Starting coordinate validation and processing...")
+                                    print(f"Processing coordinate {i+1}: {coord}")
                                 
-                                for i, coord in enumerate(coordinates):
-                                    if self.verbose:
-                                        print(f"Processing coordinate {i+1}: {coord}")
+                                try:
+                                    # Validate coordinate format
+                                    if not isinstance(coord, dict) or 'x' not in coord or 'y' not in coord:
+                                        print(f"Warning: Invalid coordinate format at index {i}: {coord}")
+                                        continue
                                     
-                                    try:
-                                        # Validate coordinate format
-                                        if not isinstance(coord, dict) or 'x' not in coord or 'y' not in coord:
-                                            print(f"Warning: Invalid coordinate format at index {i}: {coord}")
-                                            continue
-                                        
-                                        x, y = coord.get("x"), coord.get("y")
-                                        if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
-                                            print(f"Warning: Invalid coordinate values at index {i}: x={x}, y={y}")
-                                            continue
-                                        
-                                        # Apply DPI scaling
-                                        x = int(x * dpi_scaling)
-                                        y = int(y * dpi_scaling)
-                                        
-                                        # Apply window offset if needed
-                                        if window_bounds:
-                                            x += window_bounds["x"]
-                                            y += window_bounds["y"]
-                                        
-                                        processed_coordinates.append({"x": x, "y": y})
-                                        
-                                        if self.verbose:
-                                            print(f"Successfully processed coordinate {i+1}: original=({coord['x']}, {coord['y']}), scaled=({x}, {y})")
-                                            
-                                    except Exception as coord_error:
-                                        print(f"Error processing coordinate {i+1}: {str(coord_error)}")
-                                        if self.verbose:
-                                            import traceback
-                                            print(f"Coordinate processing error traceback: {traceback.format_exc()}")
+                                    x, y = coord.get("x"), coord.get("y")
+                                    if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
+                                        print(f"Warning: Invalid coordinate values at index {i}: x={x}, y={y}")
                                         continue
-                                
-                                if not processed_coordinates:
-                                    if self.verbose:
-                                        print("No valid coordinates found after processing")
-                                    return {
-                                        "status": "error",
-                                        "error": "No valid coordinates found in the solution"
-                                    }
-                                
-                                if self.verbose:
-                                    print(f"Successfully processed {len(processed_coordinates)} coordinates")
-                                
-                                # Click each coordinate
-                                if self.verbose:
-                                    print(f"Starting to click {len(processed_coordinates)} coordinates")
-                                
-                                for i, coord in enumerate(processed_coordinates):
-                                    if self.verbose:
-                                        print(f"Clicking coordinate {i+1}: ({coord['x']}, {coord['y']})")
                                     
-                                    # Click the coordinate
-                                    pyautogui.moveTo(coord['x'], coord['y'], duration=0.3)
-                                    pyautogui.click()
+                                    # Apply DPI scaling
+                                    x = int(x * dpi_scaling)
+                                    y = int(y * dpi_scaling)
                                     
-                                    # Wait between clicks
-                                    if i < len(processed_coordinates) - 1:
-                                        if self.verbose:
-                                            print(f"Waiting {click_delay} seconds before next click")
-                                        await asyncio.sleep(click_delay)
-                                
-                                # Short wait after clicking all coordinates
-                                if self.verbose:
-                                    print("Waiting 1 second after clicking all coordinates")
-                                await asyncio.sleep(1.0)
-                                
-                                # Now click the verify/submit button
-                                if self.verbose:
-                                    print("Attempting to click verify/submit button")
-                                verify_result = await self.execute_action(
-                                    "Click the 'Verify' or 'Submit' button to complete the CAPTCHA",
-                                    detection_sensitivity=detection_sensitivity
-                                )
-                                
-                                # Add verify button click status and coordinate details to result
-                                result["verify_button_clicked"] = verify_result.get("success", False)
-                                result["click_details"] = {
-                                    "coordinates_clicked": len(processed_coordinates),
-                                    "dpi_scaling_applied": dpi_scaling,
-                                    "window_offset_applied": bool(window_bounds),
-                                    "processed_coordinates": processed_coordinates
-                                }
-                                
-                                if self.verbose:
-                                    if result["verify_button_clicked"]:
-                                        print("Successfully clicked verify button")
-                                    else:
-                                        print("Failed to click verify button")
-                                
-                            except Exception as e:
-                                print(f"Error during coordinate processing: {str(e)}")
+                                    # Apply window offset if needed
+                                    if window_bounds:
+                                        x += window_bounds["x"]
+                                        y += window_bounds["y"]
+                                    
+                                    processed_coordinates.append({"x": x, "y": y})
+                                    
+                                    if self.verbose:
+                                        print(f"Successfully processed coordinate {i+1}: original=({coord['x']}, {coord['y']}), scaled=({x}, {y})")
+                                        
+                                except Exception as coord_error:
+                                    print(f"Error processing coordinate {i+1}: {str(coord_error)}")
+                                    if self.verbose:
+                                        import traceback
+                                        print(f"Coordinate processing error traceback: {traceback.format_exc()}")
+                                    continue
+                            
+                            if not processed_coordinates:
                                 if self.verbose:
-                                    import traceback
-                                    print(f"Coordinate processing error traceback: {traceback.format_exc()}")
+                                    print("No valid coordinates found after processing")
                                 return {
                                     "status": "error",
-                                    "error": f"Failed to process coordinates: {str(e)}"
+                                    "error": "No valid coordinates found in the solution"
                                 }
-                    
-                    return result
-                    
-                except json.JSONDecodeError:
-                    return {
-                        "status": "error",
-                        "error": "Failed to parse API response as JSON"
-                    }
+                            
+                            if self.verbose:
+                                print(f"Successfully processed {len(processed_coordinates)} coordinates")
+                            
+                            # Click each coordinate
+                            if self.verbose:
+                                print(f"Starting to click {len(processed_coordinates)} coordinates")
+                            
+                            for i, coord in enumerate(processed_coordinates):
+                                if self.verbose:
+                                    print(f"Clicking coordinate {i+1}: ({coord['x']}, {coord['y']})")
+                                
+                                # Click the coordinate
+                                pyautogui.moveTo(coord['x'], coord['y'], duration=0.3)
+                                pyautogui.click()
+                                
+                                # Wait between clicks
+                                if i < len(processed_coordinates) - 1:
+                                    if self.verbose:
+                                        print(f"Waiting {click_delay} seconds before next click")
+                                    await asyncio.sleep(click_delay)
+                            
+                            # Short wait after clicking all coordinates
+                            if self.verbose:
+                                print("Waiting 1 second after clicking all coordinates")
+                            await asyncio.sleep(1.0)
+                            
+                            # Now click the verify/submit button
+                            if self.verbose:
+                                print("Attempting to click verify/submit button")
+                            verify_result = await self.execute_action(
+                                "Click the 'Verify' or 'Submit' button to complete the CAPTCHA",
+                                detection_sensitivity=detection_sensitivity
+                            )
+                            
+                            # Add verify button click status and coordinate details to result
+                            result["verify_button_clicked"] = verify_result.get("success", False)
+                            result["click_details"] = {
+                                "coordinates_clicked": len(processed_coordinates),
+                                "dpi_scaling_applied": dpi_scaling,
+                                "window_offset_applied": bool(window_bounds),
+                                "processed_coordinates": processed_coordinates
+                            }
+                            
+                            if self.verbose:
+                                if result["verify_button_clicked"]:
+                                    print("Successfully clicked verify button")
+                                else:
+                                    print("Failed to click verify button")
+                            
+                        except Exception as e:
+                            print(f"Error during coordinate processing: {str(e)}")
+                            if self.verbose:
+                                import traceback
+                                print(f"Coordinate processing error traceback: {traceback.format_exc()}")
+                            return {
+                                "status": "error",
+                                "error": f"Failed to process coordinates: {str(e)}"
+                            }
+                
+                return result
+                
+            except json.JSONDecodeError:
+                return {
+                    "status": "error",
+                    "error": "Failed to parse API response as JSON"
+                }
         
         except Exception as e:
             return {
@@ -2330,67 +2374,67 @@ If the element IS NOT VISIBLE:
                 debug.log_debug(self.debug_dir, "0", request_debug, "embed_request")
             
             # Send request to API
-            async with aiohttp.ClientSession() as session:
-                # Create form data
-                data = aiohttp.FormData()
-                data.add_field('normalize', str(normalize).lower())
-                
-                # Process each image and add to form data
-                for i, image in enumerate(images):
-                    if isinstance(image, str):
-                        # It's a file path
-                        if not os.path.exists(image):
-                            raise ValueError(f"Image file not found: {image}")
-                            
-                        with open(image, 'rb') as f:
-                            image_data = f.read()
-                            filename = os.path.basename(image)
-                    else:
-                        # It's raw image data
-                        image_data = image
-                        filename = f"image_{i}.png"  # Default filename
-                    
-                    # Add to form data
-                    data.add_field('files', 
-                                  image_data, 
-                                  filename=filename,
-                                  content_type='image/png')
-                
-                # Create headers with Authorization if API key is provided
-                headers = {}
-                if self.api_key:
-                    headers['Authorization'] = f'Bearer {self.api_key}'
-                
-                # Use the retry utility method
-                success, response_text, error_message = await self._make_api_request_with_retry(
-                    session=session,
-                    url=url,
-                    data=data,
-                    headers=headers,
-                    debug_prefix="embed",
-                    timestamp=timestamp
-                )
-                
-                if not success:
-                    raise RuntimeError(f"Failed to generate embeddings: {error_message}")
-                
-                # Parse response
-                try:
-                    result = json.loads(response_text)
-                except json.JSONDecodeError:
-                    raise RuntimeError(f"Failed to parse response as JSON. Response saved to {self.debug_dir}/embed_response_raw_{timestamp}.txt")
-                
-                # Log parsed response
-                if self.debug_enabled:
-                    with open(f'{self.debug_dir}/embed_response_{timestamp}.json', 'w') as f:
-                        json.dump(result, f, indent=2)
-                
-                # Return the embeddings result
-                return {
-                    "embeddings": result.get("embeddings", []),
-                    "processing_time": result.get("processing_time", 0)
-                }
+            session = await self.get_session()
+            # Create form data
+            data = aiohttp.FormData()
+            data.add_field('normalize', str(normalize).lower())
+            
+            # Process each image and add to form data
+            for i, image in enumerate(images):
+                if isinstance(image, str):
+                    # It's a file path
+                    if not os.path.exists(image):
+                        raise ValueError(f"Image file not found: {image}")
+                        
+                    with open(image, 'rb') as f:
+                        image_data = f.read()
+                        filename = os.path.basename(image)
+                else:
+                    # It's raw image data
+                    image_data = image
+                    filename = f"image_{i}.png"  # Default filename
                 
+                # Add to form data
+                data.add_field('files', 
+                              image_data, 
+                              filename=filename,
+                              content_type='image/png')
+            
+            # Create headers with Authorization if API key is provided
+            headers = {}
+            if self.api_key:
+                headers['Authorization'] = f'Bearer {self.api_key}'
+            
+            # Use the retry utility method
+            success, response_text, error_message = await self._make_api_request_with_retry(
+                session=session,
+                url=url,
+                data=data,
+                headers=headers,
+                debug_prefix="embed",
+                timestamp=timestamp
+            )
+            
+            if not success:
+                raise RuntimeError(f"Failed to generate embeddings: {error_message}")
+            
+            # Parse response
+            try:
+                result = json.loads(response_text)
+            except json.JSONDecodeError:
+                raise RuntimeError(f"Failed to parse response as JSON. Response saved to {self.debug_dir}/embed_response_raw_{timestamp}.txt")
+            
+            # Log parsed response
+            if self.debug_enabled:
+                with open(f'{self.debug_dir}/embed_response_{timestamp}.json', 'w') as f:
+                    json.dump(result, f, indent=2)
+            
+            # Return the embeddings result
+            return {
+                "embeddings": result.get("embeddings", []),
+                "processing_time": result.get("processing_time", 0)
+            }
+            
         except Exception as e:
             error_msg = f"Error generating embeddings: {str(e)}"
             if self.verbose:
@@ -2579,7 +2623,7 @@ If the element IS NOT VISIBLE:
             raise RuntimeError(error_msg) from e
             
     async def extract_html(self,
-                          html: str,
+                          html: Union[str, bytes],
                           query: str,
                           output_format: str = "json",
                           schema: Optional[Dict[str, Any]] = None) -> ExtractResponse:
@@ -2588,7 +2632,7 @@ If the element IS NOT VISIBLE:
         The HTML content will be automatically base64 encoded before sending to the API.
         
         Args:
-            html: The raw HTML content to extract data from
+            html: The raw HTML content to extract data from, as a string or UTF-8 encoded bytes
             query: Natural language query describing what data to extract
             output_format: Format for the output data ("json" or "csv")
             schema: Optional schema defining the expected structure of the output data
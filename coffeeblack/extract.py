@@ -2,12 +2,13 @@
 HTML extraction functionality for the CoffeeBlack SDK.
 """
 
+import asyncio
 import base64
 import json
 import logging
 import time
 import aiohttp
-from typing import Dict, Any, Optional
+from typing import Awaitable, Callable, Dict, Any, Optional, Union
 
 from .types import ExtractResponse
 
@@ -19,7 +20,12 @@ class HTMLExtractor:
     Handles extracting structured data from HTML using natural language queries.
     """
     
-    def __init__(self, base_url: str, api_key: Optional[str] = None, debug_enabled: bool = False, debug_dir: str = 'debug'):
+    def __init__(self,
+                 base_url: str,
+                 api_key: Optional[str] = None,
+                 debug_enabled: bool = False,
+                 debug_dir: str = 'debug',
+                 session_provider: Optional[Callable[[], Awaitable[aiohttp.ClientSession]]] = None):
         """
         Initialize the HTML extractor.
         
@@ -28,11 +34,14 @@ class HTMLExtractor:
             api_key: Optional API key for authentication
             debug_enabled: Whether to enable debug logging
             debug_dir: Directory for debug logs
+            session_provider: Optional coroutine function returning a shared
+                aiohttp session; a new session is created per request without it
         """
         self.base_url = base_url
         self.api_key = api_key
         self.debug_enabled = debug_enabled
         self.debug_dir = debug_dir
+        self.session_provider = session_provider
 
     async def _make_api_request_with_retry(self, 
                                          session: aiohttp.ClientSession,
@@ -82,8 +91,53 @@ class HTMLExtractor:
         logger.warning(error_message)
         return False, None, error_message
 
+    async def _send_extract_request(self, session: aiohttp.ClientSession, payload: Dict[str, Any]) -> ExtractResponse:
+        """
+        Send an extraction payload to the API and parse the response.
+        
+        Args:
+            session: HTTP session to send the request with
+            payload: Request payload built by extract()
+        
+        Returns:
+            ExtractResponse object for the parsed response
+        """
+        # Construct API URL
+        url = f"{self.base_url}/api/extract/html"
+        
+        # Add headers including API key if provided
+        headers = {
+            'Content-Type': 'application/json'
+        }
+        if self.api_key:
+            headers['Authorization'] = f'Bearer {self.api_key}'
+        
+        # Make API request with retry
+        success, response_text, error_message = await self._make_api_request_with_retry(
+            session=session,
+            url=url,
+            data=payload,
+            headers=headers
+        )
+        
+        if not success:
+            raise RuntimeError(f"Failed to extract data: {error_message}")
+        
+        # Parse response
+        try:
+            result = json.loads(response_text)
+        except json.JSONDecodeError:
+            raise RuntimeError(f"Failed to parse response as JSON")
+        
+        # Log results if debug enabled
+        if self.debug_enabled:
+            logger.info(f"Extraction completed in {result.get('processing_time', 0)}s")
+        
+        # Return ExtractResponse object
+        return ExtractResponse(result)
+
     async def extract(self,
-                     html: str,
+                     html: Union[str, bytes],
                      query: str,
                      output_format: str = "json",
                      schema: Optional[Dict[str, Any]] = None) -> ExtractResponse:
@@ -92,7 +146,7 @@ class HTMLExtractor:
         The HTML content will be automatically base64 encoded before sending to the API.
         
         Args:
-            html: The raw HTML content to extract data from
+            html: The raw HTML content to extract data from, as a string or UTF-8 encoded bytes
             query: Natural language query describing what data to extract
             output_format: Format for the output data ("json" or "csv")
             schema: Optional schema defining the expected structure of the output data
@@ -109,8 +163,10 @@ class HTMLExtractor:
         if output_format not in valid_formats:
             raise ValueError(f"Invalid output format. Must be one of: {', '.join(valid_formats)}")
         
-        # Base64 encode the HTML content
-        encoded_html = base64.b64encode(html.encode()).decode()
+        # Base64 encode the HTML content, skipping the encode step for bytes input
+        if isinstance(html, str):
+            html = html.encode()
+        encoded_html = base64.b64encode(html).decode()
         
         # Prepare request payload
         payload = {
@@ -131,40 +187,12 @@ class HTMLExtractor:
                 logger.info(f"Using schema: {schema}")
         
         try:
+            if self.session_provider is not None:
+                session = await self.session_provider()
+                return await self._send_extract_request(session, payload)
+            
             async with aiohttp.ClientSession() as session:
-                # Construct API URL
-                url = f"{self.base_url}/api/extract/html"
-                
-                # Add headers including API key if provided
-                headers = {
-                    'Content-Type': 'application/json'
-                }
-                if self.api_key:
-                    headers['Authorization'] = f'Bearer {self.api_key}'
-                
-                # Make API request with retry
-                success, response_text, error_message = await self._make_api_request_with_retry(
-                    session=session,
-                    url=url,
-                    data=payload,
-                    headers=headers
-                )
-                
-                if not success:
-                    raise RuntimeError(f"Failed to extract data: {error_message}")
-                
-                # Parse response
-                try:
-                    result = json.loads(response_text)
-                except json.JSONDecodeError:
-                    raise RuntimeError(f"Failed to parse response as JSON")
-                
-                # Log results if debug enabled
-                if self.debug_enabled:
-                    logger.info(f"Extraction completed in {result.get('processing_time', 0)}s")
-                
-                # Return ExtractResponse object
-                return ExtractResponse(result)
+                return await self._send_extract_request(session, payload)
                 
         except Exception as e:
             raise RuntimeError(f"Failed to extract data from HTML: {e}") 
\ No newline at end of file
@@ -9,17 +9,107 @@ This script:
 """
 
 import asyncio
+import concurrent.futures
+import functools
 import os
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import json
-from typing import Dict, Any, List, Tuple
+import textwrap
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 from coffeeblack import CoffeeBlackSDK
 
 # Configuration
 INPUT_DIR = "evals/recaptcha"
 OUTPUT_DIR = "evals/recaptcha/results"
-SUPPORTED_FORMATS = ['.png', '.jpg', '.jpeg', '.webp']
+SUPPORTED_FORMATS = frozenset({'.png', '.jpg', '.jpeg', '.webp'})
 DEV_SERVER = "http://localhost:3000"  # Development server URL
+MAX_CONCURRENT_EVALS = 8  # Maximum number of images evaluated at once
+GRID_SPACING = 50  # Grid line spacing in pixels
+GRID_COLOR = (0, 0, 255, 64)  # Semi-transparent blue
+DOT_RADIUS = 5  # Radius of the solution dots in pixels
+DOT_COLOR = (255, 0, 0, 180)  # Semi-transparent red
+
+# Load the label font once and reuse it for every draw.text call
+try:
+    LABEL_FONT = ImageFont.truetype("DejaVuSans.ttf", 12)
+except OSError:
+    LABEL_FONT = ImageFont.load_default()
+
+@functools.lru_cache(maxsize=16)
+def _grid_mask(width: int, height: int) -> Image.Image:
+    """
+    Build a blend mask ('L' mode) covering the grid lines.
+    
+    Cached per resolution, since CAPTCHA images in a batch usually share dimensions.
+    The returned image is shared and must not be modified in place.
+    
+    Args:
+        width: Width of the image the grid will be blended onto
+        height: Height of the image the grid will be blended onto
+        
+    Returns:
+        Mask with GRID_COLOR's alpha on grid lines every GRID_SPACING pixels
+    """
+    mask = np.zeros((height, width), dtype=np.uint8)
+    mask[:, ::GRID_SPACING] = GRID_COLOR[3]
+    mask[::GRID_SPACING, :] = GRID_COLOR[3]
+    return Image.fromarray(mask, 'L')
+
+def _dots_mask(width: int, height: int, coordinates: List[Dict[str, int]]) -> Image.Image:
+    """
+    Rasterize a filled dot at every coordinate into a blend mask ('L' mode).
+    
+    All dots are stamped in one vectorized NumPy assignment rather than one
+    ImageDraw.ellipse call per coordinate.
+    
+    Args:
+        width: Width of the image the dots will be blended onto
+        height: Height of the image the dots will be blended onto
+        coordinates: List of coordinate dictionaries with 'x' and 'y' keys
+        
+    Returns:
+        Mask with DOT_COLOR's alpha in a DOT_RADIUS dot centred on each coordinate
+    """
+    # Pixel offsets covered by a single dot
+    dy, dx = np.mgrid[-DOT_RADIUS:DOT_RADIUS + 1, -DOT_RADIUS:DOT_RADIUS + 1]
+    inside = dx * dx + dy * dy <= DOT_RADIUS * DOT_RADIUS
+    dx, dy = dx[inside], dy[inside]
+    
+    # Offset every coordinate by the dot footprint, dropping pixels outside the image
+    points = np.rint([[c['x'], c['y']] for c in coordinates]).reshape(-1, 2).astype(np.intp)
+    xs = (points[:, 0, None] + dx).ravel()
+    ys = (points[:, 1, None] + dy).ravel()
+    visible = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    
+    mask = np.zeros((height, width), dtype=np.uint8)
+    mask[ys[visible], xs[visible]] = DOT_COLOR[3]
+    return Image.fromarray(mask, 'L')
+
+def _blend_color(img: Image.Image, color: Tuple[int, int, int, int], mask: Image.Image) -> Image.Image:
+    """
+    Blend a solid colour onto an image wherever the mask is set.
+    
+    RGB images are blended in place with Image.paste, so no RGBA working copy
+    is allocated. RGBA images go through Image.alpha_composite to keep their
+    alpha channel correct.
+    
+    Args:
+        img: 'RGB' or 'RGBA' image to blend onto
+        color: RGBA colour to blend; its alpha is taken from the mask
+        mask: 'L' mode mask giving the per-pixel blend amount
+        
+    Returns:
+        The blended image
+    """
+    if img.mode == 'RGBA':
+        overlay = Image.new('RGBA', img.size, color[:3] + (0,))
+        overlay.putalpha(mask)
+        return Image.alpha_composite(img, overlay)
+    
+    img.paste(color[:3], mask=mask)
+    return img
 
 def draw_solution_on_image(image_path: str, coordinates: List[Dict[str, int]], output_path: str) -> None:
     """
@@ -30,62 +120,58 @@ def draw_solution_on_image(image_path: str, coordinates: List[Dict[str, int]], o
         coordinates: List of coordinate dictionaries with 'x' and 'y' keys
         output_path: Path to save the annotated image
     """
-    # Open and convert image to RGBA
+    if not coordinates:
+        return
+    
+    # Open the image, only upconverting to RGBA when it actually has transparency
     img = Image.open(image_path)
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
+    if img.mode not in ('RGB', 'RGBA'):
+        has_alpha = 'A' in img.getbands() or 'transparency' in img.info
+        img = img.convert('RGBA' if has_alpha else 'RGB')
     
-    # Create a drawing context
-    draw = ImageDraw.Draw(img)
+    # Blend grid lines (every GRID_SPACING pixels) in a single pass
+    img = _blend_color(img, GRID_COLOR, _grid_mask(img.width, img.height))
     
-    # Draw grid lines (every 50 pixels)
-    grid_spacing = 50
-    grid_color = (0, 0, 255, 64)  # Semi-transparent blue
+    # Blend all solution dots in a single pass
+    img = _blend_color(img, DOT_COLOR, _dots_mask(img.width, img.height, coordinates))
     
-    for x in range(0, img.width, grid_spacing):
-        draw.line([(x, 0), (x, img.height)], fill=grid_color, width=1)
-    for y in range(0, img.height, grid_spacing):
-        draw.line([(0, y), (img.width, y)], fill=grid_color, width=1)
+    # Create a drawing context
+    draw = ImageDraw.Draw(img)
     
-    # Draw coordinates with numbers
-    dot_radius = 5
+    # Draw a number next to each coordinate
     for i, coord in enumerate(coordinates):
         x, y = coord['x'], coord['y']
-        
-        # Draw red circle
-        draw.ellipse(
-            [(x - dot_radius, y - dot_radius), (x + dot_radius, y + dot_radius)],
-            fill=(255, 0, 0, 180)  # Semi-transparent red
-        )
-        
-        # Draw number
         draw.text(
-            (x + dot_radius + 2, y - dot_radius - 2),
+            (x + DOT_RADIUS + 2, y - DOT_RADIUS - 2),
             str(i + 1),
-            fill=(255, 0, 0, 255)  # Solid red
+            fill=(255, 0, 0, 255),  # Solid red
+            font=LABEL_FONT
         )
     
-    # Save the result
-    img.save(output_path)
+    # Save the result with fast, light compression; these are transient eval artifacts
+    img.save(output_path, format='PNG', compress_level=1)
 
-async def evaluate_image(sdk: CoffeeBlackSDK, image_path: str) -> Dict[str, Any]:
+async def evaluate_image(sdk: CoffeeBlackSDK, 
+                         image_path: str, 
+                         executor: Optional[concurrent.futures.Executor] = None) -> Dict[str, Any]:
     """
     Evaluate a single CAPTCHA image using the SDK.
     
     Args:
         sdk: CoffeeBlack SDK instance
         image_path: Path to the image to evaluate
+        executor: Optional executor to run the CPU-bound annotation in, so it
+            overlaps with other images' network requests (defaults to the loop's
+            thread pool)
         
     Returns:
         Dictionary containing evaluation results
     """
     try:
-        # Read the image file
-        with open(image_path, 'rb') as f:
-            image_data = f.read()
+        image_file = Path(image_path)
         
-        # Get base filename without extension
-        base_name = os.path.splitext(os.path.basename(image_path))[0]
+        # Read the image file off the event loop so concurrent evaluations keep running
+        image_data = await asyncio.to_thread(image_file.read_bytes)
         
         # Use the SDK's solve_captcha method
         result = await sdk.solve_captcha(
@@ -97,9 +183,12 @@ async def evaluate_image(sdk: CoffeeBlackSDK, image_path: str) -> Dict[str, Any]
         # If solution was found, draw it on the image
         if result.get('status') == 'success' and 'solution' in result:
             solution = result['solution']
-            if 'coordinates' in solution:
-                output_path = os.path.join(OUTPUT_DIR, f"{base_name}_solved.png")
-                draw_solution_on_image(image_path, solution['coordinates'], output_path)
+            # Nothing to annotate when the solution has no click points
+            if solution.get('coordinates'):
+                output_path = str(Path(OUTPUT_DIR) / f"{image_file.stem}_solved.png")
+                await asyncio.get_running_loop().run_in_executor(
+                    executor, draw_solution_on_image, image_path, solution['coordinates'], output_path
+                )
                 result['output_image'] = output_path
         
         return result
@@ -111,6 +200,43 @@ async def evaluate_image(sdk: CoffeeBlackSDK, image_path: str) -> Dict[str, Any]
             'image': image_path
         }
 
+def print_result_summary(image_path: str, result: Dict[str, Any]) -> None:
+    """
+    Print a short summary of a single image's evaluation result.
+    
+    Args:
+        image_path: Path to the evaluated image
+        result: Result dictionary returned by evaluate_image
+    """
+    print(f"\n{Path(image_path).name}:")
+    if result.get('status') == 'success':
+        print("✓ Success!")
+        if 'solution' in result and 'coordinates' in result['solution']:
+            coords = result['solution']['coordinates']
+            print(f"  Found {len(coords)} click points")
+            if 'output_image' in result:
+                print(f"  Saved annotated image to: {Path(result['output_image']).name}")
+    else:
+        print(f"✗ Failed: {result.get('error', 'Unknown error')}")
+
+def write_pretty_results(jsonl_path: Path, results_path: Path) -> None:
+    """
+    Convert the streamed JSON Lines results into a pretty-printed JSON array.
+    
+    Entries are copied one at a time so the full result set is never held in memory.
+    
+    Args:
+        jsonl_path: Path to the JSON Lines results file
+        results_path: Path to write the JSON array to
+    """
+    with open(jsonl_path, 'r') as jsonl_file, open(results_path, 'w') as f:
+        f.write('[')
+        for i, line in enumerate(jsonl_file):
+            entry = json.dumps(json.loads(line), indent=2)
+            f.write(',\n' if i else '\n')
+            f.write(textwrap.indent(entry, '  '))
+        f.write('\n]')
+
 async def main():
     """Main function to run the evaluation"""
     # Initialize SDK
@@ -130,48 +256,68 @@ async def main():
         model="ui-detect"
     )
     
-    # Get list of images to evaluate
-    images = []
-    for filename in os.listdir(INPUT_DIR):
-        if any(filename.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
-            images.append(os.path.join(INPUT_DIR, filename))
-    
-    if not images:
-        print(f"No supported images found in {INPUT_DIR}")
-        return
+    # Image annotation is CPU-bound, so run it in worker processes
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(MAX_CONCURRENT_EVALS, os.cpu_count() or 1)
+    )
     
-    print(f"Found {len(images)} images to evaluate")
-    
-    # Create results directory if it doesn't exist
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
-    # Evaluate each image
-    results = []
-    for image_path in images:
-        print(f"\nEvaluating {os.path.basename(image_path)}...")
-        result = await evaluate_image(sdk, image_path)
-        results.append({
-            'image': os.path.basename(image_path),
-            'result': result
-        })
-        
-        # Print result summary
-        if result.get('status') == 'success':
-            print("✓ Success!")
-            if 'solution' in result and 'coordinates' in result['solution']:
-                coords = result['solution']['coordinates']
-                print(f"  Found {len(coords)} click points")
-                if 'output_image' in result:
-                    print(f"  Saved annotated image to: {os.path.basename(result['output_image'])}")
-        else:
-            print(f"✗ Failed: {result.get('error', 'Unknown error')}")
-    
-    # Save full results to JSON
-    results_path = os.path.join(OUTPUT_DIR, 'evaluation_results.json')
-    with open(results_path, 'w') as f:
-        json.dump(results, f, indent=2)
-    
-    print(f"\nEvaluation complete! Full results saved to {results_path}")
+    # The same SDK instance (and its pooled HTTP session) is shared by every evaluation
+    try:
+        # Get list of images to evaluate
+        with os.scandir(INPUT_DIR) as entries:
+            images = [
+                entry.path for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in SUPPORTED_FORMATS and entry.is_file()
+            ]
+        
+        if not images:
+            print(f"No supported images found in {INPUT_DIR}")
+            return
+        
+        print(f"Found {len(images)} images to evaluate")
+        
+        # Create results directory if it doesn't exist
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        
+        # Results are streamed to a JSON Lines file as each image completes
+        output_dir = Path(OUTPUT_DIR)
+        jsonl_path = output_dir / 'evaluation_results.jsonl'
+        results_path = output_dir / 'evaluation_results.json'
+        
+        # Evaluate images concurrently, bounded by a semaphore
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_EVALS)
+        
+        with open(jsonl_path, 'w') as jsonl_file:
+            async def bounded_evaluate(image_path: str) -> None:
+                image_name = Path(image_path).name
+                async with semaphore:
+                    print(f"\nEvaluating {image_name}...")
+                    try:
+                        result = await evaluate_image(sdk, image_path, executor)
+                    except Exception as e:
+                        result = {
+                            'status': 'error',
+                            'error': str(e),
+                            'image': image_path
+                        }
+                
+                jsonl_file.write(json.dumps({
+                    'image': image_name,
+                    'result': result
+                }) + '\n')
+                jsonl_file.flush()
+                
+                print_result_summary(image_path, result)
+            
+            await asyncio.gather(*[bounded_evaluate(image_path) for image_path in images])
+        
+        # Save full results to pretty-printed JSON
+        write_pretty_results(jsonl_path, results_path)
+        
+        print(f"\nEvaluation complete! Full results saved to {results_path}")
+    finally:
+        executor.shutdown()
+        await sdk.close()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -7,12 +7,18 @@ import os
 import sys
 import os.path
 import time
-from coffeeblack import Argus
 
 async def main():
     # Initialize the SDK with API key for authentication
     # You can provide your API key directly or through an environment variable
     api_key = os.environ.get("COFFEEBLACK_API_KEY")
+    if not api_key:
+        print("Please set the COFFEEBLACK_API_KEY environment variable")
+        return
+    
+    # Import the SDK only once we know it will be used, keeping startup fast
+    from coffeeblack import Argus
+    
     sdk = Argus(
         api_key=api_key,  # API key for authentication
         verbose=True,
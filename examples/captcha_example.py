@@ -14,13 +14,9 @@ This example uses the Nursys.com nurse license verification form which contains
 import os
 import sys
 import asyncio
-import pyautogui
 from typing import Dict, Any, Optional
 import time
 
-# Import the CoffeeBlack SDK
-from coffeeblack import Argus
-
 async def automate_captcha_form(api_key: Optional[str] = None) -> None:
     """
     Automate filling out a form with a CAPTCHA challenge.
@@ -41,6 +37,9 @@ async def automate_captcha_form(api_key: Optional[str] = None) -> None:
     api_key = api_key.strip()
     print(f"Using API key: {api_key[:5]}...{api_key[-5:] if len(api_key) > 10 else ''}")
     
+    # Import the CoffeeBlack SDK only after the API key check, keeping startup fast
+    from coffeeblack import Argus
+    
     # Initialize the SDK
     print("Initializing CoffeeBlack SDK...")
     try:
@@ -60,7 +59,12 @@ async def automate_captcha_form(api_key: Optional[str] = None) -> None:
         await sdk.open_and_attach_to_app("Safari")
         
         # Wait for Safari to fully load
-        await asyncio.sleep(3)
+        await sdk.see(
+            description="A Safari browser window with an address bar",
+            wait=True,
+            timeout=10.0,
+            interval=0.3
+        )
         
         # Type the URL and press Enter
         try:
@@ -69,7 +73,12 @@ async def automate_captcha_form(api_key: Optional[str] = None) -> None:
             await sdk.press_key("enter")
             # Wait for page to load
             print("Waiting for page to load...")
-            await asyncio.sleep(5)  # Increased wait time
+            await sdk.see(
+                description="The Nursys license verification page",
+                wait=True,
+                timeout=15.0,
+                interval=0.3
+            )
         except Exception as e:
             print(f"Error navigating to URL: {e}")
             return
@@ -102,9 +111,19 @@ async def automate_captcha_form(api_key: Optional[str] = None) -> None:
             
             # Look for and click the agree button if present
             await sdk.scroll_down(1)
-            await asyncio.sleep(2)  
+            await sdk.see(
+                description="An Agree button",
+                wait=True,
+                timeout=5.0,
+                interval=0.3
+            )
             await sdk.execute_action("Click on the Agree button")
-            await asyncio.sleep(3)
+            await sdk.see(
+                description="A search form with a Last Name field",
+                wait=True,
+                timeout=10.0,
+                interval=0.3
+            )
         except Exception as e:
             print(f"Error interacting with initial page: {e}")
             # Continue despite errors
@@ -113,22 +132,22 @@ async def automate_captcha_form(api_key: Optional[str] = None) -> None:
         try:
             print("\nStep 3: Filling out form fields...")
             response = await sdk.execute_action("Type 'Doe' into the Last Name field", elements_conf=0.2)
-            await asyncio.sleep(2)
+            await asyncio.sleep(0.5)  # Let the field commit the typed text
             
             response = await sdk.execute_action("Type 'John' into the First Name button", elements_conf=0.2, rows_conf=0.2)
-            await asyncio.sleep(2)
+            await asyncio.sleep(0.5)
             
             response = await sdk.execute_action("Click on the License Type selector", elements_conf=0.2)
-            await asyncio.sleep(2)
+            await sdk.see(description="An open License Type dropdown list", wait=True, timeout=5.0, interval=0.3)
             
             response = await sdk.execute_action("Select RN from the License Type selector", elements_conf=0.2)
-            await asyncio.sleep(2)
+            await asyncio.sleep(0.5)
             
             response = await sdk.execute_action("Click on the State selector", elements_conf=0.2)
-            await asyncio.sleep(2)
+            await sdk.see(description="An open State dropdown list", wait=True, timeout=5.0, interval=0.3)
             
             response = await sdk.execute_action("Select CALIFORNIA-RN from the State selector", elements_conf=0.2)
-            await asyncio.sleep(3)
+            await asyncio.sleep(0.5)
         except Exception as e:
             print(f"Error filling form fields: {e}")
             # Continue despite errors
@@ -166,11 +185,15 @@ async def automate_captcha_form(api_key: Optional[str] = None) -> None:
         try:
             print("\nStep 5: Submitting form...")
             response = await sdk.execute_action("Click on the Search button", elements_conf=0.2)
-            await asyncio.sleep(3)
             
             # Wait to see the result
             print("\nWaiting to see the result...")
-            await asyncio.sleep(5)
+            await sdk.see(
+                description="Nurse license search results",
+                wait=True,
+                timeout=15.0,
+                interval=0.3
+            )
             
             # Take a final screenshot to see the result
             print("\nTaking a final screenshot to verify result...")
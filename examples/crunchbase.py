@@ -9,8 +9,14 @@ This script demonstrates how to:
 """
 
 import asyncio
+import hashlib
+import io
+import json
+import logging
 import os
+import shutil
 import time
+import traceback
 from datetime import datetime
 import pyautogui
 import pyperclip
@@ -18,51 +24,305 @@ import csv
 from coffeeblack import Argus
 from typing import List
 
-async def extract_current_page_html(sdk, page_number):
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Debug output from the extraction helpers is only shown when VERBOSE is set
+logging.basicConfig(level=logging.DEBUG if os.environ.get("VERBOSE") else logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Maximum number of concurrent requests to the HTML extraction endpoint
+MAX_CONCURRENT_EXTRACTIONS = 8
+
+# Extraction results keyed by a hash of the page HTML, shared across runs so
+# retries and re-runs of identical pages skip the extraction endpoint
+CACHE_DIR = os.path.join("crunchbase_data", ".cache")
+
+# Saved page HTML is zstd-compressed when zstandard is installed
+HTML_EXTENSION = ".html.zst" if zstandard is not None else ".html"
+
+# Retries per page before the crawl gives up, and the cap on the backoff delay
+MAX_PAGE_ATTEMPTS = 5
+MAX_RETRY_DELAY = 60
+
+if msgspec is not None:
+    class Investor(msgspec.Struct):
+        """A single investor row, matching the extraction schema"""
+        name: str = ""
+        type: str = ""
+        investments: int = 0
+        exits: int = 0
+        location: str = ""
+
+# AppleScript used to evaluate JavaScript in the front tab of each supported browser.
+# Safari requires "Allow JavaScript from Apple Events" in its Develop menu.
+BROWSER_JS_SCRIPTS = {
+    "Safari": 'tell application "Safari" to do JavaScript {js} in current tab of front window',
+    "Google Chrome": 'tell application "Google Chrome" to execute front window\'s active tab javascript {js}',
+}
+
+# AppleScript used to point the front tab of each supported browser at a URL
+BROWSER_NAVIGATE_SCRIPTS = {
+    "Safari": 'tell application "Safari" to set URL of current tab of front window to {url}',
+    "Google Chrome": 'tell application "Google Chrome" to set URL of active tab of front window to {url}',
+}
+
+async def run_osascript(script):
+    """
+    Run an AppleScript snippet and return its result as a string.
+    
+    Returns:
+        The script result, or None if the call failed
+    """
+    process = await asyncio.create_subprocess_exec(
+        "osascript", "-e", script,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        print(f"AppleScript call failed: {stderr.decode(errors='replace').strip()}")
+        return None
+    
+    # osascript appends a trailing newline to the result
+    result = stdout.decode("utf-8")
+    return result[:-1] if result.endswith("\n") else result
+
+async def run_browser_javascript(browser_name, js):
+    """
+    Evaluate JavaScript in the browser's front tab and return the result as a string.
+    
+    Talks to the browser directly through AppleScript, so no devtools UI,
+    keystrokes or clipboard round-trip are involved.
+    
+    Returns:
+        The script result, or None if the browser is unsupported or the call failed
+    """
+    template = BROWSER_JS_SCRIPTS.get(browser_name)
+    if template is None:
+        return None
+    
+    # json.dumps gives a double-quoted string literal with escapes AppleScript accepts
+    return await run_osascript(template.format(js=json.dumps(js, ensure_ascii=False)))
+
+async def navigate_browser(browser_name, url):
+    """
+    Load a URL in the browser's front tab without going through the UI.
+    
+    Returns:
+        True if the browser accepted the navigation, False if it is unsupported or the call failed
+    """
+    template = BROWSER_NAVIGATE_SCRIPTS.get(browser_name)
+    if template is None:
+        return False
+    return await run_osascript(template.format(url=json.dumps(url))) is not None
+
+# Cheap fingerprint of the rendered page, used to tell when navigation has finished
+PAGE_SIGNATURE_JS = """(() => {
+    let hash = 0;
+    const text = document.body ? document.body.innerText : "";
+    for (let i = 0; i < text.length; i++) {
+        hash = (hash * 31 + text.charCodeAt(i)) | 0;
+    }
+    return document.readyState + ":" + location.href + ":" + hash;
+})()"""
+
+async def wait_until(predicate, timeout, interval=0.1):
+    """
+    Poll an async predicate until it returns a truthy value.
+    
+    Returns:
+        True if the predicate was satisfied, False if the timeout expired first
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        if await predicate():
+            return True
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(interval)
+
+async def wait_for_page_change(browser_name, previous_signature, timeout=10.0):
+    """
+    Wait until the page has finished loading and differs from previous_signature.
+    Falls back to a fixed wait when the page can't be inspected directly.
+    """
+    if previous_signature is None:
+        await asyncio.sleep(5)
+        return
+    
+    async def page_changed():
+        signature = await run_browser_javascript(browser_name, PAGE_SIGNATURE_JS)
+        return (
+            signature is not None
+            and signature != previous_signature
+            and signature.startswith("complete:")
+        )
+    
+    if not await wait_until(page_changed, timeout, interval=0.25):
+        print(f"Page did not finish changing within {timeout}s, continuing anyway")
+
+async def extract_html_via_devtools(page_number):
+    """Fallback: copy the page HTML through the developer console and clipboard"""
+    # Open developer console
+    print("Opening developer console...")
+    pyautogui.hotkey('option', 'command', 'c')
+    await asyncio.sleep(2)  # Increased delay after opening console
+
+    # JavaScript to get complete HTML
+    js_get_html = "copy(document.documentElement.outerHTML);"
+    
+    # Paste and execute the JavaScript
+    print(f"Getting page {page_number} HTML...")
+    pyperclip.copy(js_get_html)
+    pyautogui.hotkey('command', 'v')
+    await asyncio.sleep(1)  # Added delay before pressing enter
+    pyautogui.press('enter')
+
+    # The clipboard holds the snippet until the console replaces it with the HTML
+    async def clipboard_changed():
+        return pyperclip.paste() != js_get_html
+    
+    if not await wait_until(clipboard_changed, timeout=5.0):
+        print("Timed out waiting for the HTML to reach the clipboard")
+        html_content = None
+    else:
+        html_content = pyperclip.paste()
+    
+    # Close the console
+    print("Closing developer console...")
+    pyautogui.hotkey('option', 'command', 'i')
+    await asyncio.sleep(2)  # Increased delay after closing console
+    
+    return html_content
+
+async def extract_current_page_html(sdk, page_number, browser_name="Safari"):
     """Helper function to extract HTML from current page"""
     try:
-        # Open developer console
-        print("Opening developer console...")
-        pyautogui.hotkey('option', 'command', 'c')
-        await asyncio.sleep(2)  # Increased delay after opening console
-
-        # JavaScript to get complete HTML
-        js_get_html = "copy(document.documentElement.outerHTML);"
-        
-        # Paste and execute the JavaScript
+        # Read the DOM directly from the browser
         print(f"Getting page {page_number} HTML...")
-        pyperclip.copy(js_get_html)
-        await asyncio.sleep(1)  # Added delay before typing
-        pyautogui.hotkey('command', 'v')
-        await asyncio.sleep(1)  # Added delay before pressing enter
-        pyautogui.press('enter')
-        await asyncio.sleep(3)  # Increased delay to ensure HTML is copied
-
-        # Get the HTML from clipboard
-        html_content = pyperclip.paste()
-        
-        # Close the console
-        print("Closing developer console...")
-        await asyncio.sleep(1)  # Added delay before closing console
-        pyautogui.hotkey('option', 'command', 'i')
-        await asyncio.sleep(2)  # Increased delay after closing console
+        html_content = await run_browser_javascript(browser_name, "document.documentElement.outerHTML")
+        if html_content:
+            return html_content
         
-        return html_content
+        # Fall back to the developer console if direct access isn't available
+        print("Direct DOM access unavailable, falling back to the developer console...")
+        return await extract_html_via_devtools(page_number)
 
     except Exception as e:
         print(f"Error extracting HTML from page {page_number}: {str(e)}")
         print("Full error details:")
-        import traceback
         traceback.print_exc()
         return None
 
-async def extract_investor_data(sdk, html_content):
-    """Extract structured investor data from HTML using the extraction endpoint"""
+def get_cache_path(html_bytes):
+    """Return the cache file path for a page's UTF-8 encoded HTML"""
+    key = hashlib.blake2b(html_bytes, digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+def decode_investors(extracted_data):
+    """
+    Decode investor records into Investor structs with msgspec.
+    Returns a list of dicts, or None if the data doesn't match the schema.
+    """
     try:
-        if not html_content:
-            print("Warning: Empty HTML content received")
+        if isinstance(extracted_data, str):
+            investors = msgspec.json.decode(extracted_data, type=List[Investor], strict=False)
+        else:
+            investors = msgspec.convert(extracted_data, type=List[Investor], strict=False)
+    except msgspec.DecodeError as e:
+        logger.debug(f"msgspec could not decode investors, falling back to manual parsing: {e}")
+        return None
+    return msgspec.to_builtins(investors)
+
+# Characters removed from formatted counts before converting them to int
+NUMBER_FORMATTING = str.maketrans("", "", ", \t$")
+
+def parse_investors(extracted_data, format_type):
+    """Parse extracted investor records and coerce their numeric fields by hand"""
+    # Handle different format types
+    if isinstance(extracted_data, str):
+        logger.debug("Data is in string format, attempting to parse...")
+        if format_type == 'csv':
+            logger.debug("Parsing as CSV...")
+            # Parse CSV string into list of dictionaries
+            csv_file = io.StringIO(extracted_data)
+            csv_reader = csv.DictReader(csv_file)
+            extracted_data = list(csv_reader)
+        else:
+            # Try parsing as JSON
+            logger.debug("Attempting to parse as JSON...")
+            try:
+                extracted_data = json.loads(extracted_data)
+                logger.debug("Successfully parsed JSON")
+            except json.JSONDecodeError as e:
+                logger.warning(f"Failed to parse string data as JSON: {str(e)}")
+                if e.pos < len(extracted_data):
+                    start = max(0, e.pos - 20)
+                    end = min(len(extracted_data), e.pos + 20)
+                    logger.debug(f"Context around error (20 chars before and after): {extracted_data[start:end]}")
+                return []
+
+    # Ensure we have a list of dictionaries
+    if not isinstance(extracted_data, list):
+        logger.warning(f"Expected list of investors, got {type(extracted_data)}")
+        if isinstance(extracted_data, dict):
+            logger.debug(f"Dictionary keys: {list(extracted_data.keys())}")
+        return []
+
+    # Convert any numeric strings to numbers
+    processed_data = []
+    for investor in extracted_data:
+        if not isinstance(investor, dict):
+            logger.warning(f"Expected dict for investor, got {type(investor)}")
+            continue
+
+        processed_investor = {}
+        for key, value in investor.items():
+            if key in ['investments', 'exits']:
+                if isinstance(value, (int, float)):
+                    processed_investor[key] = int(value)
+                    continue
+                # Strip formatting such as "1,234" instead of letting int() raise
+                digits = str(value or "").translate(NUMBER_FORMATTING)
+                if digits.isdecimal():
+                    processed_investor[key] = int(digits)
+                else:
+                    if digits:
+                        logger.debug(f"Failed to convert {key}={value} to int")
+                    processed_investor[key] = 0
+            else:
+                processed_investor[key] = str(value) if value else ""
+        processed_data.append(processed_investor)
+    return processed_data
+
+async def extract_investor_data(sdk, html_bytes):
+    """Extract structured investor data from UTF-8 encoded HTML using the extraction endpoint"""
+    try:
+        if not html_bytes:
+            logger.warning("Empty HTML content received")
             return []
 
+        cache_path = get_cache_path(html_bytes)
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached_data = json.load(f)
+            logger.debug(f"Loaded {len(cached_data)} investors from cache: {cache_path}")
+            return cached_data
+
         # Define the schema for investor data
         schema = {
             "type": "array",
@@ -78,129 +338,82 @@ async def extract_investor_data(sdk, html_content):
             }
         }
 
-        print("Sending HTML to extraction endpoint...")
+        logger.debug("Sending HTML to extraction endpoint...")
         # Extract data using the HTML extraction endpoint
         result = await sdk.extract_html(
-            html=html_content,
+            html=html_bytes,
             query="Extract all investors from the table, including their name, investor type (e.g. Individual/Angel), number of investments, number of exits, and location. Each row in the table represents one investor.",
             output_format="json",
             schema=schema
         )
 
-        print("Received response from extraction endpoint")
-        print(f"Response type: {type(result)}")
+        logger.debug("Received response from extraction endpoint")
+        logger.debug(f"Response type: {type(result)}")
         
         # Parse the response which follows the standard format:
         # { data: any, metadata: { stats: {...}, format: string } }
         try:
             # First get the raw response data
             response_data = result.data if hasattr(result, 'data') else result.json()
-            print(f"Raw response data type: {type(response_data)}")
+            logger.debug(f"Raw response data type: {type(response_data)}")
             
             # Extract the actual data from the response
             if isinstance(response_data, dict):
-                print("Processing response with metadata structure")
-                print(f"Response keys: {list(response_data.keys())}")
+                logger.debug("Processing response with metadata structure")
+                logger.debug(f"Response keys: {list(response_data.keys())}")
                 
                 if 'data' not in response_data:
-                    print("Warning: Response missing 'data' field")
+                    logger.warning("Response missing 'data' field")
                     return []
                     
                 # Get the format from metadata if available
                 format_type = response_data.get('metadata', {}).get('format', 'unknown')
-                print(f"Response format: {format_type}")
+                logger.debug(f"Response format: {format_type}")
                 
                 # Debug metadata if available
                 if 'metadata' in response_data:
-                    print("Metadata:", response_data['metadata'])
+                    logger.debug(f"Metadata: {response_data['metadata']}")
                 
                 extracted_data = response_data['data']
-                print(f"Extracted data type: {type(extracted_data)}")
+                logger.debug(f"Extracted data type: {type(extracted_data)}")
                 if isinstance(extracted_data, str):
-                    print(f"First 500 chars of extracted data: {extracted_data[:500]}")
+                    logger.debug(f"First 500 chars of extracted data: {extracted_data[:500]}")
             else:
-                print(f"Warning: Unexpected response format. Got type: {type(response_data)}")
-                print(f"First 500 chars of response: {str(response_data)[:500]}")
+                logger.warning(f"Unexpected response format. Got type: {type(response_data)}")
+                logger.debug(f"First 500 chars of response: {str(response_data)[:500]}")
                 return []
 
-            # Handle different format types
-            if isinstance(extracted_data, str):
-                print("Data is in string format, attempting to parse...")
-                if format_type == 'csv':
-                    print("Parsing as CSV...")
-                    # Parse CSV string into list of dictionaries
-                    import io
-                    csv_file = io.StringIO(extracted_data)
-                    csv_reader = csv.DictReader(csv_file)
-                    extracted_data = list(csv_reader)
-                else:
-                    # Try parsing as JSON
-                    print("Attempting to parse as JSON...")
-                    import json
-                    try:
-                        extracted_data = json.loads(extracted_data)
-                        print("Successfully parsed JSON")
-                    except json.JSONDecodeError as e:
-                        print(f"Failed to parse string data as JSON: {str(e)}")
-                        print("JSON parse error location:", e.pos)
-                        print("JSON error line:", e.lineno)
-                        print("JSON error column:", e.colno)
-                        if e.pos < len(extracted_data):
-                            print(f"Context around error (20 chars before and after):")
-                            start = max(0, e.pos - 20)
-                            end = min(len(extracted_data), e.pos + 20)
-                            print(extracted_data[start:end])
-                        return []
-
-            # Ensure we have a list of dictionaries
-            if not isinstance(extracted_data, list):
-                print(f"Warning: Expected list of investors, got {type(extracted_data)}")
-                if isinstance(extracted_data, dict):
-                    print(f"Dictionary keys: {list(extracted_data.keys())}")
-                return []
+            # msgspec parses and coerces the records in one pass when available;
+            # fall back to manual parsing if it is missing or the records don't fit
+            processed_data = None
+            if msgspec is not None and format_type != 'csv':
+                processed_data = decode_investors(extracted_data)
+            if processed_data is None:
+                processed_data = parse_investors(extracted_data, format_type)
 
-            # Convert any numeric strings to numbers
-            processed_data = []
-            for investor in extracted_data:
-                if not isinstance(investor, dict):
-                    print(f"Warning: Expected dict for investor, got {type(investor)}")
-                    continue
-                    
-                processed_investor = {}
-                for key, value in investor.items():
-                    print(f"Processing field {key}: {value} (type: {type(value)})")
-                    if key in ['investments', 'exits']:
-                        try:
-                            processed_investor[key] = int(value) if value else 0
-                        except (ValueError, TypeError):
-                            print(f"Failed to convert {key}={value} to int")
-                            processed_investor[key] = 0
-                    else:
-                        processed_investor[key] = str(value) if value else ""
-                processed_data.append(processed_investor)
-
-            print(f"Successfully extracted {len(processed_data)} investors")
+            logger.debug(f"Successfully extracted {len(processed_data)} investors")
             if processed_data:
-                print("Sample of first investor:", processed_data[0])
+                logger.debug(f"Sample of first investor: {processed_data[0]}")
+
+                # Only cache non-empty results so a bad response is retried next time
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                with open(cache_path, 'w', encoding='utf-8') as f:
+                    json.dump(processed_data, f)
             return processed_data
 
         except Exception as e:
-            print(f"Error processing response: {str(e)}")
-            print("Full error details:")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error processing response: {str(e)}")
             return []
 
     except Exception as e:
-        print(f"Error in extract_investor_data: {str(e)}")
-        print("Full error details:")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error in extract_investor_data: {str(e)}")
         return []
 
 async def merge_csv_files(run_dir: str, csv_headers: List[str]) -> str:
     """
     Merge all CSV files in the run directory into a single file.
+    main() writes merged_investors.csv directly, so this is only needed for
+    directories of per-page CSVs from older runs.
     Returns the path to the merged file.
     """
     # Create merged CSV filename
@@ -210,21 +423,174 @@ async def merge_csv_files(run_dir: str, csv_headers: List[str]) -> str:
     with open(merged_csv, 'w', newline='', encoding='utf-8') as outfile:
         writer = csv.DictWriter(outfile, fieldnames=csv_headers)
         writer.writeheader()
-        
-        # Find all CSV files in the directory
-        csv_files = [f for f in os.listdir(run_dir) if f.endswith('.csv') and f != 'merged_investors.csv']
-        
-        # Read each CSV file and append to merged file
-        for csv_file in csv_files:
-            file_path = os.path.join(run_dir, csv_file)
-            with open(file_path, 'r', newline='', encoding='utf-8') as infile:
-                reader = csv.DictReader(infile)
-                for row in reader:
-                    writer.writerow(row)
+    
+    # Find all CSV files in the directory
+    with os.scandir(run_dir) as entries:
+        csv_files = [e for e in entries if e.name.endswith('.csv') and e.name != 'merged_investors.csv']
+    
+    # Every page CSV shares the same header, so copy the raw bytes after it
+    # instead of parsing and re-serializing each row
+    with open(merged_csv, 'ab') as outfile:
+        for entry in csv_files:
+            with open(entry.path, 'rb') as infile:
+                next(infile, None)
+                shutil.copyfileobj(infile, outfile, length=1 << 20)
     
     print(f"\nMerged {len(csv_files)} CSV files into: {merged_csv}")
     return merged_csv
 
+def next_retry_delay(attempts, page_number):
+    """
+    Record a failed attempt at a page and return how long to back off.
+    Returns None once the page has used up MAX_PAGE_ATTEMPTS.
+    """
+    attempts[page_number] = attempts.get(page_number, 0) + 1
+    if attempts[page_number] > MAX_PAGE_ATTEMPTS:
+        return None
+    return min(MAX_RETRY_DELAY, 2 ** attempts[page_number])
+
+def write_page_html(path, html_bytes):
+    """Save a page's HTML, zstd-compressing .zst paths; meant to be run off the event loop"""
+    if path.endswith(".zst"):
+        html_bytes = zstandard.ZstdCompressor(level=3, threads=-1).compress(html_bytes)
+    with open(path, 'wb') as f:
+        f.write(html_bytes)
+
+def read_page_html(path):
+    """Read a page's HTML saved by write_page_html, decompressing .zst files"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if path.endswith(".zst"):
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return data.decode('utf-8')
+
+async def extraction_worker(sdk, queue, merged_file, writer):
+    """
+    Consumer: extract investors from queued pages and append them to the merged CSV.
+    Runs until it receives a None sentinel.
+    """
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        page_number, html_bytes = item
+        
+        print(f"Extracting investor data from page {page_number}...")
+        investors = await extract_investor_data(sdk, html_bytes)
+
+        # Append to the merged CSV, flushing so finished pages survive a crash
+        if investors:
+            # Rows are written as tuples in csv_headers order
+            writer.writerows((
+                investor.get("name", ""),
+                investor.get("type", ""),
+                investor.get("investments", ""),
+                investor.get("exits", ""),
+                investor.get("location", "")
+            ) for investor in investors)
+            merged_file.flush()
+            print(f"Saved {len(investors)} investors from page {page_number}")
+        else:
+            print(f"No investors found on page {page_number}")
+
+async def crawl_pages(sdk, browser_name, run_dir, queue, write_tasks):
+    """
+    Producer: page through the results, saving each page's HTML and queueing it
+    for extraction. This stays serial because every step drives the same browser window.
+    
+    Returns:
+        The number of pages crawled
+    """
+    page_number = 1
+    total_pages = 20  # Cap at 1,000 results (50 investors per page * 20 pages)
+    
+    attempts = {}
+    # Signature of each page when it was queued; a retried page is never queued
+    # twice, so its rows are only appended to the merged CSV once
+    queued_signatures = {}
+    while page_number <= total_pages:
+        try:
+            if page_number in queued_signatures:
+                # Only navigating away from this page failed. If the Next click went
+                # through anyway, the browser is already on the next page
+                signature = queued_signatures[page_number]
+                current_signature = await run_browser_javascript(browser_name, PAGE_SIGNATURE_JS)
+                if signature is not None and current_signature is not None and current_signature != signature:
+                    page_number += 1
+                    continue
+            else:
+                # Verify we're on a page with table data
+                print(f"\nVerifying page {page_number} loaded correctly...")
+                see_result = await sdk.see(
+                    description="Crunchbase table with company data",
+                    wait=True,
+                    timeout=10.0,
+                    interval=0.5
+                )
+                
+                if not see_result.get('matches', False):
+                    print(f"Failed to find table on page {page_number}. Stopping.")
+                    break
+                
+                # Extract HTML from current page
+                html_content = await extract_current_page_html(sdk, page_number, browser_name)
+                if not html_content:
+                    delay = next_retry_delay(attempts, page_number)
+                    if delay is None:
+                        print(f"Failed to extract HTML from page {page_number} after {MAX_PAGE_ATTEMPTS} attempts. Stopping.")
+                        break
+                    print(f"Failed to extract HTML from page {page_number}. Retrying in {delay} seconds...")
+                    await asyncio.sleep(delay)
+                    continue
+                
+                # Save raw HTML to file
+                html_filename = os.path.join(run_dir, f"crunchbase_page_{page_number:04d}{HTML_EXTENSION}")
+                print(f"Saving HTML to {html_filename}")
+                # Encode once; the same bytes are written to disk and sent for extraction
+                html_bytes = html_content.encode('utf-8')
+                del html_content
+                # The write runs in a thread and overlaps with navigating to the next page
+                write_tasks.append(asyncio.create_task(
+                    asyncio.to_thread(write_page_html, html_filename, html_bytes)
+                ))
+                
+                # Hand the page to the extraction workers; blocks while the queue is full
+                signature = await run_browser_javascript(browser_name, PAGE_SIGNATURE_JS)
+                queued_signatures[page_number] = signature
+                await queue.put((page_number, html_bytes))
+            
+            # Click Next button if not on last page
+            if page_number < total_pages:
+                print("Clicking Next button...")
+                next_result = await sdk.execute_action(
+                    "Click the Next link",
+                    detection_sensitivity=0.3
+                )
+                
+                if not next_result.chosen_action:
+                    print("Could not find Next button. Stopping.")
+                    break
+                
+                # Wait for next page to load
+                await wait_for_page_change(browser_name, signature)
+            
+            page_number += 1
+        
+        except KeyboardInterrupt:
+            print("\nScript interrupted by user. Saving progress...")
+            break
+        except Exception as e:
+            print(f"Error processing page {page_number}: {str(e)}")
+            delay = next_retry_delay(attempts, page_number)
+            if delay is None:
+                print(f"Giving up on page {page_number} after {MAX_PAGE_ATTEMPTS} attempts. Stopping.")
+                break
+            print(f"Waiting {delay} seconds before retrying...")
+            await asyncio.sleep(delay)
+            continue
+
+    return page_number - 1
+
 async def main():
     """
     Main function that extracts and processes Crunchbase investor data.
@@ -247,6 +613,9 @@ async def main():
         model="ui-detect"
     )
     
+    # Background HTML writes, awaited before exiting so no page is lost
+    write_tasks = []
+
     try:
         # Create data directory if it doesn't exist
         data_dir = "crunchbase_data"
@@ -257,14 +626,10 @@ async def main():
         run_dir = os.path.join(data_dir, timestamp)
         os.makedirs(run_dir, exist_ok=True)
 
-        # Create CSV file for investor data
-        csv_file = os.path.join(run_dir, "investors.csv")
+        # Every page's investors are written straight into a single CSV file
+        merged_csv = os.path.join(run_dir, "merged_investors.csv")
         csv_headers = ["Name", "Type", "Investments", "Exits", "Location"]
         
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=csv_headers)
-            writer.writeheader()
-        
         # Define the browser to use - can be configured via environment variable
         browser_name = os.environ.get("BROWSER", "Safari")
         print(f"Using browser: {browser_name}")
@@ -281,110 +646,58 @@ async def main():
 
         # Navigate to Crunchbase URL
         print(f"Navigating to Crunchbase URL: {url}")
-        await sdk.execute_action(f"Type '{url}' into the url bar", detection_sensitivity=0.5)
-        await sdk.press_key("enter")
+        signature = await run_browser_javascript(browser_name, PAGE_SIGNATURE_JS)
+        if not await navigate_browser(browser_name, url):
+            # Fall back to typing the URL when the browser can't be scripted
+            await sdk.execute_action(f"Type '{url}' into the url bar", detection_sensitivity=0.5)
+            await sdk.press_key("enter")
 
         # Wait for initial page to load
         print("Waiting for Crunchbase page to load...")
-        await asyncio.sleep(5)
+        await wait_for_page_change(browser_name, signature)
 
-        page_number = 1
-        total_pages = 20  # Cap at 1,000 results (50 investors per page * 20 pages)
-        
-        while page_number <= total_pages:
+        # Navigation produces pages while the workers extract earlier ones; the
+        # small queue bounds how many pages of HTML are held in memory
+        queue = asyncio.Queue(maxsize=2)
+        with open(merged_csv, 'w', newline='', encoding='utf-8') as merged_file:
+            writer = csv.writer(merged_file)
+            writer.writerow(csv_headers)
+            workers = [
+                asyncio.create_task(extraction_worker(sdk, queue, merged_file, writer))
+                for _ in range(MAX_CONCURRENT_EXTRACTIONS)
+            ]
             try:
-                # Verify we're on a page with table data
-                print(f"\nVerifying page {page_number} loaded correctly...")
-                see_result = await sdk.see(
-                    description="Crunchbase table with company data",
-                    wait=True,
-                    timeout=10.0,
-                    interval=0.5
-                )
-                
-                if not see_result.get('matches', False):
-                    print(f"Failed to find table on page {page_number}. Stopping.")
-                    break
-
-                # Extract HTML from current page
-                html_content = await extract_current_page_html(sdk, page_number)
-                if not html_content:
-                    print(f"Failed to extract HTML from page {page_number}. Retrying...")
-                    continue
-
-                # Save raw HTML to file
-                html_filename = os.path.join(run_dir, f"crunchbase_page_{page_number:04d}.html")
-                print(f"Saving HTML to {html_filename}")
-                with open(html_filename, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-
-                # Extract structured investor data
-                print(f"Extracting investor data from page {page_number}...")
-                investors = await extract_investor_data(sdk, html_content)
-
-                # Save to CSV
-                if investors:
-                    csv_filename = os.path.join(run_dir, f"investors_page_{page_number:04d}.csv")
-                    with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
-                        writer = csv.DictWriter(f, fieldnames=csv_headers)
-                        writer.writeheader()
-                        for investor in investors:
-                            writer.writerow({
-                                "Name": investor.get("name", ""),
-                                "Type": investor.get("type", ""),
-                                "Investments": investor.get("investments", ""),
-                                "Exits": investor.get("exits", ""),
-                                "Location": investor.get("location", "")
-                            })
-                    print(f"Saved {len(investors)} investors from page {page_number} to {csv_filename}")
-                else:
-                    print(f"No investors found on page {page_number}")
-
-                # Click Next button if not on last page
-                if page_number < total_pages:
-                    print("Clicking Next button...")
-                    next_result = await sdk.execute_action(
-                        "Click the Next link",
-                        detection_sensitivity=0.3
-                    )
-                    
-                    if not next_result.chosen_action:
-                        print("Could not find Next button. Stopping.")
-                        break
-                    
-                    # Wait for next page to load
-                    await asyncio.sleep(5)
-                
-                page_number += 1
-
-            except KeyboardInterrupt:
-                print("\nScript interrupted by user. Saving progress...")
-                break
-            except Exception as e:
-                print(f"Error processing page {page_number}: {str(e)}")
-                print("Waiting 10 seconds before retrying...")
-                await asyncio.sleep(10)
-                continue
+                pages_crawled = await crawl_pages(sdk, browser_name, run_dir, queue, write_tasks)
+            finally:
+                # One sentinel per worker; each finishes its queued pages first
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
 
         print("\nData extraction completed! 🎉")
-        print(f"Processed {page_number - 1} pages")
+        print(f"Processed {pages_crawled} pages")
         print(f"Data saved in: {run_dir}")
-        
-        # Merge all CSV files
-        merged_csv = await merge_csv_files(run_dir, csv_headers)
         print(f"Final merged CSV file: {merged_csv}")
         
     except KeyboardInterrupt:
         print("\nScript interrupted by user")
     except Exception as e:
         print(f"Error: {e}")
-        import traceback
         traceback.print_exc()
     finally:
         print("Cleaning up...")
-        # Add any cleanup code here if needed
+        if write_tasks:
+            results = await asyncio.gather(*write_tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Failed to save page HTML: {result}")
+        await sdk.close()
 
 if __name__ == "__main__":
+    # uvloop is optional; fall back to the default asyncio event loop without it
+    if uvloop is not None:
+        uvloop.install()
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
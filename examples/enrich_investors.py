@@ -11,11 +11,14 @@ This script:
 """
 
 import os
+import re
+import csv
 import json
 import asyncio
+import hashlib
 import logging
+import aiohttp
 import pandas as pd
-import requests
 import pyautogui
 import pyperclip
 from typing import Dict, List, Any, Optional
@@ -25,10 +28,260 @@ from vertexai.preview.generative_models import GenerativeModel, Part
 from google.cloud import aiplatform
 import dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("InvestorEnrichment")
 
+# Maximum number of LinkedIn profile lookups (SERP + Gemini) in flight at once
+MAX_CONCURRENT_LOOKUPS = 10
+
+# Fixed part of the Gemini prompt used to pick the right profile from the search results
+URL_SELECTION_INSTRUCTIONS = """Analyze the LinkedIn profile URLs found for an investor and select the most likely correct profile.
+Consider the title and snippet information provided with each URL.
+Return ONLY the URL of the most likely correct profile, or "none" if none are likely correct."""
+
+# Number of input rows read from the investor CSV at a time
+CSV_CHUNK_SIZE = 500
+
+# Input columns are read as strings; pyarrow-backed strings are far smaller than
+# object columns, and the pyarrow parser is used for reads that are not chunked
+CSV_STRING_DTYPE = 'string[pyarrow]' if PARQUET_AVAILABLE else 'string'
+CSV_ENGINE = 'pyarrow' if PARQUET_AVAILABLE else 'c'
+
+# Columns added to each investor row by the enrichment
+ENRICHED_COLUMNS = [
+    'current_company',
+    'current_role',
+    'previous_companies',
+    'previous_roles',
+    'education',
+    'skills',
+    'profile_url',
+    'connection_degree',
+    'location',
+    'bio',
+    'mutual_connections'
+]
+
+# LinkedIn profile links, with optional country subdomain; group 2 is the profile slug
+_LINKEDIN_RE = re.compile(r'^https?://([a-z]{2,3}\.)?linkedin\.com/in/([^/?#]+)', re.IGNORECASE)
+
+def canonical_profile_url(link: str) -> Optional[str]:
+    """
+    Return the canonical form of a LinkedIn profile URL, or None if it is not one
+    
+    Country subdomains, tracking parameters and trailing paths are dropped so the
+    same profile always maps to the same URL (and the same cache entries).
+    """
+    match = _LINKEDIN_RE.match(link)
+    if not match:
+        return None
+    return f"https://www.linkedin.com/in/{match.group(2).lower()}"
+
+def normalize_name(name: str) -> str:
+    """Normalize an investor name so duplicate spellings map to the same key"""
+    return " ".join(name.split()).lower()
+
+def to_csv_value(value: Any) -> Any:
+    """Convert an extracted value to a CSV cell, encoding lists and dicts as JSON"""
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+# Markup that carries nothing the profile extraction needs
+STRIPPED_TAGS = "script, style, svg, noscript, link, meta"
+_STRIPPED_BLOCK_RE = re.compile(r'<(script|style|svg|noscript)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_STRIPPED_TAG_RE = re.compile(r'<(?:link|meta)\b[^>]*>', re.IGNORECASE)
+
+def trim_html(html: str) -> str:
+    """
+    Remove scripts, styles, inline SVG and other non-content markup from HTML
+    
+    Uses selectolax when it is installed and falls back to regular expressions.
+    """
+    if SELECTOLAX_AVAILABLE:
+        tree = HTMLParser(html)
+        for node in tree.css(STRIPPED_TAGS):
+            node.decompose()
+        return tree.html
+    html = _STRIPPED_BLOCK_RE.sub('', html)
+    return _STRIPPED_TAG_RE.sub('', html)
+
+async def wait_for_clipboard_change(previous: str,
+                                    timeout: float = 5.0,
+                                    interval: float = 0.1,
+                                    min_length: int = 10_000) -> Optional[str]:
+    """
+    Poll the clipboard until it holds new content of a plausible HTML size
+    
+    Args:
+        previous: Clipboard content to wait to be replaced
+        timeout: Maximum time to wait in seconds
+        interval: Time between checks in seconds
+        min_length: Minimum length of the new content
+        
+    Returns:
+        The new clipboard content, or None if the timeout expired first
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        content = pyperclip.paste()
+        if content != previous and len(content) >= min_length:
+            return content
+        if loop.time() >= deadline:
+            return None
+        await asyncio.sleep(interval)
+
+class CSVRecordWriter:
+    """
+    Appends enriched investor rows to a CSV file.
+    
+    Every row is flushed and fsynced as soon as it is written, so the file is
+    a checkpoint that survives a crash at any point in the run.
+    """
+    
+    def __init__(self, path: str, fieldnames: List[str]):
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore')
+        if write_header:
+            self._writer.writeheader()
+    
+    @staticmethod
+    def processed_names(path: str) -> set:
+        """Return the investor names already written to the output"""
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return set()
+        existing = pd.read_csv(path, usecols=['Name'], dtype={'Name': CSV_STRING_DTYPE}, engine=CSV_ENGINE)
+        return set(existing['Name'].dropna())
+    
+    def writerow(self, record: Dict[str, Any]) -> None:
+        self._writer.writerow({key: to_csv_value(value) for key, value in record.items()})
+        self.flush()
+    
+    def flush(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def close(self) -> None:
+        self._file.close()
+
+class ParquetRecordWriter:
+    """
+    Appends enriched investor rows to a Parquet dataset directory.
+    
+    List fields keep their native types instead of being stringified. Rows
+    are buffered and each flush() writes them as one part file, through a
+    temporary file so a crash never leaves a part without its footer.
+    """
+    
+    def __init__(self, path: str, input_columns: List[str]):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        
+        # Input columns are kept as the strings read from the CSV
+        categorical = pa.dictionary(pa.int32(), pa.string())
+        self.list_fields = {'previous_companies', 'previous_roles', 'education', 'skills'}
+        enriched_fields = [
+            pa.field('current_company', pa.string()),
+            pa.field('current_role', pa.string()),
+            pa.field('previous_companies', pa.list_(pa.string())),
+            pa.field('previous_roles', pa.list_(pa.string())),
+            pa.field('education', pa.list_(pa.string())),
+            pa.field('skills', pa.list_(pa.string())),
+            pa.field('profile_url', pa.string()),
+            pa.field('connection_degree', categorical),
+            pa.field('location', categorical),
+            pa.field('bio', pa.string()),
+            pa.field('mutual_connections', pa.list_(pa.struct([
+                pa.field('name', pa.string()),
+                pa.field('title', pa.string()),
+                pa.field('company', pa.string())
+            ])))
+        ]
+        # An input column with the same name as an enriched one is replaced by it
+        enriched_names = {field.name for field in enriched_fields}
+        input_fields = [pa.field(name, pa.string()) for name in input_columns if name not in enriched_names]
+        self.schema = pa.schema(input_fields + enriched_fields)
+        self._rows = []
+        self._part = 0
+        self._run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # Remove parts a crashed run did not finish; their rows are not in the
+        # finished parts, so those investors are enriched again
+        for name in os.listdir(path):
+            if name.startswith('.') and name.endswith('.tmp'):
+                os.remove(os.path.join(path, name))
+    
+    @staticmethod
+    def processed_names(path: str) -> set:
+        """Return the investor names already written to the output"""
+        if not os.path.isdir(path) or not any(name.endswith('.parquet') for name in os.listdir(path)):
+            return set()
+        existing = pd.read_parquet(path, columns=['Name'])
+        return set(existing['Name'].dropna())
+    
+    def _coerce(self, name: str, value: Any) -> Any:
+        """Coerce an extracted value to the column's type"""
+        if value is None:
+            return None
+        if name in self.list_fields:
+            items = value if isinstance(value, list) else [value]
+            return [str(item) for item in items if item is not None]
+        if name == 'mutual_connections':
+            if not isinstance(value, list):
+                return None
+            return [
+                {key: (None if item.get(key) is None else str(item[key])) for key in ('name', 'title', 'company')}
+                for item in value if isinstance(item, dict)
+            ]
+        if isinstance(value, list):
+            return ", ".join(str(item) for item in value)
+        return str(value)
+    
+    def writerow(self, record: Dict[str, Any]) -> None:
+        self._rows.append({name: self._coerce(name, record.get(name)) for name in self.schema.names})
+    
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        self._part += 1
+        part_name = f"part-{self._run_id}-{self._part:04d}.parquet"
+        # Dot-prefixed files are ignored when the dataset is read
+        temp_path = os.path.join(self.path, f".{part_name}.tmp")
+        pq.write_table(pa.Table.from_pylist(self._rows, schema=self.schema), temp_path, compression='zstd')
+        os.replace(temp_path, os.path.join(self.path, part_name))
+        self._rows = []
+    
+    def close(self) -> None:
+        self.flush()
+
 class InvestorEnricher:
     def __init__(self, 
                  output_folder: str = "enriched_investors",
@@ -36,7 +289,10 @@ class InvestorEnricher:
                  serp_api_key: Optional[str] = None,
                  serp_engine_id: Optional[str] = None,
                  project_id: Optional[str] = None,
-                 location: str = "us-central1"):
+                 location: str = "us-central1",
+                 cache_dir: str = "cache",
+                 linkedin_cookie: Optional[str] = None,
+                 ui_fallback: bool = True):
         """
         Initialize the InvestorEnricher
         
@@ -47,6 +303,9 @@ class InvestorEnricher:
             serp_engine_id: Engine ID for Google Custom Search API
             project_id: Google Cloud project ID
             location: Google Cloud location
+            cache_dir: Folder for cached SERP and Gemini responses, kept between runs
+            linkedin_cookie: LinkedIn li_at session cookie used to fetch profiles over HTTP
+            ui_fallback: Whether to read profiles through Safari when the HTTP fetch fails
         """
         self.output_folder = output_folder
         self.coffeeblack_api_key = coffeeblack_api_key or os.environ.get("COFFEEBLACK_API_KEY")
@@ -54,6 +313,11 @@ class InvestorEnricher:
         self.serp_engine_id = serp_engine_id or os.environ.get("SERP_ENGINE_ID")
         self.project_id = project_id or os.environ.get("GOOGLE_CLOUD_PROJECT")
         self.location = location
+        self.cache_dir = cache_dir
+        self.linkedin_cookie = linkedin_cookie or os.environ.get("LINKEDIN_LI_AT")
+        self.ui_fallback = ui_fallback
+        self._browser_open = False  # Safari is opened on first use and kept open
+        self._session = None  # Will be initialized in get_session()
         
         # Create output folder
         os.makedirs(self.output_folder, exist_ok=True)
@@ -85,6 +349,73 @@ class InvestorEnricher:
         
         logger.info(f"InvestorEnricher initialized with output folder: {output_folder}")
     
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Get or create the pooled HTTP session used for search requests"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=10),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the HTTP session and the SDK's sessions"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        if self.sdk:
+            await self.sdk.close()
+    
+    def _cache_path(self, namespace: str, key_data: Any) -> str:
+        """Return the cache file path for a JSON-serializable cache key"""
+        key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+        return os.path.join(self.cache_dir, namespace, f"{key}.json")
+    
+    def _cache_get(self, namespace: str, key_data: Any) -> Optional[Any]:
+        """Load a cached response, or return None on a cache miss"""
+        path = self._cache_path(namespace, key_data)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _cache_set(self, namespace: str, key_data: Any, value: Any) -> None:
+        """Store a response in the cache"""
+        path = self._cache_path(namespace, key_data)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(value, f)
+    
+    async def extract_html_cached(self, html: str, query: str, schema: Dict[str, Any]) -> Optional[Any]:
+        """
+        Run the HTML extraction endpoint, reusing the stored result for identical input
+        
+        Args:
+            html: HTML content to extract data from
+            query: Extraction query
+            schema: Schema for the extracted data
+            
+        Returns:
+            The response data, or None if the endpoint returned nothing
+        """
+        cache_key = {
+            "html": hashlib.sha256(html.encode()).hexdigest(),
+            "query": query,
+            "schema": schema
+        }
+        data = self._cache_get("extract", cache_key)
+        if data is None:
+            result = await self.sdk.extract_html(
+                html=html,
+                query=query,
+                output_format="json",
+                schema=schema
+            )
+            if not result or not hasattr(result, 'data'):
+                return None
+            data = result.data
+            self._cache_set("extract", cache_key, data)
+        return data
+    
     async def find_linkedin_profile(self, investor_name: str) -> Optional[str]:
         """
         Find LinkedIn profile URL using Google Custom Search API and Gemini
@@ -105,59 +436,85 @@ class InvestorEnricher:
                 'key': self.serp_api_key,
                 'cx': self.serp_engine_id,
                 'q': f"{investor_name} linkedin profile",
-                'num': 5,
+                'num': 3,
                 'siteSearch': 'linkedin.com',
                 'siteSearchFilter': 'i'
             }
             
-            # Make the request
-            response = await asyncio.to_thread(
-                requests.get,
-                "https://www.googleapis.com/customsearch/v1", 
-                params=params
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"SERP API error: {response.status_code}")
-                return None
-            
-            data = response.json()
+            # Reuse earlier search results for the same query; the key is left
+            # out of the cache key so rotating it doesn't invalidate the cache
+            serp_cache_key = {k: v for k, v in params.items() if k != 'key'}
+            data = self._cache_get("serp", serp_cache_key)
+            if data is None:
+                # Make the request
+                session = await self.get_session()
+                async with session.get("https://www.googleapis.com/customsearch/v1", params=params) as response:
+                    if response.status != 200:
+                        logger.error(f"SERP API error: {response.status}")
+                        return None
+                    
+                    if orjson is not None:
+                        data = orjson.loads(await response.read())
+                    else:
+                        data = await response.json()
+                self._cache_set("serp", serp_cache_key, data)
             
             # Collect all potential LinkedIn profile URLs
             profile_urls = []
             if "items" in data:
                 for item in data["items"]:
-                    link = item.get("link", "")
-                    if "linkedin.com/in/" in link:
+                    url = canonical_profile_url(item.get("link", ""))
+                    if url and all(candidate["url"] != url for candidate in profile_urls):
                         profile_urls.append({
-                            "url": link,
+                            "url": url,
                             "title": item.get("title", ""),
                             "snippet": item.get("snippet", "")
                         })
             
             if not profile_urls:
                 return None
+            
+            # Skip Gemini when one result's title clearly matches the name and
+            # no other result comes close
+            if fuzz is not None:
+                ranked = sorted(
+                    ((fuzz.token_set_ratio(investor_name, candidate["title"].split(" - ")[0]), candidate)
+                     for candidate in profile_urls),
+                    key=lambda pair: pair[0],
+                    reverse=True
+                )
+                best_score, best_candidate = ranked[0]
+                runner_up_score = ranked[1][0] if len(ranked) > 1 else 0
+                if best_score >= 90 and runner_up_score <= 70:
+                    return best_candidate["url"]
                 
             # Use Gemini to analyze and select the best profile URL
             if self.model:
-                prompt = f"""
-                Analyze these LinkedIn profile URLs for {investor_name} and select the most likely correct profile.
-                Consider the title and snippet information provided.
-                
-                Profile options:
-                {json.dumps(profile_urls, indent=2)}
-                
-                Return ONLY the URL of the most likely correct profile, or "none" if none are likely correct.
-                """
+                if orjson is not None:
+                    options_json = orjson.dumps(profile_urls, option=orjson.OPT_INDENT_2).decode()
+                else:
+                    options_json = json.dumps(profile_urls, indent=2)
                 
-                response = await asyncio.to_thread(
-                    self.model.generate_content,
-                    prompt
+                # The fixed instructions come first so every request shares the same prefix
+                prompt = (
+                    f"{URL_SELECTION_INSTRUCTIONS}\n\n"
+                    f"Investor: {investor_name}\n\n"
+                    f"Profile options:\n{options_json}"
                 )
                 
-                selected_url = response.text.strip().strip('"')
+                # Identical prompts give the same answer, so reuse earlier selections
+                response_text = self._cache_get("gemini", prompt)
+                if response_text is None:
+                    response = await asyncio.to_thread(
+                        self.model.generate_content,
+                        prompt
+                    )
+                    response_text = response.text
+                    self._cache_set("gemini", prompt, response_text)
+                
+                selected_url = response_text.strip().strip('"')
                 if selected_url.lower() != "none":
-                    return selected_url
+                    return canonical_profile_url(selected_url) or selected_url
             
             # Fallback to first URL if Gemini analysis fails
             return profile_urls[0]["url"]
@@ -166,6 +523,71 @@ class InvestorEnricher:
             logger.error(f"Error finding LinkedIn profile: {str(e)}")
             return None
     
+    async def fetch_profile_html(self, profile_url: str) -> Optional[str]:
+        """
+        Fetch a LinkedIn profile's HTML directly over HTTP
+        
+        Uses the li_at session cookie, so it is skipped when no cookie is set.
+        
+        Args:
+            profile_url: LinkedIn profile URL
+            
+        Returns:
+            The profile HTML, or None if it could not be fetched
+        """
+        if not self.linkedin_cookie:
+            return None
+        
+        html_content = self._cache_get("profiles", profile_url)
+        if html_content is not None:
+            return html_content
+        
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15',
+            'Accept': 'text/html,application/xhtml+xml'
+        }
+        try:
+            session = await self.get_session()
+            async with session.get(profile_url, headers=headers, cookies={'li_at': self.linkedin_cookie}) as response:
+                # LinkedIn answers 999 when it blocks automated requests
+                if response.status != 200:
+                    logger.warning(f"Profile fetch returned status {response.status} for {profile_url}")
+                    return None
+                html_content = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Profile fetch failed for {profile_url}: {str(e)}")
+            return None
+        
+        self._cache_set("profiles", profile_url, html_content)
+        return html_content
+    
+    async def open_profile_in_browser(self, profile_url: str) -> None:
+        """Navigate Safari to a LinkedIn profile, opening it on first use"""
+        if not self._browser_open:
+            logger.info("Opening Safari...")
+            await self.sdk.open_and_attach_to_app("Safari", wait_time=2.0)
+            self._browser_open = True
+        
+        # Navigate to the profile: Cmd+L focuses and selects the url bar, so
+        # pasting replaces whatever URL was there
+        logger.info(f"Navigating to profile: {profile_url}")
+        await self.sdk.press_key('l', modifiers=['command'])
+        pyperclip.copy(profile_url)
+        await self.sdk.press_key('v', modifiers=['command'])
+        await self.sdk.press_key("enter")
+        
+        # Wait for page to load
+        await asyncio.sleep(5)
+    
+    async def close_browser(self) -> None:
+        """Quit Safari if it was opened"""
+        if self._browser_open:
+            # Close Safari with Cmd+Q
+            logger.info("Closing Safari...")
+            pyautogui.hotkey('command', 'q')
+            await asyncio.sleep(2)  # Wait for Safari to close
+            self._browser_open = False
+    
     async def extract_profile_html(self, profile_url: str) -> Optional[str]:
         """Helper function to extract HTML from LinkedIn profile"""
         try:
@@ -180,18 +602,17 @@ class InvestorEnricher:
             # Paste and execute the JavaScript
             print("Getting profile HTML...")
             pyperclip.copy(js_get_html)
-            await asyncio.sleep(1)  # Added delay before typing
             pyautogui.hotkey('command', 'v')
             await asyncio.sleep(1)  # Added delay before pressing enter
             pyautogui.press('enter')
-            await asyncio.sleep(3)  # Increased delay to ensure HTML is copied
 
-            # Get the HTML from clipboard
-            html_content = pyperclip.paste()
+            # Wait for the console to replace the snippet with the page HTML
+            html_content = await wait_for_clipboard_change(js_get_html)
+            if html_content is None:
+                print("Timed out waiting for the profile HTML to reach the clipboard")
             
             # Close the console
             print("Closing developer console...")
-            await asyncio.sleep(1)  # Added delay before closing console
             pyautogui.hotkey('option', 'command', 'i')
             await asyncio.sleep(2)  # Increased delay after closing console
             
@@ -204,12 +625,13 @@ class InvestorEnricher:
             traceback.print_exc()
             return None
     
-    async def analyze_profile(self, investor_name: str) -> Dict[str, Any]:
+    async def analyze_profile(self, investor_name: str, profile_url: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze an investor's profile using CoffeeBlack SDK
         
         Args:
             investor_name: Name of the investor to analyze
+            profile_url: LinkedIn profile URL if already known; looked up when omitted
             
         Returns:
             Dictionary containing extracted profile information
@@ -221,188 +643,280 @@ class InvestorEnricher:
                 return {"error": "Missing CoffeeBlack SDK"}
             
             # First find the LinkedIn profile URL
-            profile_url = await self.find_linkedin_profile(investor_name)
+            if not profile_url:
+                profile_url = await self.find_linkedin_profile(investor_name)
             if not profile_url:
                 return {"error": "Could not find LinkedIn profile URL"}
             
-            # Open and attach to Safari
-            logger.info("Opening Safari...")
-            await self.sdk.open_and_attach_to_app("Safari", wait_time=2.0)
+            # Safari is only sent to the profile when it has to be read through the UI
+            on_profile_page = False
             
-            try:
-                # Navigate to the profile
-                logger.info(f"Navigating to profile: {profile_url}")
-                await self.sdk.execute_action(
-                    f"Type '{profile_url}' into the url bar",
-                    detection_sensitivity=0.5
-                )
-                await self.sdk.press_key("enter")
-                
-                # Wait for page to load
-                await asyncio.sleep(5)
+            # Fetch the profile directly, falling back to Safari if that fails
+            html_content = await self.fetch_profile_html(profile_url)
+            if html_content is None and self.ui_fallback:
+                await self.open_profile_in_browser(profile_url)
+                on_profile_page = True
                 
                 # Extract HTML content using developer console
                 html_content = await self.extract_profile_html(profile_url)
-                if not html_content:
-                    return {"error": "Could not extract profile HTML"}
-                
-                # Save raw HTML to file
-                html_filename = os.path.join(self.output_folder, f"{investor_name.lower().replace(' ', '_')}_profile.html")
-                with open(html_filename, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                
-                # Define schema for profile data
-                schema = {
-                    "type": "object",
-                    "properties": {
-                        "current_company": {"type": "string"},
-                        "current_role": {"type": "string"},
-                        "previous_companies": {"type": "array", "items": {"type": "string"}},
-                        "previous_roles": {"type": "array", "items": {"type": "string"}},
-                        "education": {"type": "array", "items": {"type": "string"}},
-                        "skills": {"type": "array", "items": {"type": "string"}},
-                        "location": {"type": "string"},
-                        "bio": {"type": "string"},
-                        "connection_degree": {"type": "string"}
-                    }
+            if not html_content:
+                return {"error": "Could not extract profile HTML"}
+            
+            # Only the visible content is needed, so drop the rest before saving and uploading
+            html_content = trim_html(html_content)
+            
+            # Save raw HTML to file
+            html_filename = os.path.join(self.output_folder, f"{investor_name.lower().replace(' ', '_')}_profile.html")
+            with open(html_filename, 'w', encoding='utf-8') as f:
+                f.write(html_content)
+            
+            # Define schema for profile data
+            schema = {
+                "type": "object",
+                "properties": {
+                    "current_company": {"type": "string"},
+                    "current_role": {"type": "string"},
+                    "previous_companies": {"type": "array", "items": {"type": "string"}},
+                    "previous_roles": {"type": "array", "items": {"type": "string"}},
+                    "education": {"type": "array", "items": {"type": "string"}},
+                    "skills": {"type": "array", "items": {"type": "string"}},
+                    "location": {"type": "string"},
+                    "bio": {"type": "string"},
+                    "connection_degree": {"type": "string"}
                 }
+            }
+            
+            # Extract structured data using the HTML extraction endpoint
+            profile_data = await self.extract_html_cached(
+                html=html_content,
+                query="Extract the following information from this LinkedIn profile: current company, current role, previous companies, previous roles, education, skills, location, bio, and connection degree.",
+                schema=schema
+            )
+            
+            if profile_data is None:
+                return {"error": "No profile data found"}
+            
+            # Extract the data from the response
+            if isinstance(profile_data, dict) and 'data' in profile_data:
+                profile_data = profile_data['data']
+            
+            # If they are a second connection, get mutual connections; this
+            # needs the browser even when the profile was fetched directly
+            if profile_data.get('connection_degree') == '2nd degree connection' and (on_profile_page or self.ui_fallback):
+                logger.info("Found 2nd connection, getting mutual connections...")
                 
-                # Extract structured data using the HTML extraction endpoint
-                result = await self.sdk.extract_html(
-                    html=html_content,
-                    query="Extract the following information from this LinkedIn profile: current company, current role, previous companies, previous roles, education, skills, location, bio, and connection degree.",
-                    output_format="json",
-                    schema=schema
-                )
+                if not on_profile_page:
+                    await self.open_profile_in_browser(profile_url)
                 
-                if not result or not hasattr(result, 'data'):
-                    return {"error": "No profile data found"}
+                # Click on mutual connections link
+                await self.sdk.execute_action(
+                    "Click on the mutual connections link",
+                    detection_sensitivity=0.5
+                )
                 
-                # Extract the data from the response
-                profile_data = result.data if hasattr(result, 'data') else result.json()
-                if isinstance(profile_data, dict) and 'data' in profile_data:
-                    profile_data = profile_data['data']
+                # Wait for page to load
+                await asyncio.sleep(5)
                 
-                # If they are a second connection, get mutual connections
-                if profile_data.get('connection_degree') == '2nd degree connection':
-                    logger.info("Found 2nd connection, getting mutual connections...")
+                # Extract mutual connections HTML
+                mutual_html = await self.extract_profile_html(profile_url)
+                if mutual_html:
+                    mutual_html = trim_html(mutual_html)
                     
-                    # Click on mutual connections link
-                    await self.sdk.execute_action(
-                        "Click on the mutual connections link",
-                        detection_sensitivity=0.5
-                    )
+                    # Save mutual connections HTML
+                    mutual_filename = os.path.join(self.output_folder, f"{investor_name.lower().replace(' ', '_')}_mutual_connections.html")
+                    with open(mutual_filename, 'w', encoding='utf-8') as f:
+                        f.write(mutual_html)
                     
-                    # Wait for page to load
-                    await asyncio.sleep(5)
-                    
-                    # Extract mutual connections HTML
-                    mutual_html = await self.extract_profile_html(profile_url)
-                    if mutual_html:
-                        # Save mutual connections HTML
-                        mutual_filename = os.path.join(self.output_folder, f"{investor_name.lower().replace(' ', '_')}_mutual_connections.html")
-                        with open(mutual_filename, 'w', encoding='utf-8') as f:
-                            f.write(mutual_html)
-                        
-                        # Extract mutual connections data
-                        mutual_schema = {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "name": {"type": "string"},
-                                    "title": {"type": "string"},
-                                    "company": {"type": "string"}
-                                }
+                    # Extract mutual connections data
+                    mutual_schema = {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "name": {"type": "string"},
+                                "title": {"type": "string"},
+                                "company": {"type": "string"}
                             }
                         }
-                        
-                        mutual_result = await self.sdk.extract_html(
-                            html=mutual_html,
-                            query="Extract the names, titles, and companies of all mutual connections listed.",
-                            output_format="json",
-                            schema=mutual_schema
-                        )
-                        
-                        if mutual_result and hasattr(mutual_result, 'data'):
-                            mutual_data = mutual_result.data if hasattr(mutual_result, 'data') else mutual_result.json()
-                            if isinstance(mutual_data, dict) and 'data' in mutual_data:
-                                profile_data['mutual_connections'] = mutual_data['data']
-                
-                return profile_data
-                
-            finally:
-                # Close Safari with Cmd+Q
-                logger.info("Closing Safari...")
-                pyautogui.hotkey('command', 'q')
-                await asyncio.sleep(2)  # Wait for Safari to close
+                    }
+                    
+                    mutual_data = await self.extract_html_cached(
+                        html=mutual_html,
+                        query="Extract the names, titles, and companies of all mutual connections listed.",
+                        schema=mutual_schema
+                    )
+                    
+                    if mutual_data is not None:
+                        if isinstance(mutual_data, dict) and 'data' in mutual_data:
+                            profile_data['mutual_connections'] = mutual_data['data']
+            
+            return profile_data
             
         except Exception as e:
             logger.error(f"Error analyzing profile: {str(e)}")
             return {"error": str(e)}
     
+    async def resolve_all_urls(self, names: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Look up LinkedIn profile URLs for all investors concurrently
+        
+        Names are deduplicated by normalize_name first. Found URLs are persisted
+        to urls.json in the output folder, and names already resolved there are
+        not looked up again.
+        
+        Args:
+            names: Investor names to resolve
+            
+        Returns:
+            Dictionary mapping each normalized name to its profile URL, or None if not found
+        """
+        urls_path = os.path.join(self.output_folder, "urls.json")
+        urls = {}
+        if os.path.exists(urls_path):
+            with open(urls_path, 'r', encoding='utf-8') as f:
+                urls = json.load(f)
+        
+        # Keep the first spelling of each investor for the search query
+        unique_names = {}
+        for name in names:
+            unique_names.setdefault(normalize_name(name), name)
+        
+        pending = [key for key in unique_names if key not in urls]
+        if pending:
+            logger.info(f"Looking up LinkedIn profiles for {len(pending)} investors...")
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+            
+            async def lookup_profile(investor_name: str) -> Optional[str]:
+                async with semaphore:
+                    return await self.find_linkedin_profile(investor_name)
+            
+            results = await asyncio.gather(*[lookup_profile(unique_names[key]) for key in pending])
+            urls.update(zip(pending, results))
+            
+            # Only found URLs are persisted so failed lookups are retried next run;
+            # for names with no profile the retry is served from the SERP cache
+            with open(urls_path, 'w', encoding='utf-8') as f:
+                json.dump({name: url for name, url in urls.items() if url}, f, indent=2)
+        
+        return urls
+    
+    async def enrich_chunk(self,
+                           chunk: pd.DataFrame,
+                           profile_urls: Dict[str, Optional[str]],
+                           enriched: Dict[str, Dict[str, Any]],
+                           writer: Any) -> None:
+        """
+        Enrich one chunk of investors and append the rows to the output
+        
+        Args:
+            chunk: Input rows to enrich
+            profile_urls: Profile URLs resolved by resolve_all_urls
+            enriched: Profile info already collected this run, by normalized name;
+                duplicate investors reuse it instead of being analyzed again
+            writer: CSVRecordWriter or ParquetRecordWriter for the output
+        """
+        # Convert the whole chunk to plain dicts at once, with missing values as None,
+        # instead of building a Series per row
+        rows = chunk.astype(object).where(chunk.notna(), None).to_dict('records')
+        
+        # Process each investor; this stays serial because it drives Safari
+        for row in rows:
+            investor_name = row['Name']
+            if not investor_name or not investor_name.strip():
+                # Nothing to look up, but keep the row in the output
+                logger.info("Skipping enrichment for a row with no investor name")
+                writer.writerow(row)
+                continue
+            key = normalize_name(investor_name)
+            profile_url = profile_urls.get(key)
+            logger.info(f"\nProcessing investor: {investor_name}")
+            
+            profile_info = {}
+            if key in enriched:
+                logger.info(f"Reusing profile for duplicate investor {investor_name}")
+                profile_info = enriched[key]
+            elif not profile_url:
+                logger.info(f"No LinkedIn profile found for {investor_name}, skipping")
+            else:
+                try:
+                    # Analyze profile
+                    analyzed = await self.analyze_profile(investor_name, profile_url)
+                    if "error" not in analyzed:
+                        profile_info = analyzed
+                    
+                except Exception as e:
+                    logger.error(f"Error processing investor {investor_name}: {str(e)}")
+                enriched[key] = profile_info
+            
+            # Hand the row to the writer right away; the CSV writer syncs it to disk
+            # at once, while the Parquet writer keeps it until the chunk is flushed
+            writer.writerow({**row, 'profile_url': profile_url, **profile_info})
+    
     async def enrich_investors(self, input_csv: str, output_csv: str):
         """
         Enrich investor data with profile information
         
+        The input is streamed in chunks and each investor is appended to the
+        output as soon as it is processed. Investors already in the output
+        are skipped, so an interrupted run can be resumed. When pyarrow is
+        installed the output is a Parquet dataset next to output_csv instead.
+        
         Args:
             input_csv: Path to input CSV file
             output_csv: Path to output CSV file
         """
+        writer = None
         try:
-            # Read input CSV
-            df = pd.read_csv(input_csv)
-            
-            # Add new columns for enriched data
-            df['current_company'] = None
-            df['current_role'] = None
-            df['previous_companies'] = None
-            df['previous_roles'] = None
-            df['education'] = None
-            df['skills'] = None
-            df['profile_url'] = None
-            df['connection_degree'] = None
-            df['location'] = None
-            df['bio'] = None
-            df['mutual_connections'] = None  # New column for mutual connections
-            
             # Create output directory if it doesn't exist
             os.makedirs(os.path.dirname(output_csv), exist_ok=True)
             
-            # Process each investor
-            for index, row in df.iterrows():
-                investor_name = row['Name']
-                logger.info(f"\nProcessing investor {index + 1}/{len(df)}: {investor_name}")
+            if PARQUET_AVAILABLE:
+                output_path = os.path.splitext(output_csv)[0] + ".parquet"
+                writer_class = ParquetRecordWriter
+            else:
+                output_path = output_csv
+                writer_class = CSVRecordWriter
+            
+            # Skip investors written by an earlier run; duplicates within this
+            # run are still written, reusing the profile already collected
+            processed_names = writer_class.processed_names(output_path)
+            if processed_names:
+                logger.info(f"Resuming: {len(processed_names)} investors already in {output_path}")
+            
+            # Resolve every profile URL before touching the browser, so the
+            # Safari pass below never waits on SERP or Gemini
+            names = pd.read_csv(
+                input_csv, usecols=['Name'], dtype={'Name': CSV_STRING_DTYPE}, engine=CSV_ENGINE
+            )['Name'].dropna()
+            profile_urls = await self.resolve_all_urls([name for name in names if name not in processed_names])
+            enriched = {}
+            
+            # The pyarrow engine cannot read in chunks, so this uses the C parser
+            for chunk in pd.read_csv(input_csv, chunksize=CSV_CHUNK_SIZE, dtype=CSV_STRING_DTYPE):
+                if writer is None:
+                    if writer_class is ParquetRecordWriter:
+                        writer = ParquetRecordWriter(output_path, list(chunk.columns))
+                    else:
+                        fieldnames = list(chunk.columns) + [c for c in ENRICHED_COLUMNS if c not in chunk.columns]
+                        writer = CSVRecordWriter(output_path, fieldnames)
                 
-                try:
-                    # Analyze profile
-                    profile_info = await self.analyze_profile(investor_name)
-                    
-                    if "error" not in profile_info:
-                        # Update DataFrame with profile info
-                        for key in profile_info:
-                            if key in df.columns:
-                                df.at[index, key] = profile_info[key]
-                        
-                        # Save progress after each successful profile
-                        df.to_csv(output_csv, index=False)
-                        logger.info(f"Saved progress to {output_csv}")
-                    
-                    # Add delay to avoid rate limiting
-                    await asyncio.sleep(2)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing investor {investor_name}: {str(e)}")
-                    # Save progress even if there's an error
-                    df.to_csv(output_csv, index=False)
+                chunk = chunk[~chunk['Name'].isin(processed_names)]
+                if chunk.empty:
                     continue
+                
+                await self.enrich_chunk(chunk, profile_urls, enriched, writer)
+                writer.flush()
+                logger.info(f"Saved progress to {output_path}")
             
-            logger.info(f"\nCompleted processing all investors. Final data saved to: {output_csv}")
+            logger.info(f"\nCompleted processing all investors. Final data saved to: {output_path}")
             
         except Exception as e:
             logger.error(f"Error enriching investors: {str(e)}")
-            # Save progress even if there's an error
-            df.to_csv(output_csv, index=False)
+        finally:
+            if writer is not None:
+                writer.close()
+            await self.close_browser()
+            await self.close()
 
 async def main_async():
     """Async main function"""
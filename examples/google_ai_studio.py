@@ -4,9 +4,27 @@ Google AI Studio automation using the Argus SDK
 
 import asyncio
 import os
-import time
+import pyperclip
 from coffeeblack import Argus
 
+async def type_text(sdk, text: str, use_clipboard: bool = True):
+    """
+    Type text into the focused field.
+    
+    Pastes the whole string from the clipboard in one keystroke by default,
+    falling back to pressing each key when the clipboard isn't available.
+    """
+    if use_clipboard:
+        try:
+            pyperclip.copy(text)
+            await sdk.press_key('v', modifiers=['command'])
+            return
+        except pyperclip.PyperclipException as e:
+            print(f"Clipboard unavailable, typing key by key: {e}")
+    
+    for char in text:
+        await sdk.press_key(char)
+
 async def main():
     # Initialize the SDK with API key for authentication
     # You can provide your API key directly or through an environment variable
@@ -30,57 +48,67 @@ async def main():
         print("Opening browser and navigating to Google AI Studio...")
         await sdk.open_and_attach_to_app(browser_name, wait_time=2.0)
 
-        # Navigate to Google AI Studio
-        await sdk.execute_action("Use the keyboard command. Type 'https://aistudio.google.com/prompts/new_chat' into the url bar", elements_conf=0.2, rows_conf=0.2)
+        # Navigate to Google AI Studio: focus the url bar and paste the URL
+        await sdk.press_key('l', modifiers=['command'])
+        await type_text(sdk, "https://aistudio.google.com/prompts/new_chat")
         await sdk.press_key("enter")
 
         # Wait for the page to load
-        time.sleep(5)
+        await sdk.see(
+            description="The Google AI Studio chat page with a prompt input",
+            wait=True,
+            timeout=15.0,
+            interval=0.3
+        )
         
         # Click on the Model dropdown
         print("Selecting Gemini 2.0 Flash Experimental model...")
         await sdk.execute_action("Click on the Model dropdown button")
-        time.sleep(2)
+        await sdk.see(description="An open model selection dropdown list", wait=True, timeout=5.0, interval=0.3)
         
         # Select the Gemini 2.0 Flash Experimental (Image Generation) option
         await sdk.execute_action("Click on the 'Gemini 2.0 Flash Experimental (Image Generation)' option")
-        time.sleep(3)
+        await sdk.see(
+            description="Gemini 2.0 Flash Experimental (Image Generation) selected as the model",
+            wait=True,
+            timeout=5.0,
+            interval=0.3
+        )
 
         print("Entering prompt...")
         await sdk.execute_action("Click on the 'Type Something' label", elements_conf=0.2, rows_conf=0.2)
-        time.sleep(1)
+        await asyncio.sleep(0.3)  # Let the input take focus
 
-        async def type_text(sdk, text: str):
-            for char in text:
-                await sdk.press_key(char)
-            
         await type_text(sdk, "Add a wife next to him")
-        time.sleep(1)
+        await asyncio.sleep(0.5)  # Let the field commit the pasted text
 
         # Click on the Add Attachment button in the chat box
         print("Uploading image...")
         await sdk.execute_action("Click on the Add Attachment at the bottom of the screen. Its a plus with a circle around it", elements_conf=0.3, rows_conf=0.5)
-        time.sleep(2)
+        await sdk.see(description="An attachment menu with an Upload File option", wait=True, timeout=5.0, interval=0.3)
         
         # Click on Upload File
         await sdk.execute_action("Click on the Upload File button in the selector", elements_conf=0.2, rows_conf=0.2)
-        time.sleep(2)
+        await sdk.see(description="A file picker dialog", wait=True, timeout=5.0, interval=0.3)
         
         # Click on the specific file
         await sdk.execute_action("Click on 'Single.png' text label" , elements_conf=0.2, rows_conf=0.8)
-        time.sleep(1)
+        await asyncio.sleep(0.5)  # Let the file selection register
         
         # Click on Open Button
         await sdk.execute_action("Click on the Open button")
-        time.sleep(3)
+        await sdk.see(description="An image attached in the chat prompt box", wait=True, timeout=10.0, interval=0.3)
 
         await sdk.execute_action("Click on the Run button")
-        time.sleep(3)
-        
         
         # Wait for processing
         print("Processing request...")
-        time.sleep(10)
+        await sdk.see(
+            description="A generated image in the model's chat response",
+            wait=True,
+            timeout=60.0,
+            interval=1.0
+        )
         
         print("✅ Successfully completed Google AI Studio workflow")
         
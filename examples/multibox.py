@@ -6,7 +6,11 @@ queueing vision requests and actions between different windows.
 """
 
 import asyncio
+import dataclasses
+import logging
+import logging.handlers
 import os
+import queue
 import sys
 import time
 import random
@@ -16,6 +20,59 @@ from collections import deque
 from coffeeblack import Argus
 from coffeeblack.types import WindowInfo, CoffeeBlackResponse
 
+logger = logging.getLogger("MultiBox")
+
+# Default timeout in seconds for each task type; a task can override it with a
+# "_timeout" entry in its task_args
+_TASK_TIMEOUTS = {
+    "execute_action": 30.0,
+    "see": 20.0,
+    "press_key": 5.0,
+    "scroll": 10.0
+}
+
+
+# Result fields that can hold image data and are not kept in stored results
+_HEAVY_RESULT_KEYS = ("image", "screenshot", "raw_frame")
+
+
+def _slim(result: Any) -> Any:
+    """
+    Drop bulky payloads from a task result before it is stored
+    
+    Args:
+        result: The result of a task (a batch result is a list of results)
+        
+    Returns:
+        The result without image data or the full detection tree
+    """
+    if isinstance(result, list):
+        return [_slim(item) for item in result]
+    if isinstance(result, dict):
+        return {key: value for key, value in result.items() if key not in _HEAVY_RESULT_KEYS}
+    if isinstance(result, CoffeeBlackResponse):
+        return dataclasses.replace(result, raw_detections=None, hierarchy=None)
+    return result
+
+
+def _split_safari(windows: List[WindowInfo]) -> Tuple[List[WindowInfo], List[WindowInfo]]:
+    """
+    Pick the Safari windows out of a window listing in one pass
+    
+    Args:
+        windows: The open windows
+        
+    Returns:
+        Tuple of (all Safari windows, active Safari windows)
+    """
+    all_safari, active_safari = [], []
+    for w in windows:
+        if w.app_name == "Safari" or "Safari" in w.title:
+            all_safari.append(w)
+            if w.is_active:
+                active_safari.append(w)
+    return all_safari, active_safari
+
 
 class BrowserInstance:
     """Represents a single browser instance that can be managed"""
@@ -23,19 +80,20 @@ class BrowserInstance:
     def __init__(self, 
                  name: str, 
                  sdk: Argus, 
-                 window_info: Optional[WindowInfo] = None):
+                 window_info: Optional[WindowInfo] = None,
+                 max_results: int = 1000):
         self.name = name
         self.sdk = sdk
         self.window_info = window_info
-        self.is_busy = False
         self.last_active = 0
-        self.task_queue = deque()
-        self.results = []
+        self.task_queue: asyncio.Queue = asyncio.Queue()
+        self.worker_task: Optional[asyncio.Task] = None
+        # Only the most recent results are kept, so long sessions don't grow without bound
+        self.results: deque = deque(maxlen=max_results)
     
     def __str__(self):
         window_title = self.window_info.title if self.window_info else "Not attached"
-        status = "Busy" if self.is_busy else "Idle"
-        return f"Browser '{self.name}' - {window_title} - {status}"
+        return f"Browser '{self.name}' - {window_title} - {self.task_queue.qsize()} queued"
 
 
 class MultiBoxManager:
@@ -49,6 +107,21 @@ class MultiBoxManager:
         self.debug_enabled = debug_enabled
         self.browsers: Dict[str, BrowserInstance] = {}
         self.running = False
+        
+        # One SDK instance (and HTTP session) is shared by all browsers. It
+        # acts on one attached window at a time, so attaching and acting on a
+        # window happen under _sdk_lock, which also serializes window creation.
+        self.sdk = Argus(
+            api_key=api_key,
+            verbose=True,
+            debug_enabled=debug_enabled,
+            elements_conf=0.2,
+            rows_conf=0.4,
+            model="ui-detect"
+        )
+        self._sdk_lock = asyncio.Lock()
+        self._focused_window_id: Optional[str] = None
+        self._win_cache: Optional[Tuple[float, List[WindowInfo]]] = None
     
     async def create_browser(self, name: str, wait_time: float = 2.0) -> BrowserInstance:
         """
@@ -61,75 +134,109 @@ class MultiBoxManager:
         Returns:
             BrowserInstance: The created browser instance
         """
-        # Create a new SDK instance for this browser
-        sdk = Argus(
-            api_key=self.api_key,
-            verbose=True,
-            debug_enabled=self.debug_enabled,
-            elements_conf=0.2,
-            rows_conf=0.4,
-            model="ui-detect"
-        )
-        
+        sdk = self.sdk
         browser = BrowserInstance(name=name, sdk=sdk)
         self.browsers[name] = browser
         
         try:
-            # For the first browser, open Safari normally
-            if len(self.browsers) == 1:  # This is the first browser (since we already added it to self.browsers)
-                print(f"Opening first Safari instance for {name}...")
-                await sdk.open_and_attach_to_app("Safari", wait_time=wait_time)
-            else:
-                # For subsequent browsers, attach to the existing Safari and create a new window
-                print(f"Creating new Safari window for {name}...")
-                
-                # Find an existing Safari window
-                windows = await sdk.get_open_windows()
-                safari_windows = [w for w in windows if w.app_name == "Safari" or "Safari" in w.title]
+            # Opening a window and identifying it by focus must not interleave
+            # with another browser being created at the same time
+            async with self._sdk_lock:
+                target_window = None
                 
-                if not safari_windows:
-                    # If no Safari windows found, open Safari first
+                # For the first browser, open Safari normally
+                if not any(other.window_info for other in self.browsers.values()):
+                    logger.info(f"Opening first Safari instance for {name}...")
                     await sdk.open_and_attach_to_app("Safari", wait_time=wait_time)
+                    self._win_cache = None
                 else:
-                    # Attach to an existing Safari window
-                    await sdk.attach_to_window(safari_windows[0].id)
-                
-                # Create a new window using Command+N
-                print("Creating new window with Command+N...")
-                await sdk.press_key("n", ["command"])
+                    # For subsequent browsers, attach to the existing Safari and create a new window
+                    logger.info(f"Creating new Safari window for {name}...")
+                    
+                    # Find an existing Safari window; the previous browser has just
+                    # listed the windows, so this usually reuses that listing
+                    safari_windows, _ = _split_safari(await self._get_windows_cached(sdk))
+                    
+                    if not safari_windows:
+                        # If no Safari windows found, open Safari first
+                        await sdk.open_and_attach_to_app("Safari", wait_time=wait_time)
+                        self._win_cache = None
+                        safari_windows, _ = _split_safari(await self._get_windows_cached(sdk))
+                    else:
+                        # Attach to an existing Safari window
+                        await sdk.attach_to_window(safari_windows[0].id)
+                    
+                    # Create a new window using Command+N
+                    known_ids = {w.id for w in safari_windows}
+                    logger.info("Creating new window with Command+N...")
+                    await sdk.press_key("n", ["command"])
+                    self._win_cache = None
+                    
+                    # Wait for the new window to show up, for at most 1.5 seconds
+                    deadline = time.monotonic() + 1.5
+                    while True:
+                        safari_windows, _ = _split_safari(await self._get_windows_cached(sdk, max_age=0))
+                        new_windows = [w for w in safari_windows if w.id not in known_ids]
+                        if new_windows or time.monotonic() >= deadline:
+                            break
+                        await asyncio.sleep(0.1)
+                    
+                    if new_windows:
+                        target_window = new_windows[0]
                 
-                # Wait for the new window to open and become active
-                await asyncio.sleep(1.5)
-            
-            # Get the updated window info after creating the new window
-            # This should now be the most recently created and active Safari window
-            windows = await sdk.get_open_windows()
-            safari_windows = [w for w in windows if (w.app_name == "Safari" or "Safari" in w.title) and w.is_active]
-            
-            # If no active Safari window found, try any Safari window
-            if not safari_windows:
-                safari_windows = [w for w in windows if w.app_name == "Safari" or "Safari" in w.title]
-            
-            if safari_windows:
-                target_window = safari_windows[0]
+                if target_window is None:
+                    # Get the updated window info after creating the new window
+                    # This should now be the most recently created and active Safari window
+                    # If no active Safari window found, try any Safari window
+                    all_safari, active_safari = _split_safari(await self._get_windows_cached(sdk))
+                    safari_windows = active_safari or all_safari
+                    
+                    if not safari_windows:
+                        raise ValueError("No Safari windows found after attempting to create one")
+                    
+                    target_window = safari_windows[0]
                 
                 # Make sure we're attached to this window
                 await sdk.attach_to_window(target_window.id)
-                
-                # Store the window info
-                browser.window_info = target_window
-                browser.last_active = time.time()
-                print(f"Created browser instance: {browser}")
-            else:
-                raise ValueError("No Safari windows found after attempting to create one")
+                self._focused_window_id = target_window.id
+            
+            # Store the window info
+            browser.window_info = target_window
+            browser.last_active = time.time()
+            logger.info(f"Created browser instance: {browser}")
             
         except Exception as e:
-            print(f"Error creating browser instance '{name}': {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error creating browser instance '{name}': {e}")
+        
+        # Start the worker that runs this browser's queued tasks. It is started even
+        # if setup failed, so tasks queued here fail in _focus_browser and are marked
+        # done instead of waiting forever
+        self.running = True
+        browser.worker_task = asyncio.create_task(self._worker_loop(browser))
         
         return browser
     
+    async def _get_windows_cached(self, sdk: Argus, max_age: float = 0.5) -> List[WindowInfo]:
+        """
+        List the open windows, reusing a listing taken less than max_age seconds ago
+        
+        Anything that opens a window must clear the cache (self._win_cache = None).
+        
+        Args:
+            sdk: The SDK instance to list the windows with
+            max_age: Maximum age in seconds of a cached listing
+            
+        Returns:
+            The open windows
+        """
+        now = time.monotonic()
+        if self._win_cache and now - self._win_cache[0] < max_age:
+            return self._win_cache[1]
+        
+        windows = await sdk.get_open_windows()
+        self._win_cache = (now, windows)
+        return windows
+    
     async def queue_task(self, 
                         browser_name: str, 
                         task_type: str, 
@@ -139,62 +246,57 @@ class MultiBoxManager:
         
         Args:
             browser_name: Name of the browser to queue the task for
-            task_type: Type of task ('execute_action', 'see', etc.)
+            task_type: Type of task ('execute_action', 'see', etc.), or 'batch'
+                to run task_args["tasks"], a list of (task_type, task_args) pairs,
+                as a single task
             task_args: Arguments for the task
         """
         if browser_name not in self.browsers:
             raise ValueError(f"Browser '{browser_name}' not found")
         
         browser = self.browsers[browser_name]
-        browser.task_queue.append((task_type, task_args))
-        print(f"Queued {task_type} for browser '{browser_name}', queue size: {len(browser.task_queue)}")
+        await browser.task_queue.put((task_type, task_args))
+        logger.info(f"Queued {task_type} for browser '{browser_name}', queue size: {browser.task_queue.qsize()}")
     
-    async def process_queues(self):
-        """Process all task queues for all browsers concurrently"""
-        self.running = True
+    async def _worker_loop(self, browser: BrowserInstance) -> None:
+        """
+        Run the tasks queued for one browser, in order, until stopped
+        
+        Each browser has its own worker, which only wakes up when a task is
+        queued for it. Workers take turns on the shared SDK through _sdk_lock.
         
+        Args:
+            browser: The browser instance whose queue to process
+        """
         while self.running:
-            # Find the next browser with tasks that isn't busy
-            next_browser = None
-            for browser in self.browsers.values():
-                if not browser.is_busy and browser.task_queue:
-                    next_browser = browser
-                    break
+            task_type, task_args = await browser.task_queue.get()
             
-            if next_browser:
-                # Mark browser as busy
-                next_browser.is_busy = True
-                
-                # Get the next task
-                task_type, task_args = next_browser.task_queue.popleft()
-                
-                try:
+            try:
+                async with self._sdk_lock:
                     # Focus this browser window
-                    await self._focus_browser(next_browser)
+                    await self._focus_browser(browser)
                     
                     # Execute the task
-                    result = await self._execute_task(next_browser, task_type, task_args)
-                    
-                    # Store the result
-                    next_browser.results.append({
-                        "task_type": task_type,
-                        "task_args": task_args,
-                        "result": result,
-                        "timestamp": time.time()
-                    })
-                    
-                    # Update last active time
-                    next_browser.last_active = time.time()
-                    
-                except Exception as e:
-                    print(f"Error executing task on browser '{next_browser.name}': {e}")
-                    
-                finally:
-                    # Mark browser as idle
-                    next_browser.is_busy = False
-            
-            # If no tasks to process, wait a bit
-            await asyncio.sleep(0.1)
+                    result = await self._execute_task(browser, task_type, task_args)
+                
+                # Store the result
+                browser.results.append({
+                    "task_type": task_type,
+                    "task_args": task_args,
+                    "result": _slim(result),
+                    "timestamp": time.time()
+                })
+                
+                # Update last active time
+                browser.last_active = time.time()
+                
+            except Exception as e:
+                logger.error(f"Error executing task on browser '{browser.name}': {e}")
+                # Don't assume the window is still focused after a failure
+                self._focused_window_id = None
+                
+            finally:
+                browser.task_queue.task_done()
     
     async def _focus_browser(self, browser: BrowserInstance) -> None:
         """
@@ -206,9 +308,14 @@ class MultiBoxManager:
         if not browser.window_info:
             raise ValueError(f"Browser '{browser.name}' is not attached to a window")
         
+        # Consecutive tasks on the same window don't need to re-attach
+        if self._focused_window_id == browser.window_info.id:
+            return
+        
         # Attach to the window to bring it into focus
         await browser.sdk.attach_to_window(browser.window_info.id)
-        print(f"Focused browser '{browser.name}'")
+        self._focused_window_id = browser.window_info.id
+        logger.info(f"Focused browser '{browser.name}'")
     
     async def _execute_task(self, 
                            browser: BrowserInstance, 
@@ -225,26 +332,47 @@ class MultiBoxManager:
         Returns:
             The result of the task execution
         """
-        print(f"Executing {task_type} on browser '{browser.name}'")
+        logger.info(f"Executing {task_type} on browser '{browser.name}'")
+        
+        if task_type == "batch":
+            # Run several tasks back to back on the already focused window
+            results = []
+            for sub_type, sub_args in task_args["tasks"]:
+                results.append(await self._execute_task(browser, sub_type, sub_args))
+            return results
+        
+        task_args = dict(task_args)
+        timeout = task_args.pop("_timeout", _TASK_TIMEOUTS.get(task_type, 30.0))
         
         if task_type == "execute_action":
-            return await browser.sdk.execute_action(**task_args)
+            call = browser.sdk.execute_action(**task_args)
         elif task_type == "see":
-            return await browser.sdk.see(**task_args)
+            call = browser.sdk.see(**task_args)
         elif task_type == "press_key":
-            return await browser.sdk.press_key(**task_args)
+            call = browser.sdk.press_key(**task_args)
         elif task_type == "scroll":
-            return await browser.sdk.scroll(**task_args)
+            call = browser.sdk.scroll(**task_args)
         else:
             raise ValueError(f"Unknown task type: {task_type}")
+        
+        # A stuck task becomes an error instead of blocking this browser's queue
+        try:
+            return await asyncio.wait_for(call, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{task_type} on browser '{browser.name}' timed out after {timeout}s")
+            self._focused_window_id = None
+            raise
     
     def stop(self):
         """Stop processing queues"""
         self.running = False
+        for browser in self.browsers.values():
+            if browser.worker_task:
+                browser.worker_task.cancel()
     
     async def get_results(self, browser_name: str) -> List[Dict[str, Any]]:
         """
-        Get all results for a specific browser
+        Get the stored results for a specific browser, oldest first
         
         Args:
             browser_name: Name of the browser to get results for
@@ -255,7 +383,27 @@ class MultiBoxManager:
         if browser_name not in self.browsers:
             raise ValueError(f"Browser '{browser_name}' not found")
         
-        return self.browsers[browser_name].results
+        return list(self.browsers[browser_name].results)
+
+
+def _build_batch(site: str) -> Dict[str, Any]:
+    """
+    Build the batch task that navigates a browser to a website
+    
+    The batch types the URL, submits it, and verifies the page loaded.
+    
+    Args:
+        site: URL of the website to open
+        
+    Returns:
+        task_args for a "batch" task
+    """
+    host = site.split('//', 1)[1]
+    return {"tasks": [
+        ("execute_action", {"query": f"Type {site} into the url bar"}),
+        ("press_key", {"key": "enter"}),
+        ("see", {"description": f"A webpage from {host}", "wait": True, "timeout": 10.0})
+    ]}
 
 
 async def main():
@@ -265,23 +413,21 @@ async def main():
     # Initialize with API key
     api_key = os.environ.get("COFFEEBLACK_API_KEY")
     if not api_key:
-        print("Please set the COFFEEBLACK_API_KEY environment variable")
+        logger.error("Please set the COFFEEBLACK_API_KEY environment variable")
         sys.exit(1)
     
     # Create the multi-box manager
     manager = MultiBoxManager(api_key=api_key, debug_enabled=True)
     
     try:
-        # Create multiple browser instances
-        browsers = []
+        # Create multiple browser instances; the manager serializes the window
+        # setup itself, so they can all be started at once
         browser_count = 4  # We want to manage 4 Safari instances
         
-        print(f"Creating {browser_count} browser instances...")
-        for i in range(browser_count):
-            browser = await manager.create_browser(f"safari_{i}", wait_time=2.0)
-            browsers.append(browser)
-            # Add a small delay between launching browsers to avoid conflicts
-            await asyncio.sleep(1.5)
+        logger.info(f"Creating {browser_count} browser instances...")
+        browsers = await asyncio.gather(
+            *[manager.create_browser(f"safari_{i}", wait_time=2.0) for i in range(browser_count)]
+        )
         
         # Queue tasks for each browser (example: navigate to different websites)
         websites = [
@@ -291,59 +437,51 @@ async def main():
             "https://www.reddit.com"
         ]
         
-        for i, browser_name in enumerate(manager.browsers.keys()):
-            # Queue an action to navigate to a website
-            await manager.queue_task(
-                browser_name=browser_name,
-                task_type="execute_action",
-                task_args={"query": f"Type {websites[i]} into the url bar"}
-            )
-            
-            # Queue a key press to submit the URL
-            await manager.queue_task(
-                browser_name=browser_name,
-                task_type="press_key",
-                task_args={"key": "enter"}
-            )
-            
-            # Queue a vision check to verify the page loaded
-            await manager.queue_task(
-                browser_name=browser_name,
-                task_type="see",
-                task_args={
-                    "description": f"A webpage from {websites[i].split('//')[1]}",
-                    "wait": True,
-                    "timeout": 10.0
-                }
-            )
-        
-        # Start processing queues in the background
-        queue_processor = asyncio.create_task(manager.process_queues())
+        # Queue navigation to one website per browser
+        await asyncio.gather(
+            *[manager.queue_task(browser_name=browser.name, task_type="batch", task_args=_build_batch(site))
+              for browser, site in zip(browsers, websites)]
+        )
         
         # Wait for all tasks to complete (5 minute timeout)
-        print("Processing tasks across all browsers...")
+        logger.info("Processing tasks across all browsers...")
         try:
             await asyncio.wait_for(
                 asyncio.gather(
-                    *[asyncio.create_task(_wait_for_empty_queue(manager, name)) 
-                      for name in manager.browsers.keys()]
+                    *[browser.task_queue.join() for browser in manager.browsers.values()]
                 ),
                 timeout=300  # 5 minute timeout
             )
-            print("All tasks completed successfully!")
+            logger.info("All tasks completed successfully!")
         except asyncio.TimeoutError:
-            print("Timeout waiting for tasks to complete")
+            logger.warning("Timeout waiting for tasks to complete")
         
-        # Stop the queue processor
+        # Stop the browser workers
         manager.stop()
-        await queue_processor
+        await asyncio.gather(
+            *[browser.worker_task for browser in manager.browsers.values() if browser.worker_task],
+            return_exceptions=True
+        )
+        
+        # Close the shared SDK's HTTP session
+        await manager.sdk.close()
         
         # Print results
         for browser_name, browser in manager.browsers.items():
-            results = await manager.get_results(browser_name)
-            print(f"\nResults for {browser_name}:")
+            results = []
+            for result in await manager.get_results(browser_name):
+                if result['task_type'] == 'batch':
+                    # Report each task of a batch separately
+                    results.extend(
+                        {"task_type": sub_type, "result": sub_result}
+                        for (sub_type, _), sub_result in zip(result['task_args']['tasks'], result['result'])
+                    )
+                else:
+                    results.append(result)
+            
+            logger.info(f"\nResults for {browser_name}:")
             for i, result in enumerate(results):
-                print(f"  Task {i+1}: {result['task_type']}")
+                logger.info(f"  Task {i+1}: {result['task_type']}")
                 
                 # For 'see' tasks, show if the page was detected
                 if result['task_type'] == 'see' and 'result' in result:
@@ -351,26 +489,20 @@ async def main():
                     if isinstance(see_result, dict):
                         matches = see_result.get('matches', False)
                         confidence = see_result.get('confidence', 'unknown')
-                        print(f"    {'✅ Match' if matches else '❌ No match'} (confidence: {confidence})")
+                        logger.info(f"    {'✅ Match' if matches else '❌ No match'} (confidence: {confidence})")
         
     except Exception as e:
-        print(f"Error in main: {e}")
-        import traceback
-        traceback.print_exc()
-
-
-async def _wait_for_empty_queue(manager: MultiBoxManager, browser_name: str) -> None:
-    """
-    Wait until a browser's task queue is empty
-    
-    Args:
-        manager: The MultiBoxManager instance
-        browser_name: Name of the browser to wait for
-    """
-    browser = manager.browsers[browser_name]
-    while len(browser.task_queue) > 0 or browser.is_busy:
-        await asyncio.sleep(0.5)
+        logger.exception(f"Error in main: {e}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    # Log records are handed to a background thread for writing, so logging
+    # from the workers never blocks the event loop on stdout
+    log_queue = queue.Queue(-1)
+    logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(log_queue)])
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    try:
+        asyncio.run(main())
+    finally:
+        listener.stop()
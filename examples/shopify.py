@@ -6,7 +6,6 @@ import asyncio
 import os
 import sys
 import os.path
-import time
 from coffeeblack import Argus
 
 async def main():
@@ -43,7 +42,7 @@ async def main():
         await sdk.press_key("enter")
 
         # Wait for the login page to load
-        time.sleep(3)
+        await asyncio.sleep(3)
         
         # Verify we're on the login page
         # see_result = await sdk.see(
@@ -59,7 +58,7 @@ async def main():
         # if not see_result.get('matches', False):
         #     print("Failed to find Shopify login page. Please check if the URL is correct.")
         #     return
-        time.sleep(3)
+        await asyncio.sleep(3)
 
         # Enter email
         print("Entering email...")
@@ -68,19 +67,19 @@ async def main():
         # Click Next or Continue button to proceed to password
         await sdk.execute_action("Click on the 'Continue with email' button")
         
-        time.sleep(2)
+        await asyncio.sleep(2)
         
         # Enter password
         print("Entering password...")
         await sdk.execute_action(f"Type {shopify_password} into the password field")
-        time.sleep(2)
+        await asyncio.sleep(2)
 
         # Click Login button
         await sdk.execute_action("Click on the 'Log in' button")
         
-        time.sleep(5)
+        await asyncio.sleep(5)
         await sdk.execute_action("Click on the 'Settings' button")
-        time.sleep(2)
+        await asyncio.sleep(2)
 
         # Verify successful login by checking for dashboard elements
         see_result = await sdk.see(
@@ -9,23 +9,84 @@ import os.path
 import time
 import json
 import uuid
-import io
 import base64
+import hashlib
+import queue
+import threading
+import functools
+import concurrent.futures
 from pathlib import Path
 from datetime import datetime
 from PIL import Image
-import requests
+import cv2
+import aiohttp
 import numpy as np
 from typing import List, Dict, Any, Tuple, Optional
 from voyageai import Client as VoyageClient
 from coffeeblack import Argus
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
 voyage_api_key = "pa-Kt9snqkuTiF150_2Jh7N_L8Uf6eQIfTBvzR-x5VVUBZ"
 
 # Storage paths for compiled tasks
 TASKS_DIR = Path("./compiled_tasks")
 TASKS_DIR.mkdir(exist_ok=True)
 
+# Screenshots are stored as JPEG and element crops as WebP; crops of text
+# elements stay PNG so their edges stay crisp
+SCREENSHOT_JPEG_QUALITY = 90
+CROP_WEBP_QUALITY = 90
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write a file via a temporary file so it is never seen partially written"""
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+class AsyncArtifactWriter:
+    """Writes files on a background thread so compilation never waits on disk I/O"""
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def write(self, path: Path, data: bytes) -> None:
+        """Queue data to be written to path"""
+        self._queue.put((path, data))
+    
+    def flush(self) -> None:
+        """Wait until every queued write has finished"""
+        self._queue.join()
+    
+    def flush_and_join(self) -> None:
+        """Finish the queued writes and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join()
+    
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, data = item
+                write_atomic(path, data)
+            except Exception as e:
+                print(f"Error writing {path}: {e}")
+            finally:
+                self._queue.task_done()
+
 class TaskCompiler:
     """Helper class to manage the compilation of automation tasks"""
     
@@ -35,13 +96,30 @@ class TaskCompiler:
         self.voyage_api_key = voyage_api_key
         self.yolo_endpoint = yolo_endpoint or "http://app.coffeeblack.ai/api/yolo"
         self.steps = []
+        
+        # Normalized step embeddings stacked into one matrix for matching; built
+        # the first time a step is matched and rebuilt after new steps are compiled
+        self.emb_matrix: Optional[np.ndarray] = None
+        self.emb_step_indices: List[int] = []
+        
+        # Saved screenshots by thumbnail hash, and saved crops with their embedding
+        # keys by (thumbnail hash, x1, y1, x2, y2), so unchanged frames are reused
+        self._frame_index: Dict[str, Path] = {}
+        self._crop_index: Dict[Tuple[str, int, int, int, int], Tuple[Path, str]] = {}
+        
         self.task_dir = TASKS_DIR / self.task_id
-        self.task_dir.mkdir(exist_ok=True)
         self.screenshots_dir = self.task_dir / "screenshots"
-        self.screenshots_dir.mkdir(exist_ok=True)
         self.crops_dir = self.task_dir / "crops"
-        self.crops_dir.mkdir(exist_ok=True)
+        self.embeddings_dir = self.task_dir / "embeddings"
+        self.make_task_dirs()
         self.task_file = self.task_dir / "task.json"
+        self.writer = AsyncArtifactWriter()
+        
+        # HTTP session for the YOLO endpoint, created on first use and shared by all requests
+        self._http: Optional[aiohttp.ClientSession] = None
+        
+        # Image decoding/encoding and Voyage calls run here, off the event loop
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
         
         # Initialize Voyage client if API key is provided
         self.voyage_client = VoyageClient(api_key=voyage_api_key) if voyage_api_key else None
@@ -49,65 +127,224 @@ class TaskCompiler:
         # Load existing steps if present
         self.load_task_metadata()
     
+    def make_task_dirs(self):
+        """Create the task's directories, unless a previous run already created them"""
+        # The embeddings directory is created last, so if it exists the others do too
+        if self.embeddings_dir.is_dir():
+            return
+        for directory in (self.task_dir, self.screenshots_dir, self.crops_dir, self.embeddings_dir):
+            directory.mkdir(exist_ok=True)
+    
     def load_task_metadata(self):
         """Load task metadata from disk if it exists"""
-        if self.task_file.exists():
-            try:
-                with open(self.task_file, 'r') as f:
-                    metadata = json.load(f)
-                    self.steps = metadata.get('steps', [])
-                    print(f"Loaded {len(self.steps)} steps from existing task: {self.task_id}")
-            except Exception as e:
-                print(f"Error loading task metadata: {e}")
+        try:
+            data = self.task_file.read_bytes()
+        except FileNotFoundError:
+            return
+        try:
+            metadata = orjson.loads(data) if orjson is not None else json.loads(data)
+            self.steps = metadata.get('steps', [])
+            print(f"Loaded {len(self.steps)} steps from existing task: {self.task_id}")
+            for step in self.steps:
+                self.index_step(step)
+        except Exception as e:
+            print(f"Error loading task metadata: {e}")
+    
+    def index_step(self, step):
+        """Add a compiled step's screenshot and element crop to the dedupe indexes"""
+        frame_hash = step.get("frame_hash")
+        if not frame_hash:
+            return
+        self._frame_index.setdefault(frame_hash, TASKS_DIR / step["screenshot_path"])
+        element_info = step.get("element_info")
+        if element_info and element_info.get("bbox") and step.get("element_crop_path") and step.get("embedding_key"):
+            crop_key = self._crop_key(frame_hash, element_info["bbox"])
+            self._crop_index.setdefault(crop_key, (TASKS_DIR / step["element_crop_path"], step["embedding_key"]))
+    
+    def build_embedding_matrix(self):
+        """Stack the L2-normalized step embeddings into self.emb_matrix"""
+        rows, indices = [], []
+        for i, step in enumerate(self.steps):
+            if step.get("embedding_key"):
+                embedding = self.load_embedding(step["embedding_key"])
+            elif step.get("embedding"):
+                embedding = np.asarray(step["embedding"], dtype=np.float32)  # Tasks compiled before the cache
+            else:
+                continue
+            if rows and embedding.shape != rows[0].shape:
+                continue  # Skip embeddings from a different model
+            rows.append(embedding)
+            indices.append(i)
+        
+        if not rows:
+            self.emb_matrix, self.emb_step_indices = None, []
+            return
+        matrix = np.stack(rows).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.emb_matrix = matrix / np.maximum(norms, 1e-12)
+        self.emb_step_indices = indices
     
-    def save_task_metadata(self):
-        """Save task metadata to disk"""
+    def match_step(self, query_embedding) -> Tuple[Optional[int], float]:
+        """Find the compiled step whose embedding is most similar to a query embedding
+        
+        All steps are scored with a single matrix-vector product of cosine similarities.
+        
+        Returns:
+            (step index, score) for the best match, or (None, score) when the best
+            score is below that step's confidence_threshold or nothing can be matched
+        """
+        if self.emb_matrix is None:
+            self.build_embedding_matrix()
+        if self.emb_matrix is None:
+            return None, 0.0
+        
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape != self.emb_matrix.shape[1:]:
+            return None, 0.0
+        query = query / max(np.linalg.norm(query), 1e-12)
+        
+        scores = self.emb_matrix @ query
+        best = int(np.argmax(scores))
+        step_index = self.emb_step_indices[best]
+        score = float(scores[best])
+        if score < self.steps[step_index].get("confidence_threshold", 0.85):
+            return None, score
+        return step_index, score
+    
+    def save_task_metadata(self, sync=False):
+        """Save task metadata to disk
+        
+        The write happens on the background writer unless sync is True, which
+        is used for the final save so the task is on disk when this returns.
+        """
         metadata = {
             "task_id": self.task_id,
             "created_at": datetime.now().isoformat(),
             "modified_at": datetime.now().isoformat(),
             "steps": self.steps
         }
-        with open(self.task_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        if orjson is not None:
+            data = orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            data = json.dumps(metadata, indent=2).encode()
+        if sync:
+            # Let queued saves finish first so an older copy can't land after this one
+            self.writer.flush()
+            write_atomic(self.task_file, data)
+        else:
+            self.writer.write(self.task_file, data)
+    
+    async def get_http_session(self) -> aiohttp.ClientSession:
+        """Get or create the shared HTTP session"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession()
+        return self._http
+    
+    async def aclose(self):
+        """Close the shared HTTP session and the worker threads"""
+        if self._http and not self._http.closed:
+            await self._http.close()
+        self._pool.shutdown(wait=False)
+    
+    async def _run_in_pool(self, func, *args, **kwargs):
+        """Run a blocking function on the compiler's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(func, *args, **kwargs))
     
-    async def get_yolo_detections(self, screenshot, container_conf=0.3, row_conf=0.4, element_conf=0.2):
-        """Get UI element detections using YOLO API endpoint"""
+    @staticmethod
+    def _encode_image(image, extension, params=None):
+        """Encode a BGR array into image file bytes (e.g. extension='.jpg')"""
+        ok, buffer = cv2.imencode(extension, image, params or [])
+        if not ok:
+            raise ValueError(f"Could not encode image as {extension}")
+        return buffer.tobytes()
+    
+    @staticmethod
+    def _frame_hash(image):
+        """Hash a 64x64 thumbnail of a screenshot so unchanged frames get the same hash"""
+        thumb = cv2.resize(image, (64, 64), interpolation=cv2.INTER_AREA)
+        return hashlib.blake2b(thumb.tobytes(), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _crop_key(frame_hash, bbox):
+        """Key of an element crop in the crop index"""
+        return (frame_hash, int(bbox["x1"]), int(bbox["y1"]), int(bbox["x2"]), int(bbox["y2"]))
+    
+    @staticmethod
+    def _decode_screenshot(screenshot):
+        """Decode a screenshot (PNG bytes or base64) into its PNG bytes and a BGR array"""
+        if isinstance(screenshot, bytes) and screenshot.startswith(b"\x89PNG"):
+            screenshot_bytes = screenshot  # get_screenshot() returns the PNG bytes as-is
+        elif pybase64 is not None:
+            screenshot_bytes = pybase64.b64decode(screenshot, validate=False)
+        else:
+            screenshot_bytes = base64.b64decode(screenshot)
+        screenshot_arr = cv2.imdecode(np.frombuffer(screenshot_bytes, np.uint8), cv2.IMREAD_COLOR)
+        return screenshot_bytes, screenshot_arr
+    
+    async def get_yolo_detections(self, screenshot_bytes, container_conf=0.3, row_conf=0.4, element_conf=0.2):
+        """Get UI element detections using YOLO API endpoint for raw PNG screenshot bytes"""
         try:
-            # Save screenshot to a temporary file
-            temp_screenshot_path = self.task_dir / f"temp_screenshot_{int(time.time())}.png"
-            with open(temp_screenshot_path, 'wb') as f:
-                f.write(base64.b64decode(screenshot))
-            
-            # Send request to YOLO endpoint
-            with open(temp_screenshot_path, 'rb') as f:
-                files = {'file': f}
-                data = {
-                    'container_conf': container_conf,
-                    'row_conf': row_conf,
-                    'element_conf': element_conf
-                }
-                response = requests.post(self.yolo_endpoint, files=files, data=data)
-            
-            # Remove temp file
-            temp_screenshot_path.unlink()
-            
-            if response.status_code != 200:
-                print(f"Error from YOLO API: {response.status_code} {response.text}")
-                return None
+            # Send the screenshot to the YOLO endpoint straight from memory
+            form = aiohttp.FormData()
+            form.add_field('file', screenshot_bytes, filename='screenshot.png', content_type='image/png')
+            form.add_field('container_conf', str(container_conf))
+            form.add_field('row_conf', str(row_conf))
+            form.add_field('element_conf', str(element_conf))
             
-            # Parse response
-            result = response.json()
-            return result
+            session = await self.get_http_session()
+            async with session.post(self.yolo_endpoint, data=form) as response:
+                if response.status != 200:
+                    print(f"Error from YOLO API: {response.status} {await response.text()}")
+                    return None
+                
+                # Parse response
+                result = await response.json()
+                return result
             
         except Exception as e:
             print(f"Error getting YOLO detections: {e}")
             return None
     
-    def crop_element_from_screenshot(self, screenshot_image, bbox):
-        """Crop an element from a screenshot based on its bounding box"""
-        x1, y1, x2, y2 = bbox["x1"], bbox["y1"], bbox["x2"], bbox["y2"]
-        return screenshot_image.crop((x1, y1, x2, y2))
+    def crop_element_from_screenshot(self, screenshot_arr, bbox):
+        """Crop an element from a decoded screenshot array based on its bounding box
+        
+        The crop is a view into the screenshot array, so nothing is copied.
+        """
+        return screenshot_arr[int(bbox["y1"]):int(bbox["y2"]), int(bbox["x1"]):int(bbox["x2"])]
+    
+    def save_crop(self, crop, class_name, step_number, timestamp):
+        """Encode an element crop, as PNG for text elements and WebP otherwise, and queue it to be saved"""
+        if "text" in (class_name or "").lower():
+            crop_path = self.crops_dir / f"step_{step_number}_{timestamp}_element.png"
+            data = self._encode_image(crop, ".png")
+        else:
+            crop_path = self.crops_dir / f"step_{step_number}_{timestamp}_element.webp"
+            data = self._encode_image(crop, ".webp", [cv2.IMWRITE_WEBP_QUALITY, CROP_WEBP_QUALITY])
+        self.writer.write(crop_path, data)
+        return crop_path
+    
+    async def save_and_embed_crop(self, screenshot_arr, frame_hash, bbox, class_name, step_number, timestamp):
+        """Save an element crop and embed it, reusing both if this crop was seen before
+        
+        Returns:
+            (crop path, embedding key)
+        """
+        crop_key = self._crop_key(frame_hash, bbox)
+        if crop_key in self._crop_index:
+            return self._crop_index[crop_key]
+        
+        # Crop the element from the screenshot
+        element_crop = self.crop_element_from_screenshot(screenshot_arr, bbox)
+        
+        # Save the crop and generate its embedding using Voyage API at the same time
+        crop_path, embedding_key = await asyncio.gather(
+            self._run_in_pool(self.save_crop, element_crop, class_name, step_number, timestamp),
+            self._run_in_pool(self.embed_image, element_crop)
+        )
+        if embedding_key:
+            self._crop_index[crop_key] = (crop_path, embedding_key)
+        return crop_path, embedding_key
     
     async def compile_action(self, description, action_type="execute", params=None, confidence_threshold=0.85):
         """Compile an action with user confirmation"""
@@ -137,29 +374,50 @@ class TaskCompiler:
             elif action_type == "press_key":
                 await self.sdk.press_key(params.get("key", ""))
                 selected_element_info = None  # No element for key press actions
-            
-            # Give a short delay for any UI changes to complete
-            time.sleep(0.5)
         except Exception as e:
             print(f"Error executing action: {e}")
             return False
         
+        # Give a short delay for any UI changes to complete, without blocking the event loop
+        await asyncio.sleep(0.5)
+        
         # Now capture the screen to record what happened
-        screenshot = await self.sdk.capture_screenshot()
+        screenshot = await self.sdk.get_screenshot()
         if not screenshot:
             print("Failed to capture screenshot after action")
             return False
             
-        # Convert screenshot data to PIL Image
-        screenshot_image = Image.open(io.BytesIO(base64.b64decode(screenshot)))
+        # Decode the base64 screenshot once; the raw PNG bytes are sent to YOLO
+        # as-is, and the (BGR) array is used for saving and cropping
+        screenshot_bytes, screenshot_arr = await self._run_in_pool(self._decode_screenshot, screenshot)
         
-        # Save screenshot
+        # Without an element from the SDK the user may pick one from the YOLO
+        # detections, so start that request while the screenshot is saved
+        yolo_task = None
+        if action_type == "execute" and not (selected_element_info and selected_element_info.get('bbox')):
+            yolo_task = asyncio.create_task(self.get_yolo_detections(
+                screenshot_bytes, 
+                container_conf=params.get("container_conf", 0.3),
+                row_conf=params.get("row_conf", 0.4), 
+                element_conf=params.get("element_conf", 0.2)
+            ))
+        
+        # Save screenshot; it is encoded on the pool and written by the background writer.
+        # A frame that looks the same as one already saved reuses that file instead
         timestamp = int(time.time())
-        screenshot_path = self.screenshots_dir / f"step_{len(self.steps)+1}_{timestamp}.png"
-        screenshot_image.save(screenshot_path)
+        frame_hash = await self._run_in_pool(self._frame_hash, screenshot_arr)
+        if frame_hash in self._frame_index:
+            screenshot_path = self._frame_index[frame_hash]
+            print("Screen unchanged since an earlier step, reusing its screenshot.")
+        else:
+            screenshot_path = self.screenshots_dir / f"step_{len(self.steps)+1}_{timestamp}.jpg"
+            screenshot_jpeg = await self._run_in_pool(self._encode_image, screenshot_arr, ".jpg",
+                                                      [cv2.IMWRITE_JPEG_QUALITY, SCREENSHOT_JPEG_QUALITY])
+            self.writer.write(screenshot_path, screenshot_jpeg)
+            self._frame_index[frame_hash] = screenshot_path
         
         element_info = None
-        embedding = []
+        embedding_key = None
         element_crop_path = None
         
         if action_type == "execute" and selected_element_info:
@@ -170,13 +428,10 @@ class TaskCompiler:
             bbox = selected_element_info.get('bbox')
             
             if bbox:
-                # Crop the element from the screenshot
-                element_crop = self.crop_element_from_screenshot(screenshot_image, bbox)
-                element_crop_path = self.crops_dir / f"step_{len(self.steps)+1}_{timestamp}_element.png"
-                element_crop.save(element_crop_path)
-                
-                # Generate embedding using Voyage API
-                embedding = self.generate_embedding(element_crop_path)
+                element_crop_path, embedding_key = await self.save_and_embed_crop(
+                    screenshot_arr, frame_hash, bbox, selected_element_info.get("class_name"),
+                    len(self.steps)+1, timestamp
+                )
                 
                 # Store element information
                 element_info = {
@@ -195,14 +450,12 @@ class TaskCompiler:
             print("\nThe SDK didn't return element information. Would you like to manually identify it?")
             manual_select = input("Identify element manually? (y/n): ").lower().strip()
             
+            if manual_select != 'y' and yolo_task:
+                yolo_task.cancel()
+            
             if manual_select == 'y':
                 # Get YOLO detections for the screenshot to see what elements we have
-                yolo_result = await self.get_yolo_detections(
-                    screenshot, 
-                    container_conf=params.get("container_conf", 0.3),
-                    row_conf=params.get("row_conf", 0.4), 
-                    element_conf=params.get("element_conf", 0.2)
-                )
+                yolo_result = await yolo_task
                 
                 if yolo_result and "boxes" in yolo_result:
                     elements = [box for box in yolo_result["boxes"] if box["type"] == "elements"]
@@ -219,13 +472,10 @@ class TaskCompiler:
                             if selection > 0 and selection <= len(elements):
                                 selected_element = elements[selection-1]
                                 
-                                # Crop the element from the screenshot
-                                element_crop = self.crop_element_from_screenshot(screenshot_image, selected_element["bbox"])
-                                element_crop_path = self.crops_dir / f"step_{len(self.steps)+1}_{timestamp}_element.png"
-                                element_crop.save(element_crop_path)
-                                
-                                # Generate embedding using Voyage API
-                                embedding = self.generate_embedding(element_crop_path)
+                                element_crop_path, embedding_key = await self.save_and_embed_crop(
+                                    screenshot_arr, frame_hash, selected_element["bbox"],
+                                    selected_element.get("class_name"), len(self.steps)+1, timestamp
+                                )
                                 
                                 # Store element information
                                 element_info = {
@@ -239,12 +489,17 @@ class TaskCompiler:
                             print("Invalid selection, no element will be recorded")
         
         if not element_info:
-            # No specific element was identified, so we'll use the full screenshot
+            # No specific element was identified, so we'll use the full screenshot,
+            # which has already been saved
             print("No specific element identified, using full screenshot for this action.")
-            full_path = self.screenshots_dir / f"step_{len(self.steps)+1}_{timestamp}_full.png"
-            screenshot_image.save(full_path)
-            element_crop_path = full_path
-            embedding = self.generate_embedding(full_path)
+            element_crop_path = screenshot_path
+            full_key = (frame_hash, 0, 0, screenshot_arr.shape[1], screenshot_arr.shape[0])
+            if full_key in self._crop_index:
+                embedding_key = self._crop_index[full_key][1]
+            else:
+                embedding_key = await self._run_in_pool(self.embed_image, screenshot_arr)
+                if embedding_key:
+                    self._crop_index[full_key] = (screenshot_path, embedding_key)
         
         # Store step information
         step_data = {
@@ -253,40 +508,101 @@ class TaskCompiler:
             "action_type": action_type,
             "description": description,
             "screenshot_path": str(screenshot_path.relative_to(TASKS_DIR)),
+            "frame_hash": frame_hash,
             "element_crop_path": str(element_crop_path.relative_to(TASKS_DIR)) if element_crop_path else None,
             "element_info": element_info,
             "params": params,
-            "embedding": embedding,
+            "embedding_key": embedding_key,
             "confidence_threshold": confidence_threshold
         }
         
         self.steps.append(step_data)
+        self.emb_matrix = None  # Include the new step's embedding in the next match
         self.save_task_metadata()
         
         print(f"Step {len(self.steps)} compiled successfully.")
         return True
     
-    def generate_embedding(self, image_path):
-        """Generate multimodal embedding for an image using Voyage API"""
+    def embed_image(self, image) -> Optional[str]:
+        """Embed an image and store the embedding under a hash of the image content
+        
+        Identical images are only embedded once; their embeddings are kept as
+        .npz files in the task's embeddings directory instead of in task.json.
+        
+        Args:
+            image: A BGR image array (hashed by its pixels) or an image file path
+                (hashed by its bytes)
+        
+        Returns:
+            The embedding key, or None if no embedding could be generated
+        """
+        if isinstance(image, np.ndarray):
+            hasher = hashlib.sha256(str(image.shape).encode())
+            hasher.update(np.ascontiguousarray(image).tobytes())
+            key = hasher.hexdigest()
+        else:
+            key = hashlib.sha256(Path(image).read_bytes()).hexdigest()
+        embedding_path = self.embeddings_dir / f"{key}.npz"
+        if not embedding_path.exists() and not embedding_path.with_suffix(".npy").exists():
+            embedding = self.generate_embedding(image)
+            if not embedding:
+                return None
+            
+            # Store the embedding quantized to int8 with one scale factor; this
+            # keeps cosine rankings while taking a quarter of the space
+            embedding = np.asarray(embedding, dtype=np.float32)
+            scale = float(np.abs(embedding).max()) / 127.0 or 1.0
+            quantized = np.round(embedding / scale).astype(np.int8)
+            
+            # Write to a temporary file first so a partial file is never picked up
+            temp_path = embedding_path.with_suffix(".tmp")
+            with open(temp_path, 'wb') as f:
+                np.savez(f, q=quantized, scale=np.float32(scale))
+            os.replace(temp_path, embedding_path)
+        return key
+    
+    def load_embedding(self, key: str) -> np.ndarray:
+        """Load a stored embedding by its key as float32"""
+        embedding_path = self.embeddings_dir / f"{key}.npz"
+        if not embedding_path.exists():
+            # Embeddings cached before quantization are stored as float32 .npy files
+            return np.load(embedding_path.with_suffix(".npy"))
+        with np.load(embedding_path) as data:
+            return data["q"].astype(np.float32) * data["scale"]
+    
+    @staticmethod
+    def _to_pil_image(image):
+        """Convert a BGR array, PIL image or image path to a PIL image"""
+        if isinstance(image, np.ndarray):
+            return Image.fromarray(np.ascontiguousarray(image[:, :, ::-1]))  # BGR -> RGB
+        if isinstance(image, Image.Image):
+            return image
+        return Image.open(image)
+    
+    def generate_embedding(self, image):
+        """Generate multimodal embedding for an image (BGR array, PIL image or path) using Voyage API"""
+        return self.generate_embeddings_batch([image])[0]
+    
+    def generate_embeddings_batch(self, images: List[Any]) -> List[List[float]]:
+        """Generate multimodal embeddings for several images with a single Voyage API call"""
         if not self.voyage_api_key:
             print("Warning: No Voyage API key provided, skipping embedding generation")
-            return []
+            return [[] for _ in images]
             
         try:
             if self.voyage_client:
-                # Generate real embedding using Voyage API
-                image = Image.open(image_path)
-                inputs = [["", image]]  # Empty text + image
+                # Generate real embeddings using Voyage API
+                inputs = [["", self._to_pil_image(image)] for image in images]  # Empty text + image
                 result = self.voyage_client.multimodal_embed(inputs, model="voyage-multimodal-3")
-                return result.embeddings[0]
+                return result.embeddings
             else:
-                # Simulated embedding for testing
-                print(f"Simulating embedding generation for {image_path}")
-                return [0.0] * 10  # Simulate a 10-dim embedding
+                # Simulated embeddings for testing
+                print(f"Simulating embedding generation for {len(images)} images")
+                return [[0.0] * 10 for _ in images]  # Simulate 10-dim embeddings
             
         except Exception as e:
-            print(f"Error generating embedding: {e}")
-            return []
+            print(f"Error generating embeddings: {e}")
+            return [[] for _ in images]
     
     async def execute_compiled_task(self):
         """Execute a previously compiled task using visual similarity matching"""
@@ -329,7 +645,7 @@ class TaskCompiler:
                 await self.sdk.press_key(step["params"].get("key", ""))
             
             print(f"Step {i+1} executed")
-            time.sleep(1)  # Add a small delay between steps
+            await asyncio.sleep(1)  # Add a small delay between steps
             
         print(f"\n=== Task Execution Complete ===")
         return True
@@ -432,7 +748,7 @@ async def main():
             """
             
             # Save the final task
-            compiler.save_task_metadata()
+            compiler.save_task_metadata(sync=True)
             print(f"\n=== Compilation Complete ===")
             print(f"Task saved as: {compiler.task_id}")
             print(f"Total steps compiled: {len(compiler.steps)}")
@@ -446,6 +762,10 @@ async def main():
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # Make sure every queued artifact is written before exiting
+        compiler.writer.flush_and_join()
+        await compiler.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file